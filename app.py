@@ -1,10 +1,10 @@
 from faster_whisper import WhisperModel
-import torch
-from kokoro import KPipeline
 import soundfile as sf
 import numpy as np
 import tempfile
 import time
+import math
+import gc
 import sounddevice as sd
 import queue
 import threading
@@ -26,30 +26,64 @@ import sys
 import re
 import warnings
 
-# Importações para o avatar
-import pygame
-from pygame.locals import *
+# Avatar animado (processo separado ou na mesma thread — AVATAR_MODE);
+# o pygame só é importado quando o avatar roda neste processo
+from avatar_process import create_avatar
 
-# Gerenciador do avatar animado
-from avatar import AvatarManager
-
-# Motor TTS (Kokoro / Qwen3)
+# Motor TTS (Kokoro / Qwen3 / Edge) — backends carregados sob demanda
 from tts_engine import TTSManager
+from tts_backends import mps_available
+
+# Cache de áudio do TTS (RAM + disco)
+from tts_cache import TTSCache
+
+# Reprodução com stream de saída persistente
+from audio_player import AudioPlayer
+
+# Earcon e frases de espera durante etapas demoradas
+from latency_mask import LatencyMasker
+
+# Lip-sync do avatar pelo envelope do áudio
+from lipsync import LipSyncTimeline
+
+# Loop principal por prazos (heap + Condition), sem polling
+from scheduler import Scheduler
+
+# Perfis de energia (acordada / dormindo) e descarga de modelos ociosos
+from power import PowerManager
+
+# Pipeline da interação (etapas com filas limitadas)
+from pipeline import Pipeline, Stage, Turn
+
+# Cancelamento cooperativo (barge-in aborta LLM, TTS, pesquisa e memória)
+from cancellation import CancelToken, Cancelled
+
+# Fila de pedidos ao LLM (prioridades, slots do servidor e preempção)
+from llm_scheduler import LLMScheduler
+
+# Extração de memória em segundo plano (várias interações por pedido)
+from memory_extractor import MemoryExtractor
+
+# Classificador local de intenção (comando implícito sem ida ao LLM)
+from intent_classifier import IntentClassifier
 
 # Detector de áudio e voz
 from audio_detector import AudioDetector
 
 # Executor de comandos locais
-from commands import CommandExecutor
+from commands import CommandExecutor, detect_speed_command
+
+# Roteador de intenção (comandos, sistema e pesquisa numa passada)
+from intent_router import IntentRouter
 
 # Memória persistente
 from memory_manager import MemoryManager
 
 # Busca na web
-from web_search import search_web, needs_search, format_for_prompt, check_internet
+from web_search import search_web, format_for_prompt, check_internet
 
 # Informações do sistema
-from system_info import detect_system_query, format_for_prompt as fmt_sysinfo
+from system_info import format_for_prompt as fmt_sysinfo
 
 # Logging colorido
 from log import logger
@@ -162,10 +196,11 @@ class ChicaAssistant:
         print(Fore.CYAN + "   1. Kokoro-TTS (padrão, local)")
         print(Fore.CYAN + "   2. Qwen3-TTS (voz Serena, local)")
         print(Fore.CYAN + "   3. Edge-TTS (voz Thalita, online)")
-        print(Fore.CYAN + "   4. Usar configuração do config.py")
+        print(Fore.CYAN + "   4. Kokoro ONNX int8 (local, sem torch)")
+        print(Fore.CYAN + "   5. Usar configuração do config.py")
         
         try:
-            choice = input(Fore.YELLOW + "Escolha (1/2/3/4) [4]: ").strip()
+            choice = input(Fore.YELLOW + "Escolha (1/2/3/4/5) [5]: ").strip()
             if choice == "1":
                 self.tts_system_choice = 'kokoro'
                 print(Fore.GREEN + "✅ Sistema TTS selecionado: Kokoro-TTS")
@@ -175,6 +210,9 @@ class ChicaAssistant:
             elif choice == "3":
                 self.tts_system_choice = 'edge'
                 print(Fore.GREEN + f"✅ Sistema TTS selecionado: Edge-TTS ({config.EDGE_TTS_VOICE})")
+            elif choice == "4":
+                self.tts_system_choice = 'kokoro_onnx'
+                print(Fore.GREEN + "✅ Sistema TTS selecionado: Kokoro ONNX (int8)")
             else:
                 self.tts_system_choice = TTS_SYSTEM
                 print(Fore.GREEN + f"✅ Usando configuração do config.py: {TTS_SYSTEM}")
@@ -184,15 +222,18 @@ class ChicaAssistant:
         
         print(Fore.CYAN + "-"*60)
         
+        # Configuração de voz (a síntese fica no TTSManager)
+        self.voice_config = parse_voice_config(TTS_VOICE)
+        
         # Mostrar configurações de voz
         print(Fore.MAGENTA + f"🔊 Configuração de voz:")
         
         # Mostrar sistema TTS selecionado
         print(Fore.MAGENTA + f"   • Sistema TTS: {self.tts_system_choice}")
         
-        if self.tts_system_choice == 'kokoro':
-            # Processar e mostrar configuração de voz kokoro
-            voice_config = parse_voice_config(TTS_VOICE)
+        if self.tts_system_choice in ('kokoro', 'kokoro_onnx'):
+            # Mostrar configuração de voz kokoro
+            voice_config = self.voice_config
             if len(voice_config) == 1:
                 voice_name = list(voice_config.keys())[0]
                 percent = list(voice_config.values())[0]
@@ -261,7 +302,7 @@ class ChicaAssistant:
         print(Fore.GREEN + "Inicializando modelos...")
         
         # Verificar dispositivo de processamento
-        device = "mps" if torch.backends.mps.is_available() else "cpu"
+        device = "mps" if mps_available() else "cpu"
         print(f"Dispositivo de processamento: {device}")
         
         # Configurar dispositivo de áudio
@@ -270,23 +311,22 @@ class ChicaAssistant:
         # Carregar modelos
         self._init_stt()
         
-        # Inicializar sistema TTS baseado na escolha do usuário
-        self.tts_system = self.tts_system_choice
-        self.tts_pipeline = None
-        self.qwen3_pipeline = None
-        
-        if self.tts_system == 'kokoro':
-            print(Fore.GREEN + "🔊 Inicializando sistema TTS Kokoro...")
-            self.tts_pipeline = KPipeline(lang_code=config.TTS_KOKORO_LANG, repo_id=config.TTS_KOKORO_MODEL)
-            print(Fore.GREEN + "✅ Sistema TTS Kokoro inicializado com sucesso")
-        elif self.tts_system == 'edge':
-            print(Fore.GREEN + "🔊 Inicializando sistema TTS Edge...")
-            self.edge_tts = TTSManager(system='edge')
-            # Se o fallback ocorreu (sem internet), tts_engine troca pra kokoro
-            actual = getattr(self.edge_tts, 'system', 'edge')
-            print(Fore.GREEN + f"✅ Sistema TTS ativo: {actual}")
-        else:
-            self._init_qwen3_tts()
+        # Inicializar sistema TTS baseado na escolha do usuário.
+        # O cache de áudio (LRU por bytes em RAM + disco) é compartilhado
+        # entre os backends; o fallback (Kokoro) só carrega se for preciso.
+        self.tts_cache = TTSCache()
+        print(Fore.GREEN + f"🔊 Inicializando sistema TTS {self.tts_system_choice}...")
+        self.tts = TTSManager(system=self.tts_system_choice, cache=self.tts_cache)
+        self.tts.text_cleaner = self.clean_text_for_tts  # mesma chave de cache nas respostas e no prerender
+        self.tts_system = self.tts.system
+        load = self.tts.backend.stats()
+        print(Fore.GREEN + f"✅ Sistema TTS ativo: {self.tts_system} "
+              f"({load['load_seconds']:.1f}s, +{load['load_rss_mb']:.0f} MB)")
+
+        # Saída de áudio aberta uma vez só (callback puxa da fila de reprodução)
+        self.player = AudioPlayer(self.tts.sample_rate)
+        self.masker = LatencyMasker(self.player, self.tts)
+        self.lipsync = LipSyncTimeline()
 
         # Inicializar cliente LLM (Ollama, LM Studio ou llama.cpp)
         print(Fore.CYAN + "🤖 Inicializando cliente LLM...")
@@ -309,14 +349,23 @@ class ChicaAssistant:
                 provider_display = f"LM Studio ({LM_STUDIO_HOST}:{LM_STUDIO_PORT})"
             print(Fore.GREEN + f"✅ Cliente LLM inicializado: {provider_display} › {LLM_MODEL}")
         except LLMError as e:
+            self.llm = None  # a fila responde LLMError a cada pedido
             print(Fore.YELLOW + f"⚠️  Aviso ao inicializar LLM: {e}")
             print(Fore.YELLOW + "⚠️  O assistente pode não funcionar corretamente sem um provedor LLM.")
+        
+        # Pedidos ao LLM por prioridade: a resposta passa na frente da
+        # extração de memória, que espera o turno em andamento terminar
+        self.llm_queue = LLMScheduler(
+            self.llm,
+            slots=config.LLM_SERVER_SLOTS,
+            foreground_busy=lambda: self.pipeline.pending(after='vad', until='llm') > 0,
+        )
 
         # Estado
         self.conversation_history = []
+        self.cancel_token = CancelToken()  # Turnos em andamento (trocado a cada barge-in)
         self.audio_buffer = []
         self.is_listening = True
-        self.is_processing = False
         self.is_speaking_tts = False  # Novo: indica se a IA está falando
         self.last_speech_time = time.time()
         self.last_activity_time = time.time()
@@ -324,10 +373,27 @@ class ChicaAssistant:
         self.wake_word_detected = False
         self.inactivity_counter = INACTIVITY_TIMEOUT  # Contador de inatividade
         
+        # Loop principal: prazos de inatividade e do avatar
+        self.scheduler = Scheduler()
+        self._inactivity_timer = None
+        self._avatar_timer = None
+        
+        # Perfil de energia: dormindo, captura em blocos maiores, Whisper
+        # pequeno só para a wake word e modelos ociosos fora da memória
+        self.power = PowerManager(self.scheduler)
+        self.power.register_model('stt', self._unload_stt, self._reload_stt)
+        self.power.register_model('tts', self.tts.unload, self.tts.reload)
+        self.power.add_listener(self._apply_power_profile)
+        
         # Avatar
         if config.AVATAR_ENABLE:
-            self.avatar = AvatarManager()
+            self.avatar = create_avatar()
             self.avatar_started = False
+            self.avatar.on_change = lambda: self.scheduler.post(self._avatar_tick)
+            
+            # Boca segue o áudio tocado (posição vem do relógio do reprodutor)
+            if config.LIPSYNC_ENABLE:
+                self.avatar.set_lipsync(self.lipsync, self.player.reply_position)
             
             # Iniciar avatar imediatamente
             self.start_avatar()
@@ -343,6 +409,10 @@ class ChicaAssistant:
         self.consecutive_speech_chunks = 0
         self.silence_chunks_needed = int(SILENCE_DURATION * SAMPLE_RATE / CHUNK)
         self.silence_chunks_counter = 0
+        self.capture_block = CHUNK  # Amostras por callback (muda com o perfil de energia)
+        self._input_stream = None
+        self._stt_lock = threading.Lock()
+        self._wake_stt_model = None
         
         # Dispositivo de áudio
         self.audio_device_id = None
@@ -354,21 +424,60 @@ class ChicaAssistant:
 
         # Feature: comandos locais
         self.command_executor = CommandExecutor()
+        self.router = IntentRouter(self.command_executor)
         self.waiting_confirmation = None  # None ou dict do comando pendente
 
         # Memória persistente (2 arquivos: assistant_memory.md + assistant_user.md)
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.memory = MemoryManager(base_dir)
+        self.memory_extractor = MemoryExtractor(
+            self.memory,
+            self.llm_queue,
+            is_idle=lambda: not self.is_processing and not self.is_speaking_tts,
+        )
+        
+        # Intenção de comandos implícitos ("calendário" abre ou pergunta?)
+        self.intent_classifier = None
+        if config.INTENT_CLASSIFIER_ENABLE:
+            self.intent_classifier = IntentClassifier(os.path.join(base_dir, config.INTENT_CORRECTIONS_FILE))
+        
         self.stop_phrases = config.STOP_PHRASES  # Palavras de interrupção
         
-        # Cache para frases curtas frequentes (melhora performance do Qwen3-TTS)
-        self.tts_cache = {}
-        self.max_cache_size = 50  # Limite máximo de frases em cache
-        self.qwen3_warmed_up = False  # Flag para controle de pré-aquecimento
+        # Pré-sintetizar frases fixas (saudação, confirmações, erros)
+        if config.TTS_PRERENDER_ENABLE:
+            self._prerender_fixed_phrases()
+        
+        # Pipeline da interação: cada etapa com a sua fila e os seus workers
+        handlers = {
+            'vad': self._vad_stage,
+            'stt': self._stt_stage,
+            'route': self._route_stage,
+            'enrich': self._enrich_stage,
+            'llm': self._llm_stage,
+            'tts': self._tts_stage,
+            'playback': self._playback_stage,
+        }
+        self.pipeline = Pipeline([
+            Stage(
+                name,
+                handler if name == 'vad' else self._unless_cancelled(handler),
+                workers=config.PIPELINE_STAGES[name][0],
+                maxsize=config.PIPELINE_STAGES[name][1],
+            )
+            for name, handler in handlers.items()
+        ])
         
         # Configurar handler para CTRL+C
         signal.signal(signal.SIGINT, self.signal_handler)
 
+    def _prerender_fixed_phrases(self) -> None:
+        """Pré-sintetiza as frases fixas em segundo plano (ficam no cache de TTS)."""
+        phrases = list(config.TTS_PRERENDER_PHRASES)
+        phrases += self.command_executor.confirmation_phrases()
+        phrases += list(config.LATENCY_FILLERS.values())
+
+        self.tts.prerender(phrases)
+
     def _init_stt(self) -> None:
         """Inicializa o STT (Speech-to-Text) com detecção automática de hardware.
 
@@ -379,7 +488,7 @@ class ChicaAssistant:
         hf_name = "large-v3-turbo" if config.WHISPER_MODEL == "turbo" else config.WHISPER_MODEL
 
         # Detectar hardware e escolher backend
-        has_mps = torch.backends.mps.is_available()
+        has_mps = mps_available()
         backend = config.STT_BACKEND
 
         if backend == 'auto':
@@ -429,85 +538,6 @@ class ChicaAssistant:
                     print(Fore.RED + "❌ Instale: pip install faster-whisper")
                     sys.exit(1)
 
-    def _init_qwen3_tts(self) -> None:
-        """Inicializa o TTS Qwen3 com fallback automático para Kokoro."""
-        print(Fore.GREEN + f"🔊 Inicializando sistema TTS Qwen3 ({QWEN3_MODEL})...")
-        try:
-            from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
-            tts_device = "mps" if torch.backends.mps.is_available() else "cpu"
-            print(f"Dispositivo TTS: {tts_device}")
-            if tts_device == "mps":
-                self.qwen3_pipeline = Qwen3TTSModel.from_pretrained(QWEN3_MODEL, device_map="mps")
-            else:
-                self.qwen3_pipeline = Qwen3TTSModel.from_pretrained(QWEN3_MODEL)
-            actual_device = (
-                self.qwen3_pipeline.model.device
-                if hasattr(self.qwen3_pipeline.model, 'device')
-                else next(self.qwen3_pipeline.model.parameters()).device
-            )
-            print(Fore.GREEN + f"✅ Sistema TTS Qwen3 inicializado com sucesso (dispositivo: {actual_device})")
-            print(Fore.GREEN + f"   • Voz: {QWEN3_VOICE}")
-            print(Fore.GREEN + f"   • Idioma: {QWEN3_LANGUAGE}")
-
-            if config.QWEN3_USE_COMPILE and hasattr(torch, 'compile'):
-                try:
-                    print(Fore.YELLOW + "   • Compilando modelo com torch.compile...")
-                    compiled_model = torch.compile(self.qwen3_pipeline.model, mode="reduce-overhead")
-                    self.qwen3_pipeline.model = compiled_model
-                    print(Fore.GREEN + "   • Modelo compilado com sucesso")
-                except Exception as compile_e:
-                    print(Fore.YELLOW + f"   • Aviso na compilação: {compile_e}")
-
-            try:
-                print(Fore.YELLOW + "   • Pré-aquentendo modelo Qwen3-TTS...")
-                _ = self.qwen3_pipeline.generate_custom_voice(
-                    text="Olá", speaker=QWEN3_VOICE,
-                    language=QWEN3_LANGUAGE, non_streaming_mode=True
-                )
-                self.qwen3_warmed_up = True
-                print(Fore.GREEN + "   • Modelo pré-aquecido com sucesso")
-            except Exception as warmup_e:
-                print(Fore.YELLOW + f"   • Aviso no pré-aquecimento: {warmup_e}")
-        except ImportError:
-            print(Fore.RED + "❌ Erro: Qwen3-TTS não está instalado")
-            print(Fore.YELLOW + "⚠️  Instale com: pip install qwen-tts")
-            self._fallback_to_kokoro()
-        except Exception as e:
-            print(Fore.YELLOW + f"⚠️  Aviso ao inicializar Qwen3-TTS: {e}")
-            print(Fore.YELLOW + "⚠️  Tentando novamente...")
-            try:
-                from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
-                tts_device = "mps" if torch.backends.mps.is_available() else "cpu"
-                if tts_device == "mps":
-                    self.qwen3_pipeline = Qwen3TTSModel.from_pretrained(QWEN3_MODEL, device_map="mps")
-                else:
-                    self.qwen3_pipeline = Qwen3TTSModel.from_pretrained(QWEN3_MODEL)
-                if config.QWEN3_USE_COMPILE and hasattr(torch, 'compile'):
-                    try:
-                        compiled_model = torch.compile(self.qwen3_pipeline.model, mode="reduce-overhead")
-                        self.qwen3_pipeline.model = compiled_model
-                    except Exception:
-                        pass
-                try:
-                    _ = self.qwen3_pipeline.generate_custom_voice(
-                        text="Olá", speaker=QWEN3_VOICE,
-                        language=QWEN3_LANGUAGE, non_streaming_mode=True
-                    )
-                    self.qwen3_warmed_up = True
-                except Exception:
-                    pass
-                print(Fore.GREEN + "✅ Qwen3-TTS inicializado na segunda tentativa")
-            except Exception:
-                print(Fore.RED + "❌ Não foi possível inicializar Qwen3-TTS")
-                self._fallback_to_kokoro()
-
-    def _fallback_to_kokoro(self) -> None:
-        """Fallback para Kokoro-TTS quando Qwen3 falha."""
-        print(Fore.YELLOW + "⚠️  Usando Kokoro-TTS como fallback...")
-        self.tts_system = 'kokoro'
-        self.tts_pipeline = KPipeline(lang_code=config.TTS_KOKORO_LANG, repo_id=config.TTS_KOKORO_MODEL)
-        print(Fore.GREEN + "✅ Sistema TTS Kokoro inicializado como fallback")
-
     def _get_audio_device_id(self):
         """
         Encontra o ID do dispositivo de áudio baseado na configuração AUDIO_DEVICE.
@@ -859,18 +889,33 @@ class ChicaAssistant:
         
         return False
 
-    def _ask_command_confirmation(self, cmd: dict) -> None:
-        """Pergunta confirmação para executar um comando local."""
+    def _change_speech_speed(self, direction: str) -> str:
+        """Muda a velocidade da fala no reprodutor e retorna a frase de confirmação.
+
+        Vale na hora, inclusive para o áudio que já está na fila — nada é
+        re-sintetizado e o cache de TTS continua valendo.
+        """
+        if direction == 'faster':
+            self.player.speed += config.PLAYBACK_SPEED_STEP
+            msg = config.MSG_SPEED_FASTER
+        elif direction == 'slower':
+            self.player.speed -= config.PLAYBACK_SPEED_STEP
+            msg = config.MSG_SPEED_SLOWER
+        else:
+            self.player.speed = 1.0
+            msg = config.MSG_SPEED_NORMAL
+        print(Fore.CYAN + f"\n⏩ Velocidade da fala: {self.player.speed:.2f}x")
+        return msg
+
+    def _ask_command_confirmation(self, cmd: dict) -> str:
+        """Pergunta confirmação para executar um comando local (retorna a frase a falar)."""
         confirm_text = cmd["confirmacao"]
         print(Fore.CYAN + f"\n🤖 {ASSISTANT_NAME}: {confirm_text}")
         self.waiting_confirmation = cmd
-        clean_for_tts = self.clean_text_for_tts(confirm_text)
-        audio_file = self.text_to_speech(clean_for_tts)
-        if audio_file:
-            self.play_audio_with_interruption(audio_file)
+        return confirm_text
 
-    def _handle_confirmation_response(self, text: str) -> None:
-        """Processa a resposta do usuário à confirmação."""
+    def _handle_confirmation_response(self, text: str) -> str:
+        """Processa a resposta do usuário à confirmação (retorna a frase a falar)."""
         text_lower = text.lower().strip()
         cmd = self.waiting_confirmation
         self.waiting_confirmation = None
@@ -879,48 +924,39 @@ class ChicaAssistant:
         reject_words = ["não", "nao", "cancela", "cancelar", "pare", "para", "nada", "nenhum"]
 
         if any(w in text_lower for w in confirm_words):
+            self._learn_intent(cmd, 'COMANDO')
             result = self.command_executor.execute(cmd)
             print(Fore.GREEN + f"\n✅ {result}")
-            clean = self.clean_text_for_tts(result)
-            audio_file = self.text_to_speech(clean)
-            if audio_file:
-                self.play_audio_with_interruption(audio_file)
+            return result
         elif any(w in text_lower for w in reject_words):
-            msg = "Comando cancelado."
+            self._learn_intent(cmd, 'PERGUNTA')  # não queria abrir: era outra coisa
+            msg = config.MSG_COMMAND_CANCELLED
             print(Fore.YELLOW + f"\n🤖 {ASSISTANT_NAME}: {msg}")
-            audio_file = self.text_to_speech(self.clean_text_for_tts(msg))
-            if audio_file:
-                self.play_audio_with_interruption(audio_file)
+            return msg
         else:
-            msg = "Não entendi. Diga 'sim' para confirmar ou 'não' para cancelar."
+            msg = config.MSG_CONFIRMATION_UNCLEAR
             print(Fore.YELLOW + f"\n🤖 {ASSISTANT_NAME}: {msg}")
             self.waiting_confirmation = cmd  # Re-ask
-            audio_file = self.text_to_speech(self.clean_text_for_tts(msg))
-            if audio_file:
-                self.play_audio_with_interruption(audio_file)
+            return msg
 
-    def _extract_memory(self, user_text: str, ai_reply: str) -> None:
-        """Extrai fatos da conversa via LLM e aplica nos arquivos de memória.
-
-        Executa a cada 3 interações para não impactar muito a performance.
-        """
-        try:
-            prompt = self.memory.get_extraction_prompt()
-            resp = self.llm.chat([
-                {'role': 'system', 'content': prompt},
-                {'role': 'user', 'content': user_text},
-                {'role': 'assistant', 'content': ai_reply},
-            ])
-            extraction = resp.message.content.strip()
-            if extraction and extraction.upper() != 'NONE':
-                self.memory.apply_extraction(extraction)
-        except Exception as e:
-            logger.warning(f'Erro na extração de memória: {e}')
+    def _learn_intent(self, cmd: dict, label: str) -> None:
+        """Resposta à confirmação de um comando implícito vira exemplo de treino."""
+        if self.intent_classifier is not None and cmd.get("match_type") == "implicit" and cmd.get("texto"):
+            self.intent_classifier.add_example(cmd["texto"], label, key=cmd["chave"])
 
     def signal_handler(self, sig, frame):
         """Handler para CTRL+C"""
         print(Fore.RED + "\n\n🛑 Interrompendo...")
         self.is_listening = False
+        self.scheduler.stop()
+        self.pipeline.stop()
+        self.pipeline.log_stats()
+        self.memory_extractor.stop()
+        self.llm_queue.log_stats()
+        self.player.close()
+        self.tts.close()
+        if self.avatar_started:
+            self.avatar.stop()
         sys.exit(0)
     
     def check_wake_word(self, text):
@@ -988,6 +1024,10 @@ class ChicaAssistant:
             print(Fore.CYAN + f"Diga '{WAKE_WORDS[0]}' para acordá-la (ou outras variações)")
             self.is_active = False
             self.conversation_history = []
+            self.memory_extractor.flush()  # dormindo: hora de extrair o que ficou
+            self.power.enter('sleeping')
+            if self.avatar_started:
+                self.avatar.set_sleeping(True)
             return True
         return False
     
@@ -995,48 +1035,124 @@ class ChicaAssistant:
         """Reseta o contador de inatividade para o valor inicial"""
         self.inactivity_counter = INACTIVITY_TIMEOUT
         self.last_activity_time = time.time()
+        self._schedule_inactivity_check()
+    
+    def _schedule_inactivity_check(self):
+        """Agenda a verificação de inatividade para quando o prazo vencer"""
+        if self._inactivity_timer is not None:
+            self._inactivity_timer.cancel()
+            self._inactivity_timer = None
+        if not self.is_active:
+            return  # dormindo: nada a verificar até a wake word
+        remaining = self.last_activity_time + INACTIVITY_TIMEOUT - time.time()
+        self._inactivity_timer = self.scheduler.call_later(max(remaining, 1.0), self._on_inactivity_deadline)
+    
+    def _on_inactivity_deadline(self):
+        """Prazo de inatividade vencido (a fala pode ter renovado o prazo)"""
+        self._inactivity_timer = None
+        if not self.check_inactivity():
+            self._schedule_inactivity_check()
+    
+    def _avatar_tick(self):
+        """Atualiza o avatar e agenda a próxima mudança (piscada/boca)"""
+        if self._avatar_timer is not None:
+            self._avatar_timer.cancel()
+            self._avatar_timer = None
+        self.update_avatar()
+        if self.avatar_started:
+            delay = self.avatar.seconds_until_update()
+            if math.isfinite(delay):
+                self._avatar_timer = self.scheduler.call_later(delay, self._avatar_tick)
     
     def _transcribe_audio(self, audio_path: str) -> str:
         """Transcreve áudio usando o backend correto (whisper ou faster-whisper).
 
         faster-whisper retorna generator de segments; whisper original retorna dict.
+        Dormindo, usa o modelo pequeno do perfil (só precisa achar a wake word).
         """
         try:
-            if hasattr(self.stt_model, 'transcribe') and hasattr(self.stt_model, 'model'):  # WhisperModel
-                segments, _info = self.stt_model.transcribe(
+            profile = self.power.profile
+            stt_model = self._wake_stt() if self.power.name == 'sleeping' else None
+            if stt_model is None:
+                stt_model = self._main_stt()
+            if hasattr(stt_model, 'transcribe') and hasattr(stt_model, 'model'):  # WhisperModel
+                segments, _info = stt_model.transcribe(
                     audio_path,
                     language=config.WHISPER_LANGUAGE,
-                    beam_size=3,
+                    beam_size=profile['stt_beam_size'],
                     vad_filter=True,
                 )
                 return " ".join(seg.text for seg in segments).strip()
             else:  # whisper.Whisper
-                result = self.stt_model.transcribe(audio_path, language=config.WHISPER_LANGUAGE)
+                result = stt_model.transcribe(audio_path, language=config.WHISPER_LANGUAGE)
                 return result["text"].strip()
         except Exception as e:
             logger.error(f"Erro na transcrição: {e}")
             return ""
-
-    def _check_interruption(self, indata, frames, time_info, status):
-        """Callback para processamento de áudio em tempo real"""
+    
+    def _main_stt(self):
+        """Modelo STT principal (recarrega se foi descarregado por ociosidade)"""
+        with self._stt_lock:
+            if self.stt_model is None:
+                self._init_stt()
+            return self.stt_model
+    
+    def _wake_stt(self):
+        """Whisper pequeno do perfil dormindo (None = usar o principal)"""
+        name = self.power.profile.get('stt_model')
+        if not name or name == config.WHISPER_MODEL:
+            return None
+        with self._stt_lock:
+            if self._wake_stt_model is None:
+                try:
+                    self._wake_stt_model = WhisperModel(name, device="cpu", compute_type="int8", cpu_threads=1)
+                    print(Fore.GREEN + f"✅ faster-whisper '{name}' carregado (wake word)")
+                except Exception as e:
+                    logger.warning(f"Modelo da wake word indisponível ({name}): {e}")
+                    return None
+            return self._wake_stt_model
+    
+    def _unload_stt(self):
+        """Tira o STT principal da memória (volta no próximo uso ou ao acordar)"""
+        with self._stt_lock:
+            self.stt_model = None
+        gc.collect()
+    
+    def _reload_stt(self):
+        self._main_stt()
+    
+    def _apply_power_profile(self, name, profile):
+        """Aplica a parte do perfil de energia que cabe ao app (captura, STT)"""
+        if name != 'sleeping':
+            with self._stt_lock:
+                self._wake_stt_model = None  # acordada: o modelo da wake word sobra
+        block = profile['capture_block']
+        if self._input_stream is not None and block != self.capture_block:
+            # A captura é reaberta na thread do loop (não dentro de um callback)
+            self.scheduler.post(lambda: self._open_input_stream(block))
+
+    def _capture_callback(self, indata, frames, time_info, status):
+        """Callback da captura: só copia o bloco para a etapa de VAD (não bloqueia)"""
         if status:
             return
-        
-        # Se a IA está falando, não processar áudio normal
-        if self.is_speaking_tts:
+        # Fila cheia (VAD atrasado): o bloco é descartado e contado nas métricas
+        self.pipeline.submit(indata.copy(), block=False)
+    
+    def _vad_stage(self, audio_chunk):
+        """Etapa VAD: detecta início e fim da fala; no fim, entrega a fala completa"""
+        # Se a IA está falando (resposta, earcon ou frase de espera), não
+        # processar áudio normal: o alto-falante viraria um turno novo
+        if self.is_speaking_tts or self.player.is_playing:
             # Mas ainda escutamos para interrupções
             if self.interruption_enabled:
-                self.interruption_buffer.append(indata.copy())
+                self.interruption_buffer.append(audio_chunk)
                 
                 # Limitar o buffer de interrupção
                 max_interruption_duration = 3.0
-                max_interruption_size = int(max_interruption_duration * SAMPLE_RATE / CHUNK)
+                max_interruption_size = int(max_interruption_duration * SAMPLE_RATE / self.capture_block)
                 if len(self.interruption_buffer) > max_interruption_size:
                     self.interruption_buffer = self.interruption_buffer[-max_interruption_size:]
-            return
-        
-        # Adicionar ao buffer normal
-        audio_chunk = indata.copy()
+            return None
         
         # Calcular energia RMS do chunk
         rms = np.sqrt(np.mean(audio_chunk**2))
@@ -1069,7 +1185,7 @@ class ChicaAssistant:
             
             # Limitar tamanho do buffer para evitar consumo excessivo de memória
             max_buffer_duration = 10.0  # 10 segundos máximo
-            max_buffer_size = int(max_buffer_duration * SAMPLE_RATE / CHUNK)
+            max_buffer_size = int(max_buffer_duration * SAMPLE_RATE / self.capture_block)
             if len(self.audio_buffer) > max_buffer_size:
                 self.audio_buffer = self.audio_buffer[-max_buffer_size:]
             
@@ -1088,51 +1204,46 @@ class ChicaAssistant:
                     self.user_is_speaking = False
                     
                     # Verificar se há áudio suficiente para processar
-                    buffer_duration = len(self.audio_buffer) * CHUNK / SAMPLE_RATE
-                    if buffer_duration >= MIN_SPEECH_DURATION and not self.is_processing:
-                        threading.Thread(target=self.process_audio_buffer, daemon=True).start()
+                    buffer_duration = sum(len(c) for c in self.audio_buffer) / SAMPLE_RATE
+                    if buffer_duration >= MIN_SPEECH_DURATION:
+                        return self._end_of_speech()
+        return None
     
-    def process_audio_buffer(self):
-        """Processa o buffer de áudio acumulado"""
-        if not self.audio_buffer or self.is_processing:
-            return
+    def _end_of_speech(self):
+        """Fim da fala: confere a energia e monta o turno para o STT"""
+        audio_data = np.concatenate(self.audio_buffer, axis=0)
+        self.audio_buffer = []
         
-        self.is_processing = True
+        # Verificar se é fala legítima (muito fraco = provavelmente ruído)
+        audio_energy = np.sqrt(np.mean(audio_data**2))
+        if audio_energy < self.speech_threshold * SPEECH_ENERGY_MULTIPLIER:
+            return None
         
-        try:
-            # Combinar buffers
-            audio_data = np.concatenate(self.audio_buffer, axis=0)
-            
-            # Verificar energia média do áudio
-            audio_energy = np.sqrt(np.mean(audio_data**2))
-            
-            # Verificar se é fala legítima
-            if audio_energy < self.speech_threshold * SPEECH_ENERGY_MULTIPLIER:
-                # Muito fraco, provavelmente ruído
-                self.audio_buffer.clear()
-                self.is_processing = False
-                return
-            
-            # Limpar buffer
-            self.audio_buffer.clear()
-            
-            # Salvar em arquivo temporário
-            temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            sf.write(temp_file.name, audio_data, SAMPLE_RATE)
-            
-            # Processar áudio
-            self.process_interaction(temp_file.name)
-            
-            # Limpar arquivo
-            try:
-                os.unlink(temp_file.name)
-            except:
-                pass
-                
-        except Exception as e:
-            print(Fore.RED + f"Erro ao processar áudio: {e}")
-        finally:
-            self.is_processing = False
+        # Fim da fala: earcon imediato enquanto a resposta é preparada; o
+        # slot do LLM ocupado por segundo plano é liberado para este turno
+        if self.is_active:
+            self.masker.begin_turn()
+            self.llm_queue.preempt_background()
+        return Turn(audio=audio_data, cancel=self.cancel_token)
+    
+    def _cancel_turns(self):
+        """Barge-in: cancela os turnos em andamento e abre um token para os próximos"""
+        token, self.cancel_token = self.cancel_token, CancelToken()
+        token.cancel()
+    
+    @staticmethod
+    def _unless_cancelled(handler):
+        """Etapa que descarta turnos cancelados sem processá-los"""
+        def stage(turn):
+            if turn.cancel.cancelled:
+                return None
+            return handler(turn)
+        return stage
+    
+    @property
+    def is_processing(self):
+        """Alguma fala em andamento depois do VAD (STT → reprodução)"""
+        return self.pipeline.pending(after='vad') > 0
     
     def check_interruption(self):
         """Verifica se há interrupção enquanto a IA está falando.
@@ -1147,11 +1258,11 @@ class ChicaAssistant:
         self._checking_interruption = True
         try:
             # Janela deslizante: apenas os últimos ~1s de áudio
-            chunk_count = max(1, int(1.0 * SAMPLE_RATE / CHUNK))
+            chunk_count = max(1, int(1.0 * SAMPLE_RATE / self.capture_block))
             recent = self.interruption_buffer[-chunk_count:]
 
             # Só transcrever se houver áudio suficiente (mín 0.5s)
-            min_chunks = int(0.5 * SAMPLE_RATE / CHUNK)
+            min_chunks = int(0.5 * SAMPLE_RATE / self.capture_block)
             if len(recent) < min_chunks:
                 return False
 
@@ -1182,6 +1293,14 @@ class ChicaAssistant:
             # A janela deslizante (last ~1s) evita re-processar
             # áudio velho.
 
+            # "Fale mais rápido/devagar" no meio da resposta: muda a
+            # velocidade do que está tocando, sem interromper
+            speed_direction = detect_speed_command(user_text) if user_text else None
+            if speed_direction:
+                self._change_speech_speed(speed_direction)
+                self.interruption_buffer.clear()
+                return False
+
             if user_text and self.check_for_stop_command(user_text):
                 print(Fore.YELLOW + f"\n⏸️  {ASSISTANT_NAME} interrompida!")
                 return True
@@ -1193,113 +1312,173 @@ class ChicaAssistant:
 
         return False
     
-    def process_interaction(self, audio_path):
-        """Processa uma interação completa"""
-        start_time = time.time()
-        
-        # 1. Transcrever áudio
-        user_text = self._transcribe_audio(audio_path)
-        
-        if not user_text:
-            return
+    def _stt_stage(self, turn):
+        """Etapa STT: transcreve a fala"""
+        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+        sf.write(temp_file.name, turn.audio, SAMPLE_RATE)
+        try:
+            with self.masker.stage('stt'):
+                turn.user_text = self._transcribe_audio(temp_file.name)
+        finally:
+            try:
+                os.unlink(temp_file.name)
+            except OSError:
+                pass
+        turn.audio = None
         
-        print(Fore.BLUE + f"\n🎤 Você: {user_text}")
+        if not turn.user_text:
+            return None
+        print(Fore.BLUE + f"\n🎤 Você: {turn.user_text}")
+        return turn
+    
+    def _say(self, turn, text):
+        """Responde com uma frase pronta (sem LLM e sem histórico)"""
+        turn.reply = text
+        turn.direct = True
+        return turn
+    
+    def _route_stage(self, turn):
+        """Etapa de roteamento: wake word, confirmação, velocidade, comandos e intenção"""
+        user_text = turn.user_text
         
-        # 2. Verificar wake word se estiver inativa
+        # 1. Verificar wake word se estiver inativa
         if not self.is_active:
-            if self.check_wake_word(user_text):
-                print(Fore.GREEN + f"\n🔔 {ASSISTANT_NAME} acordou!")
-                self.is_active = True
-                self.reset_inactivity_counter()
-                self.wake_word_detected = True
-                
-                # Saudação inicial (usando configuração do config.py)
-                greeting = config.ASSISTANT_GREETING
-                print(Fore.GREEN + f"🤖 {ASSISTANT_NAME}: {greeting}")
-                
-                # Converter para áudio
-                clean_greeting = self.clean_text_for_tts(greeting)
-                audio_file = self.text_to_speech(clean_greeting)
-                if audio_file:
-                    self.play_audio_with_interruption(audio_file)
-                
-                return
-            else:
-                return
+            if not self.check_wake_word(user_text):
+                return None
+            print(Fore.GREEN + f"\n🔔 {ASSISTANT_NAME} acordou!")
+            self.is_active = True
+            self.reset_inactivity_counter()
+            self.wake_word_detected = True
+            self.power.enter('awake')  # recarrega em segundo plano o que foi descarregado
+            if self.avatar_started:
+                self.avatar.set_sleeping(False)
+            
+            # Saudação inicial (usando configuração do config.py)
+            greeting = config.ASSISTANT_GREETING
+            print(Fore.GREEN + f"🤖 {ASSISTANT_NAME}: {greeting}")
+            return self._say(turn, greeting)
         
-        # 3. Verificar se estamos aguardando confirmação de comando
+        # 2. Verificar se estamos aguardando confirmação de comando
         if self.waiting_confirmation is not None:
-            self._handle_confirmation_response(user_text)
-            return
-
-        # 3.6 Detectar comandos locais (abrir navegador, etc.)
-        cmd = self.command_executor.parse(user_text)
+            return self._say(turn, self._handle_confirmation_response(user_text))
+
+        # 2.5 Velocidade da fala ("fale mais rápido") — aplicada na reprodução
+        speed_direction = detect_speed_command(user_text)
+        if speed_direction:
+            msg = self._change_speech_speed(speed_direction)
+            print(Fore.CYAN + f"\n🤖 {ASSISTANT_NAME}: {msg}")
+            return self._say(turn, msg)
+
+        # 2.6 Uma passada pelos gatilhos de comandos, sistema e pesquisa;
+        # o comando local (abrir navegador, etc.) é tentado primeiro
+        route = self.router.route(user_text)
+        cmd = route.command
         if cmd:
             # Comando explícito (ex: "abra o navegador") → executa direto
             if cmd.get("match_type") == "explicit":
-                self._ask_command_confirmation(cmd)
-                return
+                return self._say(turn, self._ask_command_confirmation(cmd))
 
-            # Comando implícito (ex: "calendário" sozinho) → verifica intenção com LLM
+            # Comando implícito (ex: "calendário" sozinho) → verifica a intenção
             # para evitar falso positivo (ex: "calendário dos jogos" não abre o Calendar)
-            intent_prompt = (
-                f"O usuário disse: \"{user_text}\". "
-                f"O sistema detectou um possível comando: '{cmd['chave']}'. "
-                f"Responda APENAS 'COMANDO' se o usuário QUER ABRIR o aplicativo {cmd['chave']}, "
-                f"ou 'PERGUNTA' se o usuário está PEDINDO INFORMAÇÕES.\n"
-                f"Exemplos:\n"
-                f"- 'calendário' → COMANDO\n"
-                f"- 'calendário dos jogos' → PERGUNTA\n"
-                f"- 'navegador' → COMANDO\n"
-                f"- 'pesquisar no navegador' → PERGUNTA\n"
-                f"Responda apenas COMANDO ou PERGUNTA."
-            )
+            cmd['texto'] = user_text
             try:
-                intent_resp = self.llm.chat([
-                    {'role': 'system', 'content': 'Classifique a intenção do usuário. Responda apenas COMANDO ou PERGUNTA.'},
-                    {'role': 'user', 'content': intent_prompt},
-                ])
-                intent_text = self.extract_ai_response(intent_resp).strip().upper()
-                is_command = 'COMANDO' in intent_text and 'PERGUNTA' not in intent_text
-            except Exception:
-                is_command = True  # Em caso de erro, mantém o comando (comportamento seguro)
+                is_command = self._is_command_intent(user_text, cmd, turn.cancel)
+            except Cancelled:
+                return None
 
             if is_command:
-                self._ask_command_confirmation(cmd)
-                return
-            else:
-                logger.info(f'🧠 LLM reclassificou como PERGUNTA (não comando): {user_text[:60]}')
-                # Cai no fluxo normal (pesquisa web + LLM)
-
-        # 3.7 Detectar consultas sobre o sistema (disco, RAM, CPU, etc.)
-        sys_info_text = ""
-        system_query = detect_system_query(user_text)
-        if system_query:
-            logger.info(f'🖥️ Consulta de sistema: {system_query.name}')
-            print(Fore.CYAN + f'📊 Obtendo informações: {system_query.name}...')
-            output = system_query.execute()
+                return self._say(turn, self._ask_command_confirmation(cmd))
+            logger.info(f'🧠 Reclassificado como PERGUNTA (não comando): {user_text[:60]}')
+            # Cai no fluxo normal (pesquisa web + LLM)
+
+        # 2.7 Consultas sobre o sistema (disco, RAM, CPU, etc.) ou pesquisa na web:
+        # a mais bem colocada pelo roteador
+        best = route.best_of('system', 'search')
+        turn.system_query = best.target if best is not None and best.kind == 'system' else None
+        turn.needs_search = best is not None and best.kind == 'search'
+        if turn.system_query:
+            logger.info(f'🖥️ Consulta de sistema detectada: {turn.system_query.name}')
+        return turn
+    
+    def _is_command_intent(self, user_text, cmd, cancel=None):
+        """Comando implícito: o usuário quer abrir o app (True) ou está perguntando?
+
+        O classificador local decide em microssegundos; o LLM só é chamado
+        quando a confiança fica abaixo de INTENT_CONFIDENCE_THRESHOLD.
+        """
+        if self.intent_classifier is not None:
+            label = self.intent_classifier.decide(
+                user_text, config.INTENT_CONFIDENCE_THRESHOLD, key=cmd['chave'])
+            if label is not None:
+                return label == 'COMANDO'
+
+        intent_prompt = (
+            f"O usuário disse: \"{user_text}\". "
+            f"O sistema detectou um possível comando: '{cmd['chave']}'. "
+            f"Responda APENAS 'COMANDO' se o usuário QUER ABRIR o aplicativo {cmd['chave']}, "
+            f"ou 'PERGUNTA' se o usuário está PEDINDO INFORMAÇÕES.\n"
+            f"Exemplos:\n"
+            f"- 'calendário' → COMANDO\n"
+            f"- 'calendário dos jogos' → PERGUNTA\n"
+            f"- 'navegador' → COMANDO\n"
+            f"- 'pesquisar no navegador' → PERGUNTA\n"
+            f"Responda apenas COMANDO ou PERGUNTA."
+        )
+        try:
+            # Saída restrita: o modelo só pode responder um dos dois rótulos
+            with self.masker.stage('intent'):
+                label = self.llm_queue.classify([
+                    {'role': 'system', 'content': 'Classifique a intenção do usuário. Responda apenas COMANDO ou PERGUNTA.'},
+                    {'role': 'user', 'content': intent_prompt},
+                ], ['COMANDO', 'PERGUNTA'], kind='intent', cancel=cancel,
+                    max_tokens=config.LLM_CLASSIFY_MAX_TOKENS)
+        except Cancelled:
+            raise
+        except Exception:
+            return True  # Em caso de erro, mantém o comando (comportamento seguro)
+        
+        # Caso incerto decidido pelo LLM: vira exemplo para o classificador local
+        if self.intent_classifier is not None and config.INTENT_LEARN_FROM_LLM:
+            self.intent_classifier.add_example(user_text, label, key=cmd['chave'])
+        return label == 'COMANDO'
+    
+    def _enrich_stage(self, turn):
+        """Etapa de enriquecimento: informações do sistema e pesquisa na web"""
+        if turn.direct:
+            return turn
+        
+        # Consulta de sistema
+        if turn.system_query:
+            logger.info(f'🖥️ Consulta de sistema: {turn.system_query.name}')
+            print(Fore.CYAN + f'📊 Obtendo informações: {turn.system_query.name}...')
+            with self.masker.stage('system'):
+                output = turn.system_query.execute()
             if output:
-                sys_info_text = fmt_sysinfo(system_query.name, output)
+                turn.sys_info_text = fmt_sysinfo(turn.system_query.name, output)
                 print(Fore.GREEN + f'   ✅ {len(output)} caracteres obtidos')
-
-        # 3.8 Detectar necessidade de pesquisa na web (se não for consulta de sistema)
-        search_results = ""
-        search_offline = False
-        if not system_query and needs_search(user_text):
-            logger.info(f'🔍 Intenção de busca detectada: {user_text[:80]}')
+        
+        # Pesquisa na web
+        elif turn.needs_search:
+            logger.info(f'🔍 Intenção de busca detectada: {turn.user_text[:80]}')
             if not check_internet():
-                search_offline = True
+                turn.search_offline = True
                 print(Fore.YELLOW + '⚠️  Sem acesso à internet — vou responder com meu conhecimento')
             else:
                 print(Fore.CYAN + '🔍 Pesquisando na web...')
-                search_results = search_web(user_text)
-                if search_results:
-                    result_count = search_results.count('\n1. ')
+                with self.masker.stage('search'):
+                    turn.search_results = search_web(turn.user_text, cancel=turn.cancel)
+                if turn.search_results:
+                    result_count = turn.search_results.count('\n1. ')
                     print(Fore.CYAN + f'   → {result_count} resultado(s) encontrado(s)')
                 else:
                     print(Fore.YELLOW + '   → Nenhum resultado encontrado')
-
-        # 4. Se estiver ativa, processar normalmente
+        return turn
+    
+    def _llm_stage(self, turn):
+        """Etapa LLM: monta o contexto e obtém a resposta"""
+        if turn.direct:
+            return turn
+        
         # Incluir memórias persistentes no system prompt
         memory_context = self.memory.get_context()
         system_prompt = (
@@ -1317,27 +1496,28 @@ class ChicaAssistant:
             messages.append(msg)
         
         # Injetar informações do sistema (se houver)
-        if sys_info_text:
-            messages.append({'role': 'system', 'content': sys_info_text})
+        if turn.sys_info_text:
+            messages.append({'role': 'system', 'content': turn.sys_info_text})
         
         # Injetar contexto de pesquisa na web
-        if search_offline:
+        if turn.search_offline:
             messages.append({'role': 'system', 'content': (
                 '\n\n⚠️ OBSERVAÇÃO IMPORTANTE: Sem acesso à internet no momento. '
                 'Use seu conhecimento para responder à pergunta do usuário. '
                 'Se você não souber a resposta, avise educadamente que está sem conexão '
                 'e que não pode pesquisar agora, oferecendo ajuda com outro assunto.'
             )})
-        elif search_results:
-            search_context = format_for_prompt(search_results)
+        elif turn.search_results:
+            search_context = format_for_prompt(turn.search_results)
             if search_context:
                 messages.append({'role': 'system', 'content': search_context})
         
-        messages.append({'role': 'user', 'content': user_text})
+        messages.append({'role': 'user', 'content': turn.user_text})
         
         # Obter resposta via LLMClient (Ollama ou LM Studio)
         try:
-            response = self.llm.chat(messages)
+            with self.masker.stage('llm'):
+                response = self.llm_queue.chat(messages, kind='reply', cancel=turn.cancel)
             
             # Extrair resposta considerando o campo thinking
             ai_reply = self.extract_ai_response(response)
@@ -1371,204 +1551,60 @@ class ChicaAssistant:
             else:
                 print(Fore.GREEN + f"\n🤖 {ASSISTANT_NAME}: {clean_display}")
             
+        except Cancelled:
+            return None
         except (LLMError, Exception) as e:
             print(Fore.RED + f"Erro na IA: {e}")
-            ai_reply = "Desculpe, tive um problema ao processar."
-            return
+            # Frase fixa — vem pronta do cache de TTS
+            return self._say(turn, config.MSG_PROCESSING_ERROR)
         
-        # 5. Atualizar histórico
-        self.conversation_history.append({'role': 'user', 'content': user_text})
+        # Atualizar histórico
+        self.conversation_history.append({'role': 'user', 'content': turn.user_text})
         self.conversation_history.append({'role': 'assistant', 'content': ai_reply})
+        turn.reply = ai_reply
+        return turn
+    
+    def _tts_stage(self, turn):
+        """Etapa TTS: áudio completo ou, em streaming, o gerador consumido na reprodução"""
+        clean_for_tts = self.clean_text_for_tts(turn.reply)
+        if not clean_for_tts:
+            return None
+        if self.tts.streaming and not turn.direct:
+            # Qwen3 / Edge-TTS: toca enquanto gera (primeiro áudio bem antes);
+            # frases prontas vêm do cache de TTS
+            turn.chunks = self.tts.synthesize_stream(clean_for_tts, cancel=turn.cancel)
+        else:
+            with self.masker.stage('tts'):
+                turn.audio_path = self.text_to_speech(clean_for_tts, cancel=turn.cancel)
+            if not turn.audio_path:
+                return None
+        return turn
+    
+    def _playback_stage(self, turn):
+        """Etapa de reprodução: toca a resposta (com interrupção) e fecha o turno"""
+        self.reset_inactivity_counter()
+        if turn.chunks is not None:
+            self.play_audio_stream(turn.chunks, self.tts.sample_rate)
+        else:
+            self.play_audio_with_interruption(turn.audio_path)
         
-        # 6. Limpar texto para TTS
-        clean_for_tts = self.clean_text_for_tts(ai_reply)
-        
-        # 7. Converter para áudio e reproduzir
-        if clean_for_tts:
-            self.reset_inactivity_counter()
-            audio_file = self.text_to_speech(clean_for_tts)
-            if audio_file:
-                self.play_audio_with_interruption(audio_file)
-        
-        # 8. Atualizar contador de inatividade após resposta
+        # Atualizar contador de inatividade após resposta
         self.reset_inactivity_counter()
+        logger.debug(f"Turno concluído em {time.perf_counter() - turn.started_at:.2f}s")
+
+        # Extrair memória: imediata (padrões) + LLM em lote, em segundo plano;
+        # interrompida pelo usuário, a interação não vai para a extração
+        if not turn.direct:
+            self.memory.extract_immediate(turn.user_text)
+            if not turn.cancel.cancelled:
+                self.memory_extractor.add_turn(turn.user_text, turn.reply)
+        return None
 
-        # 9. Extrair memória: imediata (padrões) + LLM (toda interação)
-        self.memory.extract_immediate(user_text)
-        self._extract_memory(user_text, ai_reply)
-
-    def text_to_speech(self, text):
-        """Converte texto para áudio"""
+    def text_to_speech(self, text, cancel=None):
+        """Converte texto para áudio (.wav temporário)"""
         if not text:
             return None
-
-        # Edge-TTS: usa o TTSManager (async, internet, fallback automático)
-        if self.tts_system == 'edge' and hasattr(self, 'edge_tts'):
-            return self.edge_tts.synthesize(text)
-
-        try:
-            # Dividir texto em frases menores para processamento mais rápido
-            sentences = re.split(r'[.!?]+', text)
-            sentences = [s.strip() for s in sentences if s.strip()]
-            
-            audio_chunks = []
-            
-            # Processar cada frase separadamente para melhor performance
-            for sentence in sentences:
-                if not sentence:
-                    continue
-                    
-                # Adicionar pontuação final se necessário
-                if not sentence[-1] in '.!?':
-                    sentence += '.'
-                
-                # Usar sistema TTS baseado na configuração
-                if self.tts_system == 'kokoro':
-                    # Processar configuração de voz kokoro
-                    voice_config = parse_voice_config(TTS_VOICE)
-                    
-                    # Verificar se é mesclagem de vozes
-                    if len(voice_config) == 1:
-                        # Voz única
-                        voice_name = list(voice_config.keys())[0]
-                        generator = self.tts_pipeline(sentence, voice=voice_name, speed=TTS_SPEED)
-                        
-                        for _, _, audio in generator:
-                            audio_chunks.append(audio)
-                            # Limitar para evitar muito processamento
-                            if len(audio_chunks) > 30:
-                                break
-                    else:
-                        # Mesclagem de vozes
-                        voices = list(voice_config.keys())
-                        percents = list(voice_config.values())
-                        
-                        # Gerar áudio para cada voz
-                        voice_audios = []
-                        for voice_name in voices:
-                            generator = self.tts_pipeline(sentence, voice=voice_name, speed=TTS_SPEED)
-                            voice_audio_chunks = []
-                            for _, _, audio in generator:
-                                voice_audio_chunks.append(audio)
-                                if len(voice_audio_chunks) > 10:  # Limitar para performance
-                                    break
-                            
-                            if voice_audio_chunks:
-                                # Concatenar chunks da voz atual
-                                voice_audio = np.concatenate(voice_audio_chunks)
-                                voice_audios.append(voice_audio)
-                        
-                        # Mesclar as vozes se tivermos pelo menos uma
-                        if voice_audios:
-                            # Garantir que todos os áudios tenham o mesmo comprimento
-                            min_length = min(len(audio) for audio in voice_audios)
-                            trimmed_audios = [audio[:min_length] for audio in voice_audios]
-                            
-                            # Aplicar pesos das vozes
-                            weighted_audios = []
-                            for i, audio in enumerate(trimmed_audios):
-                                weight = percents[i] / 100.0
-                                weighted_audios.append(audio * weight)
-                            
-                            # Combinar as vozes
-                            mixed_audio = np.sum(weighted_audios, axis=0)
-                            
-                            # Normalizar para evitar clipping
-                            max_val = np.max(np.abs(mixed_audio))
-                            if max_val > 1.0:
-                                mixed_audio = mixed_audio / max_val * 0.95
-                            
-                            audio_chunks.append(mixed_audio)
-                else:
-                    # Usar Qwen3-TTS
-                    if self.qwen3_pipeline:
-                        # Gerar áudio com Qwen3-TTS
-                        try:
-                            # Verificar cache para frases curtas (melhora performance)
-                            cache_key = f"{sentence}_{QWEN3_VOICE}_{QWEN3_LANGUAGE}"
-                            if len(sentence) < 100 and cache_key in self.tts_cache:
-                                # Usar áudio do cache
-                                audio = self.tts_cache[cache_key]
-                                audio_chunks.append(audio)
-                                print(Fore.CYAN + f"   • Cache hit: '{sentence[:50]}...'")
-                            else:
-                                # Gerar novo áudio
-                                result = self.qwen3_pipeline.generate_custom_voice(
-                                    text=sentence,
-                                    speaker=QWEN3_VOICE,
-                                    language=QWEN3_LANGUAGE,
-                                    non_streaming_mode=True
-                                )
-                                
-                                if result and len(result) > 0:
-                                    # O resultado é uma tupla (audio_list, sample_rate)
-                                    audio_list, sample_rate = result
-                                    if audio_list and len(audio_list) > 0:
-                                        audio = audio_list[0]  # Pegar o primeiro áudio
-                                        audio_chunks.append(audio)
-                                        
-                                        # Armazenar no cache para frases curtas
-                                        if len(sentence) < 100:
-                                            # Limpar cache se estiver muito grande
-                                            if len(self.tts_cache) >= self.max_cache_size:
-                                                # Remover item mais antigo (simples)
-                                                first_key = next(iter(self.tts_cache))
-                                                del self.tts_cache[first_key]
-                                            self.tts_cache[cache_key] = audio
-                                            print(Fore.CYAN + f"   • Cache stored: '{sentence[:50]}...'")
-                        except Exception as e:
-                            print(Fore.YELLOW + f"⚠️  Erro ao gerar áudio com Qwen3-TTS: {e}")
-                            # Tentar fallback para Kokoro-TTS se disponível
-                            if self.tts_pipeline:
-                                print(Fore.YELLOW + f"⚠️  Tentando fallback para Kokoro-TTS...")
-                                voice_config = parse_voice_config(TTS_VOICE)
-                                if len(voice_config) == 1:
-                                    voice_name = list(voice_config.keys())[0]
-                                    generator = self.tts_pipeline(sentence, voice=voice_name, speed=TTS_SPEED)
-                                    for _, _, audio in generator:
-                                        audio_chunks.append(audio)
-                                        break
-            
-            if audio_chunks:
-                # Converter chunks de tensor para numpy array antes de processar
-                audio_chunks_np = []
-                for chunk in audio_chunks:
-                    # Converter tensor para numpy se necessário
-                    if hasattr(chunk, 'numpy'):
-                        audio_chunks_np.append(chunk.numpy())
-                    else:
-                        audio_chunks_np.append(chunk)
-                
-                audio_chunks = audio_chunks_np
-                
-                # Suavizar transições entre chunks
-                if len(audio_chunks) > 1:
-                    # Aplicar fade in/out suave entre chunks
-                    fade_duration = int(0.02 * TTS_SAMPLE_RATE)  # 20ms fade
-                    for i in range(1, len(audio_chunks)):
-                        if len(audio_chunks[i-1]) > fade_duration and len(audio_chunks[i]) > fade_duration:
-                            # Fade out no final do chunk anterior
-                            fade_out = np.linspace(1, 0, fade_duration)
-                            faded_end = np.multiply(audio_chunks[i-1][-fade_duration:], fade_out)
-                            audio_chunks[i-1] = np.concatenate([audio_chunks[i-1][:-fade_duration], faded_end])
-                            
-                            # Fade in no início do chunk atual
-                            fade_in = np.linspace(0, 1, fade_duration)
-                            faded_start = np.multiply(audio_chunks[i][:fade_duration], fade_in)
-                            audio_chunks[i] = np.concatenate([faded_start, audio_chunks[i][fade_duration:]])
-                
-                final_audio = np.concatenate(audio_chunks)
-                
-                # Salvar em arquivo temporário
-                temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                sf.write(temp_file.name, final_audio, TTS_SAMPLE_RATE)
-                
-                return temp_file.name
-                
-        except Exception as e:
-            print(Fore.RED + f"Erro no TTS ({self.tts_system}): {e}")
-        
-        return None
+        return self.tts.synthesize(text, cancel=cancel)
     
     def start_avatar(self):
         """Inicia o avatar"""
@@ -1608,18 +1644,28 @@ class ChicaAssistant:
         if not audio_path or not os.path.exists(audio_path):
             return
         
+        try:
+            # Ler áudio e converter para float32 (compatível com sounddevice)
+            audio_data, samplerate = sf.read(audio_path, dtype='float32')
+            self.play_audio_stream([audio_data], samplerate)
+        except Exception as e:
+            print(Fore.RED + f"\nErro ao reproduzir áudio: {e}")
+        
+        # Limpar arquivo
+        try:
+            os.unlink(audio_path)
+        except:
+            pass
+    
+    def play_audio_stream(self, chunks, samplerate):
+        """Reproduz áudio que chega em pedaços (ex: TTS em streaming), com interrupção"""
         # Iniciar avatar se ainda não foi iniciado
         if config.AVATAR_ENABLE:
             self.start_avatar()
         
+        interruption_detected = False
+        interruption_thread = None
         try:
-            # Ler áudio e converter para float32 (compatível com sounddevice)
-            audio_data, samplerate = sf.read(audio_path, dtype='float32')
-            
-            # Garantir que o áudio está no formato correto
-            if audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
-            
             # Ativar modo de fala da IA
             self.is_speaking_tts = True
             self.interruption_buffer = []  # Limpar buffer de interrupção
@@ -1629,13 +1675,13 @@ class ChicaAssistant:
                 self.avatar.set_speaking(True)
             
             # Usar threading para verificação de interrupção em paralelo
-            interruption_detected = False
-            
             def check_interruption_thread():
                 nonlocal interruption_detected
                 while not interruption_detected and self.is_speaking_tts:
                     if self.check_interruption():
                         interruption_detected = True
+                        self.player.flush()  # Corta já no próximo bloco do callback
+                        self._cancel_turns()  # Para LLM, síntese e pesquisa em andamento
                         break
                     time.sleep(0.05)  # Verificar a cada 50ms (mais responsivo)
             
@@ -1643,36 +1689,41 @@ class ChicaAssistant:
             interruption_thread = threading.Thread(target=check_interruption_thread, daemon=True)
             interruption_thread.start()
             
-            # Reproduzir áudio de forma contínua com buffer streaming
-            # para evitar cortes entre chunks
-            stream = sd.OutputStream(
-                samplerate=samplerate,
-                channels=1,
-                dtype='float32',
-                blocksize=1024  # Tamanho menor do bloco para menor latência
-            )
+            # Os pedaços entram na fila do stream persistente e tocam emendados
+            # (o callback puxa as amostras; nada de write bloqueante)
+            self.lipsync.reset()
+            first_chunk = True
+            for audio_data in chunks:
+                if interruption_detected:
+                    break
+                if first_chunk:
+                    # Áudio de verdade pronto: cancela a frase de espera e
+                    # zera o relógio da resposta (lip-sync)
+                    self.masker.cancel()
+                    self.player.begin_reply()
+                    first_chunk = False
+                self.lipsync.extend(audio_data, samplerate)
+                self.player.enqueue(audio_data, samplerate)
+            
+            # Esperar a fila terminar de tocar (ou a interrupção)
+            self.player.wait(stop=lambda: interruption_detected)
             
-            with stream:
-                total_samples = len(audio_data)
-                position = 0
-                chunk_size = 2048  # Pequenos chunks para streaming suave
+            if interruption_detected:
+                self.player.flush()
+                print(Fore.YELLOW + f"\n🛑 {ASSISTANT_NAME} interrompida pelo usuário!")
                 
-                while position < total_samples and not interruption_detected:
-                    chunk = audio_data[position:min(position + chunk_size, total_samples)]
-                    stream.write(chunk)
-                    position += len(chunk)
-                    
-                    # Pequena pausa para permitir verificação de interrupção
-                    time.sleep(0.01)
+        except Exception as e:
+            self.player.flush()
+            print(Fore.RED + f"\nErro ao reproduzir áudio: {e}")
+        finally:
+            # Interrompe a geração que ainda estiver em andamento
+            if hasattr(chunks, 'close'):
+                chunks.close()
             
             # Sinalizar para a thread parar
             interruption_detected = True
-            
-            # Esperar thread terminar
-            interruption_thread.join(timeout=0.5)
-            
-            if interruption_detected:
-                print(Fore.YELLOW + f"\n🛑 {ASSISTANT_NAME} interrompida pelo usuário!")
+            if interruption_thread:
+                interruption_thread.join(timeout=0.5)
             
             # Desativar modo de fala
             self.is_speaking_tts = False
@@ -1681,19 +1732,6 @@ class ChicaAssistant:
             # Desativar animação de fala no avatar
             if config.AVATAR_ENABLE and self.avatar_started:
                 self.avatar.set_speaking(False)
-            
-            # Limpar arquivo
-            try:
-                os.unlink(audio_path)
-            except:
-                pass
-                
-        except Exception as e:
-            print(Fore.RED + f"\nErro ao reproduzir áudio: {e}")
-            self.is_speaking_tts = False
-            # Desativar animação de fala no avatar em caso de erro
-            if config.AVATAR_ENABLE and self.avatar_started:
-                self.avatar.set_speaking(False)
     
     def play_audio(self, audio_path):
         """Reproduz áudio normalmente (para saudação inicial)"""
@@ -1701,9 +1739,9 @@ class ChicaAssistant:
             return
         
         try:
-            audio_data, samplerate = sf.read(audio_path)
-            sd.play(audio_data, samplerate)
-            sd.wait()
+            audio_data, samplerate = sf.read(audio_path, dtype='float32')
+            self.player.enqueue(audio_data, samplerate)
+            self.player.wait()
             
             # Limpar arquivo
             try:
@@ -1714,6 +1752,31 @@ class ChicaAssistant:
         except Exception as e:
             print(Fore.RED + f"\nErro ao reproduzir áudio: {e}")
     
+    def _open_input_stream(self, blocksize):
+        """(Re)abre a captura do microfone com blocos de blocksize amostras"""
+        if self._input_stream is not None:
+            self._input_stream.close()
+        self.capture_block = blocksize
+        self.silence_chunks_needed = max(1, int(SILENCE_DURATION * SAMPLE_RATE / blocksize))
+        self.silence_chunks_counter = 0
+        self.consecutive_speech_chunks = 0
+        
+        stream_kwargs = {
+            'samplerate': SAMPLE_RATE,
+            'channels': CHANNELS,
+            'dtype': 'float32',
+            'blocksize': blocksize,
+            'callback': self._capture_callback
+        }
+        
+        # Adicionar dispositivo se especificado
+        if self.audio_device_id is not None:
+            stream_kwargs['device'] = self.audio_device_id
+        
+        self._input_stream = sd.InputStream(**stream_kwargs)
+        self._input_stream.start()
+        logger.debug(f"Captura do microfone em blocos de {blocksize} amostras")
+    
     def run(self):
         """Executa o chat contínuo"""
         print(Fore.YELLOW + "\n🎯 MODO POR VOZ ATIVADO")
@@ -1722,50 +1785,36 @@ class ChicaAssistant:
         print(f"• Fale naturalmente - ela detecta pausas automaticamente")
         print(f"• Após {INACTIVITY_TIMEOUT}s sem falar, ela volta a dormir")
         print(f"• Diga 'calado', 'calada' ou 'silêncio' para interrompê-la")
+        print(f"• Diga 'fale mais rápido' ou 'mais devagar' para mudar a velocidade da fala")
         print(f"• Sensibilidade: {SPEECH_THRESHOLD} (ajuste nas linhas 48-62)")
         print("• Pressione CTRL+C para sair")
         print(Fore.CYAN + "-"*40)
         print(Fore.GREEN + f"\n🎤 {ASSISTANT_NAME} pronta para ouvir...")
         
-        # Configurar stream de áudio
-        stream_kwargs = {
-            'samplerate': SAMPLE_RATE,
-            'channels': CHANNELS,
-            'dtype': 'float32',
-            'blocksize': CHUNK,
-            'callback': self._check_interruption
-        }
-        
-        # Adicionar dispositivo se especificado
         if self.audio_device_id is not None:
-            stream_kwargs['device'] = self.audio_device_id
             print(Fore.GREEN + f"🎤 Usando dispositivo de áudio: {AUDIO_DEVICE}")
         
-        stream = sd.InputStream(**stream_kwargs)
-        
         try:
-            with stream:
-                last_status_check = time.time()
-                last_avatar_update = time.time()
-                avatar_update_interval = 0.016  # ~60 FPS
-                
-                while self.is_listening:
-                    current_time = time.time()
-                    
-                    # Verificar inatividade a cada 5 segundos
-                    if current_time - last_status_check > 5.0:
-                        self.check_inactivity()
-                        last_status_check = current_time
-                    
-                    # Atualizar avatar periodicamente
-                    if current_time - last_avatar_update > avatar_update_interval:
-                        self.update_avatar()
-                        last_avatar_update = current_time
-                    
-                    time.sleep(0.001)  # Sleep mais curto para melhor responsividade
+            # Começa dormindo (esperando a wake word)
+            self.power.enter('sleeping')
+            if self.avatar_started:
+                self.avatar.set_sleeping(True)
+            self.pipeline.start()
+            self.memory_extractor.start()
+            self._open_input_stream(self.power.profile['capture_block'])
+            
+            # O áudio chega pelo callback; esta thread só atende prazos
+            # (inatividade, avatar, perfil de energia) e dorme de verdade entre eles
+            if self.avatar is not None:
+                self.scheduler.post(self._avatar_tick)
+            self._schedule_inactivity_check()
+            self.scheduler.run()
                     
         except Exception as e:
             print(Fore.RED + f"\nErro no stream de áudio: {e}")
+        finally:
+            if self._input_stream is not None:
+                self._input_stream.close()
         
         print(Fore.CYAN + "\n" + "="*60)
         print(Fore.GREEN + f"{ASSISTANT_NAME} encerrada.")
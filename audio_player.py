@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Reprodutor de áudio com stream de saída persistente (callback).
+
+Um único sd.OutputStream fica aberto durante toda a execução. O callback
+do PortAudio puxa as amostras de uma fila de reprodução:
+
+    • enqueue() acrescenta áudio à fila — frases seguidas tocam emendadas,
+      sem lacuna (as amostras saem contíguas no mesmo stream)
+    • flush() esvazia a fila na hora (interrupção do usuário), com um fade
+      curto para não estalar — só o que já estava na fila: o áudio
+      enfileirado depois do flush() toca normalmente
+    • wait() espera a fila terminar de tocar (inclusive o último bloco,
+      que ainda passa pela latência do dispositivo)
+    • speed muda a velocidade na hora (time_stretch/WSOLA), inclusive do
+      áudio já enfileirado — sem re-sintetizar
+    • reply_position() diz quanto da resposta atual já tocou (para o
+      lip-sync); se a fila secar no meio, a posição para junto com o som
+
+Sem abrir o dispositivo a cada resposta, sem write() bloqueante e sem
+sleep entre blocos: a interrupção vale no próximo bloco do callback.
+
+Uso:
+    from audio_player import AudioPlayer
+
+    player = AudioPlayer(samplerate=24000)
+    player.enqueue(audio)   # float32 mono
+    player.wait()
+    player.close()
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional, Union
+
+import numpy as np
+import sounddevice as sd
+
+import config
+from log import logger
+from time_stretch import TimeStretcher
+
+
+class AudioPlayer:
+    """Fila de reprodução tocada por um OutputStream persistente.
+
+    Args:
+        samplerate: Taxa do áudio enfileirado (reabre o stream se mudar).
+        blocksize: Amostras por chamada do callback (latência da interrupção).
+        device: Dispositivo de saída do sounddevice (None = padrão).
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        blocksize: Optional[int] = None,
+        device: Optional[Union[int, str]] = None,
+    ) -> None:
+        self.samplerate: int = samplerate
+        self.blocksize: int = blocksize or config.AUDIO_OUTPUT_BLOCKSIZE
+        self.device = device
+        self._queue: deque[np.ndarray] = deque()
+        self._offset: int = 0          # posição dentro do primeiro buffer da fila
+        self._lock = threading.Lock()
+        self._drained = threading.Event()
+        self._drained.set()
+        self._fade = np.zeros(0, dtype=np.float32)  # fim do áudio descartado, descendo a zero
+        self._stream: Optional[sd.OutputStream] = None
+        self._speed: float = config.PLAYBACK_SPEED
+        self._stretcher: Optional[TimeStretcher] = None
+        self._stretched = np.zeros(0, dtype=np.float32)  # saída do WSOLA ainda não tocada
+        self.samples_played: int = 0
+        self.underruns: int = 0
+        # Relógio da resposta: amostras de origem (antes do WSOLA) tocadas e
+        # o instante em que a amostra 0 da resposta tocou/tocaria
+        self._source_enqueued: int = 0
+        self._source_played: float = 0.0
+        self._reply_start: int = 0
+        self._latency: float = 0.0
+        self._drain_at: Optional[float] = None  # quando o último bloco entregue acaba de soar
+        self.clock: tuple[float, float] = (time.monotonic(), 1.0)  # (âncora, velocidade)
+
+    # ------------------------------------------------------------------
+    # Stream
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Abre e inicia o stream de saída (se ainda não estiver aberto)."""
+        if self._stream is not None:
+            return
+        self._stream = sd.OutputStream(
+            samplerate=self.samplerate,
+            channels=1,
+            dtype='float32',
+            blocksize=self.blocksize,
+            device=self.device,
+            latency=config.AUDIO_OUTPUT_LATENCY,
+            callback=self._callback,
+        )
+        self._stream.start()
+        self._latency = float(self._stream.latency)
+        logger.debug(f"Saída de áudio aberta ({self.samplerate} Hz, blocos de {self.blocksize})")
+
+    def close(self) -> None:
+        """Fecha o stream e descarta a fila."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        with self._lock:
+            self._discard()
+
+    def _ensure_samplerate(self, samplerate: Optional[int]) -> None:
+        if samplerate and samplerate != self.samplerate:
+            self.wait()  # o que já está na fila toca na taxa antiga
+            self.close()
+            self.samplerate = samplerate
+        self.start()
+
+    def _callback(self, outdata: np.ndarray, frames: int, time_info, status) -> None:
+        if status.output_underflow:
+            self.underruns += 1
+        out = outdata[:, 0]
+        with self._lock:
+            # Este bloco começa a soar daqui a _latency segundos; sem áudio
+            # na fila a âncora anda junto com o tempo (posição congelada)
+            played = (self._source_played - self._reply_start) / self.samplerate
+            self.clock = (time.monotonic() + self._latency - played / self._speed, self._speed)
+            if self._stretcher is None and self._speed != 1.0:
+                self._stretcher = TimeStretcher(self.samplerate)
+            # Depois de um flush(): primeiro o fade do que foi descartado
+            faded = min(frames, len(self._fade))
+            out[:faded] = self._fade[:faded]
+            self._fade = self._fade[faded:]
+            if self._stretcher is None:
+                read = self._read(out[faded:], frames - faded)
+                self._source_played += read
+            else:
+                read = self._read_stretched(out[faded:], frames - faded)
+                self._source_played += read * self._speed
+            filled = faded + read
+            self.samples_played += filled
+            if not self._queue and not len(self._stretched) and not len(self._fade):
+                self._source_played = float(self._source_enqueued)  # corrige a estimativa do WSOLA
+                if self._stretcher is not None and self._speed == 1.0:
+                    self._stretcher = None  # fila vazia: volta ao caminho direto
+                now = time.monotonic()
+                if filled:
+                    # O último bloco só começa a soar daqui a _latency segundos
+                    self._drain_at = now + self._latency + frames / self.samplerate
+                elif self._drain_at is None or now >= self._drain_at:
+                    self._drain_at = None
+                    self._drained.set()
+        out[filled:] = 0.0
+
+    def _read(self, out: np.ndarray, frames: int) -> int:
+        """Copia até frames amostras da fila para out (sem mudar a velocidade)."""
+        filled = 0
+        while filled < frames and self._queue:
+            head = self._queue[0]
+            take = min(frames - filled, len(head) - self._offset)
+            out[filled:filled + take] = head[self._offset:self._offset + take]
+            filled += take
+            self._offset += take
+            if self._offset >= len(head):
+                self._queue.popleft()
+                self._offset = 0
+        return filled
+
+    def _read_stretched(self, out: np.ndarray, frames: int) -> int:
+        """Passa a fila pelo WSOLA até ter frames amostras na velocidade atual."""
+        assert self._stretcher is not None
+        raw = np.empty(frames, dtype=np.float32)
+        while len(self._stretched) < frames:
+            count = self._read(raw, frames)
+            if count:
+                produced = self._stretcher.process(raw[:count], self._speed)
+            elif self._stretcher.pending:
+                produced = self._stretcher.drain(self._speed)  # fim do que foi enfileirado
+            else:
+                break
+            self._stretched = np.concatenate([self._stretched, produced])
+        filled = min(frames, len(self._stretched))
+        out[:filled] = self._stretched[:filled]
+        self._stretched = self._stretched[filled:]
+        return filled
+
+    def _discard(self) -> None:
+        """Esvazia a fila e o estado do WSOLA (chamado com o lock)."""
+        self._queue.clear()
+        self._offset = 0
+        self._fade = np.zeros(0, dtype=np.float32)
+        self._stretched = np.zeros(0, dtype=np.float32)
+        if self._stretcher is not None:
+            self._stretcher.reset()
+        self._source_played = float(self._source_enqueued)
+        self._drain_at = None
+        self._drained.set()
+
+    # ------------------------------------------------------------------
+    # Fila
+    # ------------------------------------------------------------------
+
+    def enqueue(self, audio: np.ndarray, samplerate: Optional[int] = None) -> None:
+        """Acrescenta áudio (mono) ao fim da fila, emendado ao anterior."""
+        audio = np.ascontiguousarray(audio, dtype=np.float32).reshape(-1)
+        if not audio.size:
+            return
+        self._ensure_samplerate(samplerate)
+        with self._lock:
+            self._queue.append(audio)
+            self._source_enqueued += len(audio)
+            self._drain_at = None
+            self._drained.clear()
+
+    def begin_reply(self) -> None:
+        """O próximo áudio enfileirado é o início de uma resposta (zera o relógio)."""
+        with self._lock:
+            self._reply_start = self._source_enqueued
+
+    def reply_position(self) -> float:
+        """Segundos (do áudio original) da resposta atual que já soaram."""
+        anchor, rate = self.clock
+        return max(0.0, (time.monotonic() - anchor) * rate)
+
+    def flush(self) -> None:
+        """Descarta o que já está na fila e ainda não tocou.
+
+        Com o stream ativo, o próximo bloco que tocaria desce a zero (fade)
+        em vez de cortar seco; o áudio enfileirado depois toca em seguida.
+        """
+        with self._lock:
+            if not self._queue and not len(self._stretched):
+                return
+            fade = np.zeros(0, dtype=np.float32)
+            if self._stream is not None and self._stream.active:
+                fade = np.zeros(self.blocksize, dtype=np.float32)
+                if self._stretcher is None:
+                    count = self._read(fade, self.blocksize)
+                else:
+                    count = self._read_stretched(fade, self.blocksize)
+                fade = fade[:count] * np.linspace(1.0, 0.0, count, dtype=np.float32)
+            self._discard()
+            if len(fade):
+                self._fade = fade
+                self._drained.clear()
+
+    def wait(self, timeout: Optional[float] = None, stop: Optional[Callable[[], bool]] = None,
+             poll: float = 0.05) -> bool:
+        """Espera a fila esvaziar; True se terminou de tocar.
+
+        Com stop, confere a condição a cada poll segundos e retorna False
+        assim que ela for verdadeira (ex: interrupção).
+        """
+        if stop is None:
+            return self._drained.wait(timeout)
+        waited = 0.0
+        while not self._drained.wait(poll):
+            if stop():
+                return False
+            waited += poll
+            if timeout is not None and waited >= timeout:
+                return False
+        return True
+
+    @property
+    def is_playing(self) -> bool:
+        return not self._drained.is_set()
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    @speed.setter
+    def speed(self, value: float) -> None:
+        """Muda a velocidade (vale a partir do próximo bloco, inclusive na fila)."""
+        value = min(config.PLAYBACK_SPEED_MAX, max(config.PLAYBACK_SPEED_MIN, value))
+        with self._lock:
+            self._speed = round(value, 2)
+
+    @property
+    def queued_seconds(self) -> float:
+        """Áudio ainda na fila (segundos, já na velocidade atual)."""
+        with self._lock:
+            samples = sum(len(b) for b in self._queue) - self._offset
+            return samples / self.samplerate / self._speed + len(self._stretched) / self.samplerate
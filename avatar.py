@@ -4,6 +4,12 @@ Módulo do avatar animado da assistente Chica.
 
 Gerencia a janela Pygame com animações de piscar e falar,
 sincronizadas com o estado da assistente.
+
+A tela só é redesenhada quando a imagem muda (poucas vezes por segundo):
+as imagens são convertidas para o formato da tela uma vez, só o retângulo
+que difere entre dois estados é copiado (display.update com o retângulo
+sujo) e seconds_until_update() informa quanto falta para a próxima mudança
+(piscada ou boca), para o loop principal dormir até lá.
 """
 
 from __future__ import annotations
@@ -13,12 +19,37 @@ import os
 import platform
 import threading
 import time
+from typing import TYPE_CHECKING, Callable
 
+import numpy as np
 import pygame
-from pygame.locals import KEYDOWN, K_ESCAPE, QUIT
+from pygame.locals import KEYDOWN, K_ESCAPE, QUIT, VIDEOEXPOSE, VIDEORESIZE
 
 import config
 from colorama import Fore
+from power import get_profile
+
+if TYPE_CHECKING:
+    from lipsync import LipSyncTimeline
+
+# Passo da animação de fala sem lip-sync (AVATAR_SPEAK_ANIMATION_SPEED é por passo)
+_SPEAK_TICK = 0.016
+
+# Eventos que pedem redesenho completo (janela reexposta/redimensionada)
+_REDRAW_EVENTS = {VIDEOEXPOSE, VIDEORESIZE, getattr(pygame, 'WINDOWEXPOSED', VIDEOEXPOSE)}
+
+
+def _dirty_rect(a: pygame.Surface, b: pygame.Surface) -> pygame.Rect:
+    """Menor retângulo que contém todos os pixels diferentes entre a e b."""
+    try:
+        diff = np.any(pygame.surfarray.array3d(a) != pygame.surfarray.array3d(b), axis=2)
+    except Exception:
+        return a.get_rect()  # formato sem acesso direto: tela inteira
+    xs = np.flatnonzero(diff.any(axis=1))
+    ys = np.flatnonzero(diff.any(axis=0))
+    if not len(xs):
+        return pygame.Rect(0, 0, 0, 0)
+    return pygame.Rect(int(xs[0]), int(ys[0]), int(xs[-1] - xs[0] + 1), int(ys[-1] - ys[0] + 1))
 
 
 class AvatarManager:
@@ -33,11 +64,23 @@ class AvatarManager:
         self.running: bool = False
         self.animation_thread: threading.Thread | None = None
         self.is_speaking: bool = False
-        self.blink_timer: float = 0
         self.blink_interval: float = config.AVATAR_BLINK_INTERVAL
-        self.last_blink_time: float = time.time()
-        self.speak_animation_timer: float = 0
+        self.blink_duration: float = config.AVATAR_BLINK_DURATION
+        self.next_blink_at: float = time.monotonic() + self.blink_interval
+        self.blink_until: float = 0.0
+        self.speak_started: float = 0.0
         self.speak_animation_speed: float = config.AVATAR_SPEAK_ANIMATION_SPEED
+        self.lipsync: LipSyncTimeline | None = None
+        self.lipsync_clock: Callable[[], float] | None = None
+        self.mouth_override: bool | None = None    # boca vinda de fora (modo processo)
+        self.is_sleeping: bool = False
+        self.event_poll_interval: float = config.AVATAR_EVENT_POLL_INTERVAL
+
+        # Renderização sob demanda
+        self.next_update_at: float = 0.0           # próxima mudança prevista (monotonic)
+        self.on_change: Callable[[], None] | None = None  # acorda o loop (ex: começou a falar)
+        self._shown_state: str | None = None       # imagem na tela (None = redesenhar tudo)
+        self._dirty_rects: dict[tuple[str, str], pygame.Rect] = {}
 
         # Detectar SO
         self.is_macos: bool = platform.system() == 'Darwin'
@@ -114,15 +157,33 @@ class AvatarManager:
             print(Fore.RED + f"❌ Erro ao criar janela no macOS: {e}")
             return False
 
+    def _prepare_images(self, width: int, height: int) -> bool:
+        """Carrega, escala e converte as imagens para o formato da tela.
+
+        O fundo branco é aplicado aqui uma vez (convert_alpha + blit numa
+        superfície convert()): na renderização é só uma cópia opaca. Também
+        calcula o retângulo que muda entre cada par de estados.
+        """
+        if not self.load_images():
+            return False
+        for state, image in self.images.items():
+            scaled = pygame.transform.scale(image.convert_alpha(), (width, height))
+            surface = pygame.Surface((width, height)).convert()
+            surface.fill((255, 255, 255))
+            surface.blit(scaled, (0, 0))
+            self.images[state] = surface
+        self._dirty_rects = {
+            (a, b): _dirty_rect(self.images[a], self.images[b])
+            for a in self.images for b in self.images if a != b
+        }
+        self._shown_state = None
+        return True
+
     def _finish_window_init(self, width: int, height: int) -> bool:
         """Finaliza a inicialização da janela (comum a todos os SOs)."""
         try:
-            if not self.load_images():
+            if not self._prepare_images(width, height):
                 return False
-            for state in self.images:
-                self.images[state] = pygame.transform.scale(
-                    self.images[state], (width, height)
-                )
             self.screen = pygame.display.get_surface()
             self.running = True
             print(Fore.GREEN + f"✅ Janela do avatar inicializada ({width}x{height})")
@@ -141,43 +202,105 @@ class AvatarManager:
             return
         self.is_speaking = speaking
         if speaking:
-            self.speak_animation_timer = 0
-
-    def update_animation(self) -> None:
-        """Atualiza a animação (piscar e/ou falar)."""
-        now = time.time()
-
-        # Piscar (quando não está falando)
-        if not self.is_speaking:
-            if now - self.last_blink_time > self.blink_interval:
-                self.current_state = "olho"
-                self.last_blink_time = now
-                self.blink_timer = 0.2
-            elif self.blink_timer > 0:
-                self.blink_timer -= 0.016
-                if self.blink_timer <= 0:
-                    self.current_state = "normal"
-
-        # Animação de fala
+            self.speak_started = time.monotonic()
+        self._notify()
+
+    def _notify(self) -> None:
+        """Avisa o loop que o estado mudou fora do prazo previsto."""
+        if self.on_change is not None:
+            self.on_change()
+
+    def set_lipsync(self, timeline: LipSyncTimeline, clock: Callable[[], float]) -> None:
+        """Liga o lip-sync: abertura da boca pela linha do tempo do áudio.
+
+        clock retorna a posição de reprodução da resposta (segundos); a
+        consulta por quadro é um acesso direto ao array da linha do tempo.
+        """
+        self.lipsync = timeline
+        self.lipsync_clock = clock
+
+    def set_mouth(self, mouth_open: bool | None) -> None:
+        """Força a boca aberta/fechada (quadro de viseme); None volta ao automático."""
+        self.mouth_override = mouth_open
+        self._notify()
+
+    def set_sleeping(self, sleeping: bool) -> None:
+        """Dormindo: olhos fechados, sem piscar e lendo eventos devagar (perfil de energia)."""
+        self.is_sleeping = sleeping
+        if config.POWER_PROFILES_ENABLE:
+            profile = get_profile('sleeping' if sleeping else 'awake')
+            self.event_poll_interval = profile['avatar_poll_interval']
+        self._notify()
+
+    def blink(self) -> None:
+        """Pisca agora (fora do intervalo automático)."""
+        self.next_blink_at = time.monotonic()
+        self._notify()
+
+    def _mouth(self, now: float) -> tuple[bool, float]:
+        """Boca aberta agora e quando reavaliar (lip-sync ou ritmo fixo)."""
+        if self.mouth_override is not None:
+            return self.mouth_override, now + self.event_poll_interval
+        if self.lipsync is not None and self.lipsync_clock is not None and len(self.lipsync.frames):
+            level = self.lipsync.level_at(self.lipsync_clock())
+            return level >= config.LIPSYNC_OPEN_THRESHOLD * 255, now + 1.0 / self.lipsync.fps
+        # Senoide: a boca troca a cada meio período (passagem por zero)
+        step = _SPEAK_TICK / self.speak_animation_speed
+        phase = (now - self.speak_started) / step
+        crossing = self.speak_started + (math.floor(phase / math.pi) + 1) * math.pi * step
+        return math.sin(phase) > 0, crossing
+
+    def update_animation(self) -> float:
+        """Atualiza o estado (piscar e/ou falar); retorna a próxima mudança (monotonic)."""
+        now = time.monotonic()
+
         if self.is_speaking:
-            self.speak_animation_timer += self.speak_animation_speed
-            if math.sin(self.speak_animation_timer) > 0:
-                self.current_state = "boca"
+            mouth_open, next_change = self._mouth(now)
+            state = "boca" if mouth_open else "normal"
+        elif self.is_sleeping:
+            state, next_change = "olho", now + self.event_poll_interval
+        else:
+            # Piscar (quando não está falando)
+            if now >= self.next_blink_at:
+                self.blink_until = now + self.blink_duration
+                self.next_blink_at = now + self.blink_interval
+            if now < self.blink_until:
+                state, next_change = "olho", self.blink_until
             else:
-                self.current_state = "normal"
+                state, next_change = "normal", self.next_blink_at
+
+        self.current_state = state
+        self.next_update_at = next_change
+        return next_change
+
+    def seconds_until_update(self) -> float:
+        """Quanto o loop pode dormir antes da próxima mudança ou leitura de eventos."""
+        if not self.running:
+            return self.event_poll_interval
+        wait = self.next_update_at - time.monotonic()
+        return min(max(0.0, wait), self.event_poll_interval)
 
     # ------------------------------------------------------------------
     # Renderização
     # ------------------------------------------------------------------
 
     def render(self) -> None:
-        """Renderiza o avatar na tela."""
+        """Renderiza o avatar na tela (só se a imagem mudou)."""
         if not self.running or not self.screen:
             return
-        self.screen.fill((255, 255, 255))
-        if self.current_state in self.images:
-            self.screen.blit(self.images[self.current_state], (0, 0))
-        pygame.display.flip()
+        state = self.current_state
+        image = self.images.get(state)
+        if image is None or state == self._shown_state:
+            return
+        if self._shown_state is None:
+            self.screen.blit(image, (0, 0))
+            pygame.display.update()
+        else:
+            rect = self._dirty_rects[(self._shown_state, state)]
+            if rect.width and rect.height:
+                self.screen.blit(image, rect, rect)
+                pygame.display.update(rect)
+        self._shown_state = state
 
     def handle_events(self) -> None:
         """Processa eventos da janela."""
@@ -186,9 +309,15 @@ class AvatarManager:
                 self.running = False
             elif event.type == KEYDOWN and event.key == K_ESCAPE:
                 self.running = False
+            elif event.type in _REDRAW_EVENTS:
+                self._shown_state = None  # conteúdo da janela perdido
 
     def update_and_render(self) -> bool:
-        """Atualiza e renderiza o avatar. Deve ser chamado periodi­camente."""
+        """Atualiza e renderiza o avatar.
+
+        Deve ser chamado de novo em até seconds_until_update() segundos
+        (ou quando on_change for chamado); entre mudanças não desenha nada.
+        """
         if not config.AVATAR_ENABLE:
             return False
 
@@ -199,11 +328,7 @@ class AvatarManager:
                 width, height = self.pending_window_size
                 self.window = pygame.display.set_mode((width, height), pygame.RESIZABLE)
                 pygame.display.set_caption(self.pending_window_caption)
-                if self.load_images():
-                    for state in self.images:
-                        self.images[state] = pygame.transform.scale(
-                            self.images[state], (width, height)
-                        )
+                if self._prepare_images(width, height):
                     self.screen = pygame.display.get_surface()
                     print(Fore.GREEN + f"✅ Janela do avatar criada ({width}x{height})")
                 else:
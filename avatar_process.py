@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Avatar em processo separado, controlado por mensagens de estado.
+
+No modo 'process' (AVATAR_MODE) o processo da assistente não importa o
+pygame: a janela, o SDL e a renderização ficam num processo filho
+(python avatar_process.py). O áudio, o STT e os modelos não disputam o GIL
+com o avatar, e um atraso na renderização nunca atrasa a captura de áudio.
+
+A assistente manda só mudanças de estado, uma linha JSON por mensagem
+no stdin do filho:
+
+    {"speaking": true}      começou/parou de falar
+    {"mouth": true}         quadro de viseme (aberta/fechada, null = automático)
+    {"blink": true}         piscar agora
+    {"sleeping": true}      dormindo (olhos fechados, sem piscar)
+    {"stop": true}          encerrar
+
+Com lip-sync ligado, os quadros de viseme vêm da linha do tempo do áudio
+(LipSyncTimeline) e só são enviados quando a boca muda.
+
+Uso:
+    from avatar_process import create_avatar
+
+    avatar = create_avatar()   # AvatarProcess ou AvatarManager (AVATAR_MODE)
+    avatar.init_window()
+    avatar.set_speaking(True)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
+
+from colorama import Fore
+
+import config
+from log import logger
+
+if TYPE_CHECKING:
+    from lipsync import LipSyncTimeline
+
+
+class AvatarProcess:
+    """Lado da assistente: inicia o processo do avatar e envia os estados.
+
+    Tem a mesma interface usada pelo app que o AvatarManager (init_window,
+    start, set_speaking, update_and_render, stop...), sem importar o pygame.
+    """
+
+    def __init__(self) -> None:
+        self.process: Optional[subprocess.Popen] = None
+        self.running: bool = False
+        self.on_change: Optional[Callable[[], None]] = None  # a renderização é do filho
+        self.lipsync: Optional[LipSyncTimeline] = None
+        self.lipsync_clock: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+        self._mouth_stop = threading.Event()
+        self._mouth_thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Processo
+    # ------------------------------------------------------------------
+
+    def init_window(self) -> bool:
+        """Inicia o processo do avatar (que cria a janela). Retorna True se OK."""
+        if not config.AVATAR_ENABLE:
+            print(Fore.YELLOW + "⚠️  Avatar desabilitado, ignorando init_window()")
+            return False
+        if self.process is not None and self.process.poll() is None:
+            return True
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__)],
+                stdin=subprocess.PIPE,
+            )
+            self.running = True
+            print(Fore.GREEN + f"✅ Processo do avatar iniciado (pid {self.process.pid})")
+            return True
+        except OSError as e:
+            print(Fore.RED + f"❌ Erro ao iniciar o processo do avatar: {e}")
+            return False
+
+    def start(self) -> None:
+        """Inicia o avatar (a janela já está no processo filho)."""
+        if not config.AVATAR_ENABLE:
+            return
+        print(Fore.GREEN + f"✅ Avatar {config.ASSISTANT_NAME} inicializado (processo separado)")
+
+    def stop(self) -> None:
+        """Pede ao processo do avatar para encerrar (e força se não sair)."""
+        self._stop_mouth()
+        if self.process is None:
+            return
+        self._send(stop=True)
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+            self.process.wait(timeout=2.0)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+        self.process = None
+        self.running = False
+
+    def update_and_render(self) -> bool:
+        """Confere se o processo do avatar continua vivo (ex: janela fechada)."""
+        if self.running and (self.process is None or self.process.poll() is not None):
+            self.running = False
+            print(Fore.YELLOW + "⚠️  Janela do avatar fechada")
+        return self.running
+
+    def seconds_until_update(self) -> float:
+        """A renderização é do processo filho: o loop da assistente não precisa acordar."""
+        return float('inf')
+
+    def _send(self, **message) -> None:
+        """Envia uma mensagem de estado (descarta se o processo já saiu)."""
+        if not self.running or self.process is None or self.process.stdin is None:
+            return
+        line = (json.dumps(message) + '\n').encode('utf-8')
+        with self._lock:
+            try:
+                self.process.stdin.write(line)
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError):
+                self.running = False
+
+    # ------------------------------------------------------------------
+    # Estados
+    # ------------------------------------------------------------------
+
+    def set_speaking(self, speaking: bool) -> None:
+        """Define se o avatar está falando (e liga o envio dos visemes)."""
+        if not config.AVATAR_ENABLE:
+            return
+        self._send(speaking=speaking)
+        if speaking and self.lipsync is not None:
+            self._start_mouth()
+        elif not speaking:
+            self._stop_mouth()
+
+    def set_lipsync(self, timeline: LipSyncTimeline, clock: Callable[[], float]) -> None:
+        """Liga o lip-sync: a boca segue a linha do tempo do áudio."""
+        self.lipsync = timeline
+        self.lipsync_clock = clock
+
+    def set_sleeping(self, sleeping: bool) -> None:
+        self._send(sleeping=sleeping)
+
+    def blink(self) -> None:
+        self._send(blink=True)
+
+    def _start_mouth(self) -> None:
+        self._stop_mouth()
+        self._mouth_stop.clear()
+        self._mouth_thread = threading.Thread(target=self._mouth_loop, daemon=True)
+        self._mouth_thread.start()
+
+    def _stop_mouth(self) -> None:
+        self._mouth_stop.set()
+        if self._mouth_thread is not None:
+            self._mouth_thread.join(timeout=0.5)
+            self._mouth_thread = None
+
+    def _mouth_loop(self) -> None:
+        """Consulta a linha do tempo na taxa do lip-sync e envia só as mudanças."""
+        assert self.lipsync is not None and self.lipsync_clock is not None
+        threshold = config.LIPSYNC_OPEN_THRESHOLD * 255
+        sent: Optional[bool] = None
+        while not self._mouth_stop.wait(1.0 / self.lipsync.fps):
+            if len(self.lipsync.frames):
+                mouth_open: Optional[bool] = self.lipsync.level_at(self.lipsync_clock()) >= threshold
+            else:
+                mouth_open = None  # sem linha do tempo: animação automática
+            if mouth_open != sent:
+                self._send(mouth=mouth_open)
+                sent = mouth_open
+        if sent is not None:
+            self._send(mouth=None)
+
+
+def create_avatar():
+    """Cria o avatar conforme AVATAR_MODE ('process' ou 'inline').
+
+    Só o modo 'inline' importa o pygame no processo da assistente.
+    """
+    if config.AVATAR_MODE == 'process':
+        return AvatarProcess()
+    from avatar import AvatarManager
+    return AvatarManager()
+
+
+# ----------------------------------------------------------------------
+# Processo do avatar
+# ----------------------------------------------------------------------
+
+def _read_messages(inbox: queue.Queue) -> None:
+    """Lê o stdin (uma mensagem JSON por linha); fim do pipe = encerrar."""
+    for line in sys.stdin.buffer:
+        try:
+            inbox.put(json.loads(line))
+        except ValueError:
+            logger.warning(f"Mensagem inválida para o avatar: {line!r}")
+    inbox.put({'stop': True})
+
+
+def main() -> int:
+    """Roda a janela do avatar na thread principal deste processo."""
+    from avatar import AvatarManager
+
+    avatar = AvatarManager()
+    if not avatar.init_window():
+        return 1
+    avatar.start()
+
+    inbox: queue.Queue = queue.Queue()
+    threading.Thread(target=_read_messages, args=(inbox,), daemon=True).start()
+
+    while avatar.running:
+        # Dorme até a próxima mudança prevista ou a próxima mensagem
+        try:
+            message = inbox.get(timeout=avatar.seconds_until_update())
+        except queue.Empty:
+            message = None
+        while message is not None:
+            if message.get('stop'):
+                avatar.running = False
+                break
+            if 'speaking' in message:
+                avatar.set_speaking(bool(message['speaking']))
+            if 'mouth' in message:
+                mouth = message['mouth']
+                avatar.set_mouth(None if mouth is None else bool(mouth))
+            if 'sleeping' in message:
+                avatar.set_sleeping(bool(message['sleeping']))
+            if message.get('blink'):
+                avatar.blink()
+            try:
+                message = inbox.get_nowait()
+            except queue.Empty:
+                message = None
+        if avatar.running:
+            avatar.update_and_render()
+
+    avatar.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
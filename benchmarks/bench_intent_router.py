@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark do roteamento de intenção — três detectores × IntentRouter.
+
+    antes    CommandExecutor.parse + detect_system_query + needs_search
+             (cada um varre as próprias palavras-chave, sempre), com o
+             commands.py de --baseline (padrão: o anterior ao roteador)
+    depois   IntentRouter.route: uma passada, que já devolve o comando
+             resolvido (route.command)
+
+Mostra o tempo por frase (p50/p95, em µs) e as frases em que a decisão
+mudou (comando / consulta de sistema / pesquisa / nada).
+
+Uso (na raiz do projeto):
+    python benchmarks/bench_intent_router.py
+    python benchmarks/bench_intent_router.py --repeats 2000
+    python benchmarks/bench_intent_router.py --baseline HEAD   # parse atual
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Último commit antes do IntentRouter
+BASELINE = 'd2b0541'
+
+SENTENCES = [
+    "bom dia chica, tudo bem com você?",
+    "me conta uma piada",
+    "abra o navegador",
+    "calendário",
+    "calendário dos jogos do brasil",
+    "qual o melhor navegador para linux?",
+    "abre o terminal e pesquisa python",
+    "quanto espaço livre tem no disco?",
+    "qual o uso de memória agora?",
+    "qual a temperatura do processador?",
+    "qual a temperatura em porto alegre hoje?",
+    "vai chover amanhã?",
+    "quais programas estão rodando?",
+    "qual meu ip?",
+    "minha equipe ganhou o campeonato ontem",
+    "a parede do quarto está com mofo",
+    "pesquise na internet sobre a memória dos golfinhos",
+    "quem foi santos dumont?",
+    "quanto tempo o pc está ligado?",
+    "toca uma música relaxante no spotify",
+    "o que você acha de inteligência artificial?",
+    "lembra qual é o meu time?",
+]
+
+
+def _old(executor, text: str):
+    from system_info import detect_system_query
+    from web_search import needs_search
+
+    cmd = executor.parse(text)
+    query = detect_system_query(text)
+    return cmd, query, not query and needs_search(text)
+
+
+def _new(router, text: str):
+    route = router.route(text)
+    cmd = route.command
+    best = route.best_of('system', 'search')
+    query = best.target if best is not None and best.kind == 'system' else None
+    return cmd, query, best is not None and best.kind == 'search'
+
+
+def _decision(result) -> str:
+    cmd, query, search = result
+    if cmd:
+        return f"comando: {cmd['chave']}"
+    if query:
+        return f"sistema: {query.name}"
+    return 'pesquisa' if search else '-'
+
+
+def _time(fn, repeats: int) -> np.ndarray:
+    """Tempo (µs) de cada frase, mediana das repetições."""
+    per_sentence = []
+    for text in SENTENCES:
+        samples = np.empty(repeats)
+        for i in range(repeats):
+            start = time.perf_counter()
+            fn(text)
+            samples[i] = time.perf_counter() - start
+        per_sentence.append(np.median(samples) * 1e6)
+    return np.asarray(per_sentence)
+
+
+def _load_baseline(rev: str):
+    """O módulo commands.py como estava em rev (git show), importado à parte."""
+    source = subprocess.run(
+        ['git', 'show', f'{rev}:commands.py'], cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as f:
+        f.write(source)
+    try:
+        spec = importlib.util.spec_from_file_location('commands_baseline', f.name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.unlink(f.name)
+    return module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Roteamento de intenção: três detectores × IntentRouter")
+    parser.add_argument('--repeats', type=int, default=500)
+    parser.add_argument('--baseline', default=BASELINE,
+                        help=f"commit do commands.py do 'antes' (padrão: {BASELINE})")
+    args = parser.parse_args()
+
+    from log import logger
+    logger.setLevel(logging.WARNING)  # os detectores registram cada acerto
+
+    from intent_router import IntentRouter
+
+    executor = _load_baseline(args.baseline).CommandExecutor()
+    start = time.perf_counter()
+    router = IntentRouter()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    old = _time(lambda t: _old(executor, t), args.repeats)
+    new = _time(lambda t: _new(router, t), args.repeats)
+
+    print(f"\nIntentRouter: {len(router._triggers)} gatilhos, compilado em {build_ms:.1f} ms")
+    print(f"antes: commands.py de {args.baseline}")
+    print(f"\n{'':<12}{'p50 (µs)':>10}{'p95 (µs)':>10}")
+    for label, times in (('antes', old), ('depois', new)):
+        print(f"{label:<12}{np.percentile(times, 50):>10.1f}{np.percentile(times, 95):>10.1f}")
+    print(f"{'ganho':<12}{np.percentile(old, 50) / np.percentile(new, 50):>9.2f}x")
+
+    changed = [
+        (text, _decision(_old(executor, text)), _decision(_new(router, text)))
+        for text in SENTENCES
+    ]
+    changed = [row for row in changed if row[1] != row[2]]
+    print(f"\nDecisões diferentes: {len(changed)} de {len(SENTENCES)}")
+    for text, before, after in changed:
+        print(f"  {text:<52} {before:<24} → {after}")
+
+
+if __name__ == '__main__':
+    main()
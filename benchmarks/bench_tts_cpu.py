@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark do TTS na CPU — fator de tempo real (RTF) antes/depois das otimizações.
+
+Cada variante roda num processo novo (RSS e cache de compilação isolados):
+    base          float32, sem compilar
+    int8          quantização dinâmica int8 (Linear/LSTM)
+    int8+compile  int8 + inductor (1ª execução compila, 2ª usa o cache em disco)
+
+RTF = tempo de síntese / duração do áudio (menor é melhor; < 1 = tempo real).
+
+Os RTFs são gravados em TTS_CPU_BENCH_FILE (por backend e threads): com
+TTS_QUANTIZE_INT8 = 'auto' o app liga o int8 só se o ganho medido aqui
+chegar a TTS_QUANTIZE_MIN_GAIN.
+
+Uso (na raiz do projeto):
+    python benchmarks/bench_tts_cpu.py
+    python benchmarks/bench_tts_cpu.py --backend qwen3 --threads 2 4
+    python benchmarks/bench_tts_cpu.py --no-save   # só mostra a tabela
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SENTENCES = [
+    "Olá! Eu sou a Chica, sua assistente.",
+    "O disco tem 3.5 GB livres de um total de 64 GB.",
+    "Hoje o dia está ensolarado, com máxima de 28 graus e mínima de 17 graus.",
+    "Claro, vou pesquisar isso para você agora mesmo.",
+    "Segundo as notícias de hoje, a previsão é de chuva forte no fim da tarde.",
+]
+
+VARIANTS = {
+    'base': {'TTS_QUANTIZE_INT8': False, 'compile': False},
+    'int8': {'TTS_QUANTIZE_INT8': True, 'compile': False},
+    'int8+compile': {'TTS_QUANTIZE_INT8': True, 'compile': True},
+}
+
+
+def _run_variant(backend_name: str, variant: str, threads: int, repeats: int) -> dict[str, float]:
+    import config
+    from tts_backends import create_backend
+
+    settings = VARIANTS[variant]
+    config.TTS_QUANTIZE_INT8 = settings['TTS_QUANTIZE_INT8']
+    config.KOKORO_USE_COMPILE = settings['compile']
+    config.QWEN3_USE_COMPILE = settings['compile']
+    config.TTS_TORCH_THREADS = threads
+    config.TTS_BATCH_WORKERS = 0               # sem pool: mede um processo só
+    config.KOKORO_G2P_CACHE_ENABLE = False     # G2P entra na conta em todas as variantes
+    config.QWEN3_STREAMING = False
+
+    backend = create_backend(backend_name)
+    backend.load()
+    backend.synthesize(SENTENCES[0])  # aquecimento
+
+    synth_seconds = 0.0
+    audio_seconds = 0.0
+    for _ in range(repeats):
+        for sentence in SENTENCES:
+            start = time.perf_counter()
+            audio = backend.synthesize(sentence)
+            synth_seconds += time.perf_counter() - start
+            if audio is not None:
+                audio_seconds += len(audio) / backend.sample_rate
+    backend.close()
+    return {
+        'load_seconds': backend.load_seconds,
+        'load_rss_mb': backend.load_rss_mb,
+        'rtf': synth_seconds / audio_seconds if audio_seconds else float('nan'),
+    }
+
+
+def _save(backend: str, rows: list[tuple[str, int, dict[str, float]]]) -> str:
+    """Acrescenta os RTFs medidos a TTS_CPU_BENCH_FILE ({backend: {threads: {variante: rtf}}})."""
+    import config
+
+    path = os.path.expanduser(config.TTS_CPU_BENCH_FILE)
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    for label, threads, result in rows:
+        data.setdefault(backend, {}).setdefault(str(threads), {})[label] = round(result['rtf'], 4)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RTF do TTS na CPU por variante de otimização")
+    parser.add_argument('--backend', default='kokoro', choices=['kokoro', 'qwen3'])
+    parser.add_argument('--variants', nargs='+', default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument('--threads', nargs='+', type=int, default=[0], help="0 = padrão do torch")
+    parser.add_argument('--repeats', type=int, default=2)
+    parser.add_argument('--no-save', action='store_true', help="não grava em TTS_CPU_BENCH_FILE")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context('spawn')
+    rows: list[tuple[str, int, dict[str, float]]] = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for threads in args.threads:
+            for variant in args.variants:
+                # Variante compilada roda duas vezes: fria (compila) e quente (cache)
+                runs = 2 if VARIANTS[variant]['compile'] else 1
+                for run in range(runs):
+                    label = f"{variant} ({'quente' if run else 'fria'})" if runs > 1 else variant
+                    result = pool.apply(_run_variant, (args.backend, variant, threads, args.repeats))
+                    rows.append((label, threads, result))
+
+    # Ganho contra a variante base com o mesmo número de threads
+    base = {threads: r['rtf'] for label, threads, r in rows if label == 'base'}
+    print(f"\n{'variante':<24}{'threads':>8}{'carga (s)':>11}{'RSS (MB)':>10}{'RTF':>8}{'ganho':>8}")
+    for label, threads, r in rows:
+        gain = f"{base[threads] / r['rtf']:.2f}x" if threads in base else '-'
+        print(f"{label:<24}{threads or 'auto':>8}{r['load_seconds']:>11.1f}"
+              f"{r['load_rss_mb']:>10.0f}{r['rtf']:>8.3f}{gain:>8}")
+    if not args.no_save:
+        print(f"\nRTFs gravados em {_save(args.backend, rows)}")
+
+
+if __name__ == '__main__':
+    main()
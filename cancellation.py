@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cancelamento cooperativo — um token por turno, repassado a cada etapa.
+
+Quando o usuário interrompe a assistente (barge-in), parar o áudio não
+basta: a resposta do LLM, a síntese das próximas frases, a pesquisa na
+web e a extração de memória continuariam rodando e disputando CPU (e o
+slot do servidor LLM) com o próximo turno. Cada turno carrega um
+CancelToken; quem faz trabalho demorado confere o token entre passos
+curtos (um token do LLM, uma frase do TTS, um bloco da resposta HTTP) e
+pode registrar um callback para fechar a conexão na hora.
+
+Uso:
+    from cancellation import CancelToken, Cancelled
+
+    token = CancelToken()
+    token.on_cancel(response.close)     # fecha o stream HTTP ao cancelar
+    for chunk in stream:
+        token.raise_if_cancelled()      # levanta Cancelled
+    token.cancel()                      # de qualquer thread
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from log import logger
+
+
+class Cancelled(Exception):
+    """Trabalho abandonado porque o token foi cancelado."""
+    pass
+
+
+class CancelToken:
+    """Sinal de cancelamento compartilhado entre threads (irreversível)."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._callbacks: list[Callable[[], object]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Cancela e chama os callbacks registrados (uma única vez)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Erro em callback de cancelamento: {e}")
+
+    def on_cancel(self, callback: Callable[[], object]) -> Callable[[], None]:
+        """Registra callback para o cancelamento; retorna a função que o remove.
+
+        Se o token já estiver cancelado, callback roda na hora.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._discard(callback)
+        callback()
+        return lambda: None
+
+    def _discard(self, callback: Callable[[], object]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """Dorme até timeout ou até o cancelamento (True se cancelado)."""
+        return self._event.wait(timeout)
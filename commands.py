@@ -20,6 +20,7 @@ import re
 import shlex
 import subprocess
 import sys
+import unicodedata
 from typing import Optional
 
 from log import logger
@@ -78,6 +79,98 @@ _COMMANDS: dict[str, dict[str, str]] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Velocidade da fala ("fale mais rápido") — atendidos na reprodução
+# ---------------------------------------------------------------------------
+
+_SPEED_PATTERNS: list[tuple[str, re.Pattern]] = [
+    ("normal", re.compile(r"\b(velocidade normal|fal[ae]\w* normal|volt[ae] ao normal)\b")),
+    ("faster", re.compile(r"\b(mais r[aá]pid[oa]|acelera\w*|mais depressa)\b")),
+    ("slower", re.compile(r"\b(mais devagar|mais lent[oa]|devagar)\b")),
+]
+
+
+# ---------------------------------------------------------------------------
+# Heurísticas de CommandExecutor.parse (compiladas uma vez)
+# ---------------------------------------------------------------------------
+# Rodam sobre o texto normalizado (normalize_text): "calendario" e
+# "calendário" decidem igual aqui, no IntentRouter e no classificador.
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas, sem acentos, só letras/dígitos separados por um espaço."""
+    text = unicodedata.normalize('NFKD', text.lower()).encode('ascii', 'ignore').decode('ascii')
+    return _NON_WORD.sub(' ', text).strip()
+
+
+OPEN_VERBS: tuple[str, ...] = (
+    'abra', 'abre', 'abrir', 'open', 'execute', 'executar', 'inicia', 'iniciar', 'lance', 'lançar',
+)
+
+_KEY_ORDER: dict[str, int] = {key: i for i, key in enumerate(_COMMANDS)}
+
+# Chave inteira no texto (ex: "vim" não casa com "vimos")
+_KEY_PATTERNS: dict[str, re.Pattern] = {
+    key: re.compile(r'\b' + re.escape(normalize_text(key)) + r'\b') for key in _COMMANDS
+}
+
+# Palavra-chave seguida de "de/do/da/dos/das" (ex: "calendário dos jogos")
+_KEY_OF_PATTERNS: dict[str, re.Pattern] = {
+    key: re.compile(r'\b' + re.escape(normalize_text(key)) + r'\s+(d[eoas]s?)\b') for key in _COMMANDS
+}
+
+# Verbo de abertura seguido do alvo: "abra/abre/abrir/open [algo]"
+_OPEN_VERB = re.compile(r'\b(?:' + '|'.join(normalize_text(v) for v in OPEN_VERBS) + r')\s+(?=\w)')
+
+_ARTICLE = re.compile(r'^[oa]\s+')
+
+_INTERROGATIVE = re.compile(r'\b(que|qual|quais|como|quando|onde|porque|por\s*que|quem)\b')
+
+_QUESTION_PATTERNS: list[re.Pattern] = [
+    _INTERROGATIVE,
+    re.compile(r'\b(pode|poderia)\s+me\s+(dizer|mostrar|falar|informar)\b'),
+    re.compile(r'\b(quero\s+saber|gostaria\s+de\s+saber|me\s+diga)\b'),
+    # "você pode X" + "?" → pedido/pergunta
+    re.compile(r'\b(voce|vc)\s+(pode|poderia)\s+\w+\s*$'),
+    # "com usar/fazer/encontrar..." → pedido de instrução
+    re.compile(r'\b(como|onde)\s+(usar|fazer|encontrar|instalar|configurar)\b'),
+]
+
+_SEARCH_VERBS: list[re.Pattern] = [
+    re.compile(r'\b(pesquis[aeiou]|pesquisa[rz]?)\w*\b'),
+    re.compile(r'\b(procur[aeiou]|procura[rz])\w*\b'),
+    re.compile(r'\b(busc[aeiou]|busca[rz])\w*\b'),
+]
+
+_ACTION_VERB = re.compile(r'\b(' + '|'.join(normalize_text(v) for v in OPEN_VERBS) + r')\b')
+
+_CONTEXT_VERBS: list[re.Pattern] = [
+    re.compile(r'\b(mostr[aeio]|mostre|exib[ei])\b'),
+    re.compile(r'\b([lt]er|olhar|conferir)\b'),
+]
+
+_RESEARCH_INDICATORS: list[re.Pattern] = [
+    re.compile(r'\b(pesquis[aeiou]|pesquisar?)\w*\b'),
+    re.compile(r'\b(sobre|a\s*respeito\s*de|acerca\s*de)\b'),
+    re.compile(r'\b(procura[rz]|busca[rz])\w*\b'),
+]
+
+
+def detect_speed_command(text: str) -> Optional[str]:
+    """Pedido de mudança na velocidade da fala: 'faster', 'slower', 'normal' ou None."""
+    text = text.lower()
+    # "mais devagar" sozinho vale; numa frase longa, só se falar da fala
+    # ("vai devagar com o andor" não é comando)
+    if len(text.split()) > 3 and not re.search(r"\b(fal[ae]\w*|velocidade|acelera\w*)\b", text):
+        return None
+    for direction, pattern in _SPEED_PATTERNS:
+        if pattern.search(text):
+            return direction
+    return None
+
+
 class CommandExecutor:
     """Analisa e executa comandos do sistema com confirmação."""
 
@@ -106,155 +199,134 @@ class CommandExecutor:
             executar: string do comando do SO (ex: 'open -a Safari')
             confirmacao: texto para pedir confirmação (ex: 'Confirma a abertura do navegador?')
         Ou None se não reconheceu nenhum comando.
-        """
-        text_lower = text.lower().strip()
 
-        # Padrões de abertura: "abra/abre/abrir/open [algo]"
-        open_patterns = [
-            r"(?:abra|abre|abrir|open|execute|executar|inicia|iniciar|lance|lançar)\s+(?:o\s+|a\s+|)([\w\s]+)",
-            r"(?:quero\s+)?(?:abrir|abre|abrir|executar|iniciar|lancar)\s+(?:o\s+|a\s+|)([\w\s]+)",
-        ]
-
-        target = None
-        for pattern in open_patterns:
-            m = re.search(pattern, text_lower)
+        Procura os apps e o verbo de abertura no texto; o IntentRouter já
+        os acha na passada dele e chama resolve() direto.
+        """
+        plain = normalize_text(text)
+        keys = []
+        for key, pattern in _KEY_PATTERNS.items():
+            m = pattern.search(plain)
             if m:
-                target = m.group(1).strip()
-                break
-
-        # Se não achou com padrão de abertura, tenta match direto,
-        # mas com heurísticas para evitar falsos positivos
-        # (ex: "calendário dos jogos" não deve abrir o Calendar)
-        match_type = "explicit"  # veio dos open_patterns
-        if not target:
-            match_type = "implicit"  # veio do fallback
-            for key in _COMMANDS:
-                if key in text_lower:
-                    # Heurística: palavra-chave seguida de preposição "de/do/da/dos/das"
-                    # indica "algo DE algo" (ex: "calendário dos jogos") → pergunta, não comando
-                    key_pattern = re.compile(
-                        re.escape(key) + r'\s+(d[eoas]s?)\b',
-                        re.IGNORECASE
-                    )
-                    if key_pattern.search(text_lower):
-                        continue  # provável pedido de informação, não comando
-
-                    # Heurística: frase contém palavras interrogativas → é pergunta
-                    question_words = [
-                        r'\b(que|qual|quais|como|quando|onde|porque|por\s*que|quem)\b',
-                        r'\b(pode|poderia)\s+me\s+(dizer|mostrar|falar|informar)\b',
-                        r'\b(quero\s+saber|gostaria\s+de\s+saber|me\s+diga)\b',
-                        # "você pode X" + "?" → pedido/pergunta
-                        r'\b(você|vc)\s+(pode|poderia)\s+\w+\s*$',
-                        # "com usar/fazer/encontrar..." → pedido de instrução
-                        r'\b(como|onde)\s+(usar|fazer|encontrar|instalar|configurar)\b',
-                    ]
-                    is_question = any(
-                        re.search(qw, text_lower) for qw in question_words
-                    )
-
-                    # Heurística: ponto de interrogação no final → é pergunta
-                    if not is_question and text_lower.rstrip().endswith('?'):
-                        is_question = True
-
-                    # Heurística: frase contém verbos de pesquisa/pedido de informação
-                    search_verbs = [
-                        r'\b(pesquis[aeiou]|pesquisa[rz]?)\w*\b',
-                        r'\b(procur[aeiou]|procura[rz])\w*\b',
-                        r'\b(busc[aeiou]|busca[rz])\w*\b',
-                    ]
-                    has_search_verb = any(
-                        re.search(sv, text_lower) for sv in search_verbs
-                    )
-
-                    # Heurística: frase longa (> 5 palavras) SEM verbo de ação
-                    # indica conversa genérica, não comando
-                    word_count = len(text_lower.split())
-                    has_action_verb = any(
-                        re.search(r'\b' + v + r'\b', text_lower)
-                        for v in ['abra', 'abre', 'abrir', 'open', 'execute',
-                                  'executar', 'inicia', 'iniciar', 'lance', 'lançar']
-                    )
-                    is_long_phrase = word_count > 5 and not has_action_verb
-
-                    # Heurística: verbo "mostrar/mostre/mostra" ou "ler/ver/olhar"
-                    # antes ou depois da keyword → pedido de informação
-                    context_verbs = [
-                        r'\b(mostr[aeio]|mostre|exib[ei])\b',
-                        r'\b([lt]er|olhar|conferir)\b',
-                    ]
-                    has_context_verb = any(
-                        re.search(cv, text_lower) for cv in context_verbs
-                    )
-
-                    # Só aceita o match se NÃO parecer pergunta/informação
-                    if not is_question and not has_search_verb and not is_long_phrase \
-                            and not has_context_verb:
-                        target = key
-                        break
-
-        if not target:
-            return None
+                keys.append((key, m.start()))
+        verb = _OPEN_VERB.search(plain)
+        return self.resolve(text, plain, keys, verb.end() if verb else None)
+
+    def resolve(
+        self,
+        text: str,
+        plain: str,
+        keys: list[tuple[str, int]],
+        verb_end: Optional[int] = None,
+    ) -> Optional[dict]:
+        """Decide o comando a partir dos gatilhos já encontrados.
+
+        Args:
+            text: Texto original do usuário.
+            plain: O mesmo texto por normalize_text.
+            keys: (chave de _COMMANDS, posição em plain) de cada app citado.
+            verb_end: Posição em plain logo depois do verbo de abertura
+                seguido de um alvo ("abra o ..."), ou None.
+        """
+        keys = sorted(keys, key=lambda k: _KEY_ORDER[k[0]])
+        target = None
+        match_type = "explicit"  # verbo de abertura + app depois dele
+
+        if verb_end is not None:
+            target = next((key for key, pos in keys if pos >= verb_end), None)
+            if target is None:
+                # Nome abreviado depois do verbo ("abre o vs" → vscode)
+                rest = _ARTICLE.sub('', plain[verb_end:])
+                target = next((key for key in _COMMANDS if rest and rest in normalize_text(key)), None)
+            if target is None:
+                return None
 
-        # Heurística extra para matches EXPLÍCITOS (open_patterns):
-        # Se a palavra capturada está ao lado de "pesquisa/pesquise/sobre",
-        # ou a frase contém palavras interrogativas, provavelmente não é
-        # um comando puro de abrir app.
-        # Ex: "abra uma pesquisa no navegador sobre python" → não deve abrir navegador
-        # Ex: "como abrir o terminal?" → é pergunta, não comando
-        if match_type == "explicit":
-            # Verificar se há palavras interrogativas na frase
-            explicit_question = re.search(
-                r'\b(que|qual|quais|como|quando|onde|porque|por\s*que|quem)\b',
-                text_lower
-            )
-            if explicit_question:
-                logger.info(f'🧠 Match explícito ignorado (contém pergunta): {text_lower[:60]}')
+            # Heurística extra para matches EXPLÍCITOS:
+            # Se a palavra capturada está ao lado de "pesquisa/pesquise/sobre",
+            # ou a frase contém palavras interrogativas, provavelmente não é
+            # um comando puro de abrir app.
+            # Ex: "abra uma pesquisa no navegador sobre python" → não deve abrir navegador
+            # Ex: "como abrir o terminal?" → é pergunta, não comando
+            if _INTERROGATIVE.search(plain):
+                logger.info(f'🧠 Match explícito ignorado (contém pergunta): {plain[:60]}')
                 return None
 
             # Verificar se há indicadores de pesquisa perto do target
-            research_indicators = [
-                r'\b(pesquis[aeiou]|pesquisar?)\w*\b',
-                r'\b(sobre|a\s*respeito\s*de|acerca\s*de)\b',
-                r'\b(procura[rz]|busca[rz])\w*\b',
-            ]
-            has_research = any(
-                re.search(ri, text_lower) for ri in research_indicators
-            )
-            if has_research:
-                # Verificar se a palavra de pesquisa está perto do target
-                target_idx = text_lower.find(target)
-                target_end = target_idx + len(target)
-                nearby = text_lower[max(0, target_idx-30):target_end+30]
-                if any(re.search(ri, nearby) for ri in research_indicators):
-                    logger.info(f'🧠 Match explícito ignorado (contém pesquisa): {text_lower[:60]}')
+            if any(ri.search(plain) for ri in _RESEARCH_INDICATORS):
+                target_idx = dict(keys).get(target, verb_end)
+                target_end = target_idx + len(normalize_text(target))
+                nearby = plain[max(0, target_idx - 30):target_end + 30]
+                if any(ri.search(nearby) for ri in _RESEARCH_INDICATORS):
+                    logger.info(f'🧠 Match explícito ignorado (contém pesquisa): {plain[:60]}')
                     return None
+        else:
+            # Sem verbo de abertura: match direto, mas com heurísticas para
+            # evitar falsos positivos (ex: "calendário dos jogos" não deve abrir o Calendar)
+            match_type = "implicit"
+            if not keys:
+                return None
 
-        # Encontrar qual comando mapeia
-        matched_key = None
-        for key in _COMMANDS:
-            if key in target or target in key:
-                matched_key = key
-                break
+            # Heurística: frase contém palavras interrogativas (ou termina
+            # com "?") → é pergunta
+            is_question = any(qw.search(plain) for qw in _QUESTION_PATTERNS)
+            if not is_question and text.rstrip().endswith('?'):
+                is_question = True
 
-        if not matched_key:
-            return None
+            # Heurística: frase contém verbos de pesquisa/pedido de informação
+            has_search_verb = any(sv.search(plain) for sv in _SEARCH_VERBS)
+
+            # Heurística: frase longa (> 5 palavras) SEM verbo de ação
+            # indica conversa genérica, não comando
+            has_action_verb = _ACTION_VERB.search(plain) is not None
+            is_long_phrase = len(plain.split()) > 5 and not has_action_verb
+
+            # Heurística: verbo "mostrar/mostre/mostra" ou "ler/ver/olhar"
+            # antes ou depois da keyword → pedido de informação
+            has_context_verb = any(cv.search(plain) for cv in _CONTEXT_VERBS)
 
-        cmd_info = _COMMANDS[matched_key]
+            # Só aceita o match se NÃO parecer pergunta/informação
+            if is_question or has_search_verb or is_long_phrase or has_context_verb:
+                return None
+
+            for key, _ in keys:
+                # Heurística: palavra-chave seguida de preposição "de/do/da/dos/das"
+                # indica "algo DE algo" (ex: "calendário dos jogos") → pergunta, não comando
+                if not _KEY_OF_PATTERNS[key].search(plain):
+                    target = key
+                    break
+            if target is None:
+                return None
+
+        cmd_info = _COMMANDS[target]
         cmd_str = cmd_info.get(self.os_key, "")
 
         if not cmd_str:
-            logger.warning(f"Comando '{matched_key}' não suportado em {self.system}")
+            logger.warning(f"Comando '{target}' não suportado em {self.system}")
             return None
 
         return {
-            "chave": matched_key,
-            "comando": f"abrir {matched_key}",
+            "chave": target,
+            "comando": f"abrir {target}",
             "executar": cmd_str,
-            "confirmacao": f"Confirma a abertura do {matched_key}?",
+            "confirmacao": self._confirmation_text(target),
             "match_type": match_type,  # "explicit" ou "implicit"
         }
 
+    def confirmation_phrases(self) -> list[str]:
+        """Frases de confirmação de todos os comandos suportados neste SO.
+
+        Usadas para pré-sintetizar o áudio das confirmações na inicialização.
+        """
+        return [
+            self._confirmation_text(key)
+            for key, cmd_info in _COMMANDS.items()
+            if cmd_info.get(self.os_key, "")
+        ]
+
+    @staticmethod
+    def _confirmation_text(key: str) -> str:
+        return f"Confirma a abertura do {key}?"
+
     # ------------------------------------------------------------------
     # Execução
     # ------------------------------------------------------------------
@@ -17,6 +17,10 @@ ASSISTANT_GREETING = f" Eu sou a {ASSISTANT_NAME}, sua assistente. Como posso aj
 # Abre janela do avatar
 AVATAR_ENABLE = True  #True a janela do Avatar é abilitada, False a janela do Avatar é desabilitada
 
+# Onde o avatar roda: 'process' (processo separado, dono do SDL; recebe só
+# mensagens de estado) ou 'inline' (pygame no processo da assistente)
+AVATAR_MODE = 'process'
+
 # ============================================================================
 # CONFIGURAÇÕES DO AVATAR
 # ============================================================================
@@ -36,9 +40,20 @@ AVATAR_BLINK_INTERVAL = 3.0
 # Duração da piscada (segundos)
 AVATAR_BLINK_DURATION = 0.2
 
-# Velocidade da animação de fala
+# Velocidade da animação de fala (usada quando o lip-sync está desligado)
 AVATAR_SPEAK_ANIMATION_SPEED = 0.1
 
+# Espera máxima sem ler os eventos da janela (fechar/ESC), em segundos.
+# O avatar só redesenha quando a imagem muda; entre mudanças o loop dorme.
+AVATAR_EVENT_POLL_INTERVAL = 0.1
+
+# Lip-sync: a boca segue o volume do áudio do TTS (envelope RMS por quadro)
+LIPSYNC_ENABLE = True
+LIPSYNC_FPS = 30                     # Quadros de boca por segundo
+LIPSYNC_FLOOR_DB = -45.0             # Volume (dBFS) com a boca fechada
+LIPSYNC_PEAK_DB = -15.0              # Volume (dBFS) com a boca toda aberta
+LIPSYNC_OPEN_THRESHOLD = 0.3         # Abertura (0 a 1) a partir da qual mostra a boca aberta
+
 # Pasta das imagens do avatar
 AVATAR_IMAGE_DIR = "chica_img"
 
@@ -120,6 +135,23 @@ STOP_PHRASES = [
     "stop",
 ]
 
+# 5. REPRODUÇÃO (SAÍDA DE ÁUDIO)
+# Um único stream de saída fica aberto; a fala é enfileirada e tocada pelo
+# callback (frases emendadas sem lacuna, interrupção no próximo bloco)
+AUDIO_OUTPUT_BLOCKSIZE = 512         # Amostras por bloco (~21 ms a 24 kHz)
+AUDIO_OUTPUT_LATENCY = 'low'         # Latência pedida ao PortAudio ('low', 'high' ou segundos)
+
+# 6. VELOCIDADE DA FALA NA REPRODUÇÃO
+# A velocidade é aplicada ao tocar (WSOLA, mantém o tom): o áudio em cache e
+# as frases pré-sintetizadas servem para qualquer velocidade, e "fale mais
+# rápido/devagar" vale na hora, até no meio de uma resposta
+PLAYBACK_SPEED = 1.0                 # Velocidade inicial (multiplica TTS_SPEED/EDGE_TTS_SPEED)
+PLAYBACK_SPEED_STEP = 0.15           # Incremento por comando de voz
+PLAYBACK_SPEED_MIN = 0.7
+PLAYBACK_SPEED_MAX = 1.6
+TIME_STRETCH_FRAME_MS = 25           # Quadro do WSOLA (ms)
+TIME_STRETCH_TOLERANCE_MS = 10       # Busca do melhor encaixe (± ms)
+
 # ============================================================================
 # CONFIGURAÇÕES DE VOZ TTS
 # ============================================================================
@@ -142,19 +174,41 @@ TTS_KOKORO_MODEL = 'hexgrad/Kokoro-82M'
 # 'j' = japonês, 'k' = coreano, 'z' = chinês, 'f' = francês, 'e' = espanhol
 TTS_KOKORO_LANG = 'p'
 
+# Cache de fonemas (G2P) do Kokoro — frases e trechos já fonemizados não
+# passam de novo pelo espeak-ng (só idiomas via espeak, ex: português)
+KOKORO_G2P_CACHE_ENABLE = True
+KOKORO_G2P_CACHE_DIR = '~/.cache/chica'  # Pasta do JSON ('' = só em memória)
+KOKORO_G2P_CACHE_MAX_ENTRIES = 20000     # Limite de entradas (LRU)
+KOKORO_G2P_CACHE_SAVE_EVERY = 50         # Grava no disco a cada N entradas novas
+
 # ============================================================================
 # CONFIGURAÇÕES DO SISTEMA TTS (KOKORO vs QWEN3)
 # ============================================================================
 
 # Sistema TTS a ser usado
-# Opções: 'kokoro' (padrão) ou 'qwen3'
+# Opções: 'kokoro' (padrão), 'kokoro_onnx' (int8, sem torch — SBCs) ou 'qwen3'
 TTS_SYSTEM = 'kokoro'
 
+# Kokoro via ONNX Runtime (TTS_SYSTEM = 'kokoro_onnx')
+# Modelo int8 + vozes em .npy mapeado em memória: ~metade da RAM do Kokoro
+# em torch e sem o custo de importar o torch. Gere os arquivos uma vez com:
+#   python kokoro_onnx.py build --voices pf_dora
+KOKORO_ONNX_DIR = '~/.cache/chica/kokoro_onnx'  # Modelo, vozes e vocabulário
+KOKORO_ONNX_MODEL = 'kokoro_int8.onnx'          # Grafo usado em execução
+KOKORO_ONNX_THREADS = 0                         # Threads do ONNX Runtime (0 = todos os núcleos)
+
 # Configurações específicas do Qwen3-TTS
 QWEN3_MODEL = 'Qwen/Qwen3-TTS-12Hz-0.6B-CustomVoice'  # Modelo Qwen3-TTS
 QWEN3_VOICE = 'serena'  # Voz para português (serena)
 QWEN3_LANGUAGE = 'portuguese'  # Idioma para síntese (em inglês: 'portuguese')
-QWEN3_USE_COMPILE = False  # torch.compile piora desempenho no MPS (testes mostraram 10x mais lento)
+QWEN3_USE_COMPILE = False  # Compila o talker (inductor); no MPS piorou (testes mostraram 10x mais lento)
+
+# Streaming do Qwen3-TTS: o áudio começa a tocar enquanto a frase ainda é
+# gerada (o codec tem ~12 quadros por segundo de áudio)
+QWEN3_STREAMING = True
+QWEN3_STREAM_FIRST_FRAMES = 4     # Quadros do primeiro pedaço (menor = começa antes)
+QWEN3_STREAM_CHUNK_FRAMES = 12    # Quadros dos pedaços seguintes
+QWEN3_STREAM_LEFT_CONTEXT = 25    # Quadros de contexto reprocessados na decodificação
 
 # ============================================================================
 # CONFIGURAÇÕES DO EDGE-TTS (ONLINE — REQUER INTERNET)
@@ -181,6 +235,106 @@ EDGE_TTS_VOICE = 'pt-BR-ThalitaMultilingualNeural'
 # Velocidade da fala: 0.5 (lento) a 2.0 (rápido), padrão 1.0
 EDGE_TTS_SPEED = 1.0
 
+# Streaming: o MP3 é decodificado enquanto chega e a fala começa nos
+# primeiros quadros. Usa o ffmpeg (se instalado) para decodificar; sem ele,
+# usa o soundfile redecodificando o buffer acumulado.
+EDGE_TTS_STREAMING = True
+EDGE_TTS_USE_FFMPEG = True
+
+# ============================================================================
+# CACHE DE ÁUDIO DO TTS
+# ============================================================================
+
+# Chave do cache: texto normalizado + sistema TTS + voz + velocidade.
+# O áudio fica em int16 na RAM (LRU por bytes) e, para frases curtas,
+# também em disco — sobrevive a reinicializações.
+TTS_CACHE_MAX_MB = 32                # Orçamento de RAM do cache (MB)
+TTS_CACHE_DIR = '~/.cache/chica/tts' # Pasta do cache em disco ('' desativa o disco)
+TTS_CACHE_DISK_MAX_MB = 256          # Orçamento do cache em disco (MB)
+TTS_CACHE_DISK_MAX_CHARS = 120       # Só frases até N caracteres vão para o disco
+
+# Frases fixas — pré-sintetizadas na inicialização (tocam instantaneamente)
+MSG_COMMAND_CANCELLED = "Comando cancelado."
+MSG_CONFIRMATION_UNCLEAR = "Não entendi. Diga 'sim' para confirmar ou 'não' para cancelar."
+MSG_PROCESSING_ERROR = "Desculpe, tive um problema ao processar."
+MSG_SPEED_FASTER = "Certo, vou falar mais rápido."
+MSG_SPEED_SLOWER = "Certo, vou falar mais devagar."
+MSG_SPEED_NORMAL = "Certo, voltei à velocidade normal."
+
+TTS_PRERENDER_ENABLE = True          # Pré-sintetiza as frases abaixo em segundo plano
+TTS_PRERENDER_PHRASES = [
+    ASSISTANT_GREETING,
+    MSG_COMMAND_CANCELLED,
+    MSG_CONFIRMATION_UNCLEAR,
+    MSG_PROCESSING_ERROR,
+    MSG_SPEED_FASTER,
+    MSG_SPEED_SLOWER,
+    MSG_SPEED_NORMAL,
+]
+
+# ============================================================================
+# MASCARAMENTO DE LATÊNCIA (EARCON E FRASES DE ESPERA)
+# ============================================================================
+
+# Assim que o usuário para de falar toca um "plim" curto; se uma etapa
+# (busca, consulta ao sistema, LLM...) for demorar — pela média das vezes
+# anteriores — ou passar de LATENCY_FILLER_AFTER, toca uma frase de espera
+# já pré-sintetizada. Quando a resposta fica pronta, a frase é cancelada.
+LATENCY_MASK_ENABLE = True
+LATENCY_EARCON_ENABLE = True
+LATENCY_EARCON_VOLUME = 0.25         # Volume do earcon (0 a 1)
+LATENCY_FILLER_AFTER = 1.2           # Segundos de etapa até tocar a frase de espera
+LATENCY_FILLER_CUT = True            # Corta a frase de espera (com fade) quando a resposta chega
+LATENCY_EMA_ALPHA = 0.3              # Peso da última medição na média de cada etapa
+LATENCY_FILLERS = {                  # Etapa → frase (etapas sem frase só são medidas)
+    'intent': "Um momento.",
+    'system': "Só um instante, vou verificar.",
+    'search': "Deixa eu pesquisar.",
+    'llm': "Hum, deixa eu pensar.",
+}
+
+# ============================================================================
+# SÍNTESE EM LOTE (VÁRIAS FRASES DE UMA VEZ)
+# ============================================================================
+
+# Respostas longas (ex: resumo de busca) são sintetizadas em lote em vez de
+# frase a frase — o tempo total fica próximo ao da frase mais longa.
+#   Qwen3  → várias frases numa mesma passada do modelo (lista com padding)
+#   Kokoro → o modelo só aceita uma frase por passada: as frases são
+#            distribuídas num pool de processos (cada um carrega o modelo)
+#   Edge   → requisições simultâneas
+TTS_BATCH_ENABLE = True
+TTS_BATCH_SIZE = 4                   # Qwen3: máximo de frases por passada
+TTS_BATCH_WORKERS = 0                # Kokoro: processos do pool (~350 MB cada, criados no 1º lote; 0 ou 1 = sem pool)
+
+# ============================================================================
+# DIVISÃO DO TEXTO EM TRECHOS (TTS)
+# ============================================================================
+
+# O texto é dividido em frases (sem cortar "3.5 GB" nem "Sr.") e reagrupado:
+# o primeiro trecho é curto para o áudio começar logo; os seguintes são
+# maiores para render mais por passada do modelo
+TTS_CHUNK_FIRST_MAX_CHARS = 80       # Tamanho máximo do primeiro trecho
+TTS_CHUNK_MAX_CHARS = 250            # Tamanho máximo dos demais (Kokoro: até ~400)
+TTS_CHUNK_MIN_CHARS = 25             # Pedaços menores são juntados ao seguinte
+
+# ============================================================================
+# OTIMIZAÇÃO DOS MODELOS TORCH NA CPU (KOKORO / QWEN3)
+# ============================================================================
+
+# Quantização dinâmica int8 (Linear/LSTM) e compilação com o inductor, com
+# cache persistente em disco (a partir da segunda execução não recompila).
+# Meça antes/depois com: python benchmarks/bench_tts_cpu.py
+# Com 'auto', o int8 só liga se o benchmark (que grava os RTFs medidos em
+# TTS_CPU_BENCH_FILE) mostrou ganho de pelo menos TTS_QUANTIZE_MIN_GAIN nesta
+# máquina, com o mesmo backend e número de threads; sem medição fica desligado.
+TTS_QUANTIZE_INT8 = 'auto'           # True, False ou 'auto' (só na CPU; no MPS/CUDA é ignorado)
+TTS_QUANTIZE_MIN_GAIN = 1.10         # 'auto': RTF base / RTF int8 mínimo para ligar
+TTS_CPU_BENCH_FILE = '~/.cache/chica/bench_tts_cpu.json'  # RTFs gravados pelo benchmark
+TTS_TORCH_THREADS = 0                # torch.set_num_threads (0 = padrão do torch)
+KOKORO_USE_COMPILE = False           # torch.compile do Kokoro (1ª execução demora mais)
+TTS_COMPILE_CACHE_DIR = '~/.cache/chica/inductor'  # Cache dos grafos compilados
+
 # ============================================================================
 # CONFIGURAÇÕES DO PROVEDOR LLM
 # ============================================================================
@@ -216,12 +370,45 @@ LLAMACPP_PORT = 8080                 # Porta do llama-server (padrão: 8080)
 
 LLM_TEMPERATURE = 0.7                # Criatividade (0.0 = determinístico, 1.0 = criativo)
 LLM_NUM_PREDICT = 300                # Número máximo de tokens na resposta
+LLM_CLASSIFY_MAX_TOKENS = 16         # Classificação com saída restrita (rótulo ou {"label": ...})
+LLM_EXTRACTION_MAX_TOKENS = 200      # Extração de memória em JSON restrito
 
 # Aliases para compatibilidade com versões anteriores
 OLLAMA_MODEL = LLM_MODEL
 OLLAMA_TEMPERATURE = LLM_TEMPERATURE
 OLLAMA_NUM_PREDICT = LLM_NUM_PREDICT
 
+# ============================================================================
+# FILA DE PEDIDOS AO LLM (PRIORIDADES E SLOTS DO SERVIDOR)
+# ============================================================================
+
+# Um turno pode chamar o LLM até três vezes (intenção, resposta, memória).
+# Os pedidos passam por uma fila com prioridade: no máximo LLM_SERVER_SLOTS
+# ao mesmo tempo (llama-server com --parallel 1 no Pi = 1), os de primeiro
+# plano na frente, e os de segundo plano (prioridade >= LLM_BACKGROUND_PRIORITY)
+# adiados enquanto houver turno em andamento — e interrompidos (refeitos
+# depois) se um pedido de primeiro plano chegar com o slot ocupado.
+LLM_SERVER_SLOTS = 1                 # Pedidos simultâneos ao servidor
+LLM_PRIORITIES = {                   # Menor = mais urgente
+    'intent': 0,                     # Classificação de comando implícito (no caminho da resposta)
+    'reply': 0,                      # Resposta ao usuário
+    'memory': 10,                    # Extração de memória
+}
+LLM_BACKGROUND_PRIORITY = 5          # A partir desta prioridade: segundo plano
+
+# ============================================================================
+# CLASSIFICADOR LOCAL DE INTENÇÃO (COMANDO IMPLÍCITO)
+# ============================================================================
+
+# "calendário" sozinho abre o app; "calendário dos jogos" é pergunta. Quem
+# decide é um Naive Bayes local (n-gramas de caracteres, microssegundos);
+# o LLM só é consultado quando a confiança fica abaixo do limiar. As
+# respostas às confirmações (e as decisões do LLM) viram exemplos de treino.
+INTENT_CLASSIFIER_ENABLE = True
+INTENT_CONFIDENCE_THRESHOLD = 0.9            # Abaixo disso, pergunta ao LLM
+INTENT_LEARN_FROM_LLM = True                 # Decisão do LLM vira exemplo
+INTENT_CORRECTIONS_FILE = 'intent_corrections.jsonl'  # Exemplos aprendidos (na pasta do projeto)
+
 # ============================================================================
 # CONFIGURAÇÃO DE THINKING (PROCESSAMENTO DO MODELO - apenas Ollama)
 # ============================================================================
@@ -243,6 +430,13 @@ MEMORY_MAX_ITEMS = 30
 MEMORY_CHAR_LIMIT = 2200       # assistant_memory.md (~800 tokens)
 MEMORY_USER_CHAR_LIMIT = 1375  # assistant_user.md (~500 tokens)
 
+# Extração de memória via LLM: em segundo plano, várias interações num
+# pedido só, quando o pipeline está ocioso (ou ao dormir)
+MEMORY_EXTRACTION_ENABLE = True
+MEMORY_EXTRACTION_BATCH_TURNS = 3      # Interações por pedido de extração
+MEMORY_EXTRACTION_IDLE_SECONDS = 8.0   # Silêncio (sem turno em andamento) antes de extrair
+MEMORY_EXTRACTION_MAX_PENDING = 12     # Interações guardadas no máximo (as mais antigas saem)
+
 # ============================================================================
 # CONFIGURAÇÕES DO MODELO WHISPER
 # ============================================================================
@@ -256,6 +450,51 @@ WHISPER_LANGUAGE = 'pt'               # Idioma: 'pt' (português), 'en' (inglês
 # - NVIDIA GPU → 'faster-whisper' (suporta CUDA)
 STT_BACKEND = 'auto'
 
+# ============================================================================
+# PERFIS DE ENERGIA (ACORDADA / DORMINDO)
+# ============================================================================
+
+# Dormindo (esperando a wake word) o pipeline roda só o necessário: VAD por
+# energia com blocos maiores, um Whisper pequeno só para a wake word e o
+# avatar de olhos fechados, lendo eventos devagar. Depois de um tempo
+# dormindo, os modelos ociosos (STT e TTS) saem da memória e voltam em
+# segundo plano assim que ela acorda (o áudio em cache toca sem o modelo).
+POWER_PROFILES_ENABLE = True
+POWER_PROFILES = {
+    'awake': {
+        'capture_block': CHUNK,                 # Amostras por callback do microfone
+        'stt_model': None,                      # None = WHISPER_MODEL
+        'stt_beam_size': 3,
+        'avatar_poll_interval': AVATAR_EVENT_POLL_INTERVAL,
+        'unload_after_minutes': None,           # Descarregar modelos ociosos (None = nunca)
+    },
+    'sleeping': {
+        'capture_block': 4096,
+        'stt_model': 'tiny',                    # Só para reconhecer a wake word (faster-whisper)
+        'stt_beam_size': 1,
+        'avatar_poll_interval': 0.5,
+        'unload_after_minutes': 10,
+    },
+}
+
+# ============================================================================
+# PIPELINE DA INTERAÇÃO (ETAPAS COM FILAS LIMITADAS)
+# ============================================================================
+
+# Cada fala passa por captura → VAD → STT → roteamento → enriquecimento →
+# LLM → TTS → reprodução. Cada etapa tem (workers, tamanho da fila): com a
+# fila cheia a etapa anterior espera (contrapressão); só a captura, que roda
+# no callback do microfone, descarta blocos quando o VAD atrasa.
+PIPELINE_STAGES = {
+    'vad': (1, 256),        # Um worker só: o estado do VAD é sequencial
+    'stt': (1, 4),
+    'route': (1, 4),        # Um worker só: wake word e confirmação dependem da fala anterior
+    'enrich': (2, 4),       # Pesquisa web e consulta de sistema em paralelo
+    'llm': (1, 2),          # Um worker só: o histórico segue a ordem das falas
+    'tts': (1, 2),
+    'playback': (1, 2),
+}
+
 # ============================================================================
 # FUNÇÕES AUXILIARES DE CONFIGURAÇÃO
 # ============================================================================
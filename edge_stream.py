@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Edge-TTS em streaming — decodificação incremental do MP3.
+
+O serviço do Edge envia MP3 (24 kHz, 48 kbps, mono) em pedaços pelo
+websocket. Em vez de salvar o arquivo inteiro e convertê-lo, os pedaços são
+decodificados à medida que chegam e o PCM já pode ir para a reprodução.
+
+Decodificação:
+    • ffmpeg (se estiver no PATH) — processo contínuo, MP3 na entrada e
+      PCM int16 na saída
+    • soundfile — sem ffmpeg, redecodifica o buffer acumulado e segura os
+      últimos quadros (podem estar incompletos) até o fim do stream
+
+Uso:
+    from edge_stream import EdgeTTSStreamer
+
+    streamer = EdgeTTSStreamer()
+    for pcm in streamer.stream("Olá, mundo!"):
+        tocar(pcm)  # float32, TTS_SAMPLE_RATE
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import queue
+import shutil
+import subprocess
+import threading
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import soundfile as sf
+
+import config
+from log import logger
+
+# MP3 MPEG-2 Layer III: 576 amostras por quadro (24 kHz)
+_MP3_FRAME_SAMPLES = 576
+
+
+class Mp3StreamDecoder:
+    """Decodifica um fluxo de bytes MP3 em pedaços de PCM float32 mono."""
+
+    def __init__(self, sample_rate: Optional[int] = None) -> None:
+        self.sample_rate: int = sample_rate or config.TTS_SAMPLE_RATE
+        self.ffmpeg: Optional[str] = shutil.which('ffmpeg') if config.EDGE_TTS_USE_FFMPEG else None
+
+    def decode(self, mp3_chunks: Iterable[bytes]) -> Iterator[np.ndarray]:
+        """Consome os bytes MP3 e entrega o PCM assim que fica disponível."""
+        if self.ffmpeg:
+            yield from self._decode_ffmpeg(mp3_chunks)
+        else:
+            yield from self._decode_soundfile(mp3_chunks)
+
+    def _decode_ffmpeg(self, mp3_chunks: Iterable[bytes]) -> Iterator[np.ndarray]:
+        assert self.ffmpeg is not None
+        proc = subprocess.Popen(
+            [self.ffmpeg, '-hide_banner', '-loglevel', 'error',
+             '-f', 'mp3', '-i', 'pipe:0',
+             '-f', 's16le', '-ac', '1', '-ar', str(self.sample_rate), 'pipe:1'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        assert proc.stdin is not None and proc.stdout is not None
+        writer_error: list[BaseException] = []
+
+        def _writer() -> None:
+            try:
+                for data in mp3_chunks:
+                    proc.stdin.write(data)
+                    proc.stdin.flush()
+            except BrokenPipeError:
+                pass
+            except BaseException as e:  # repassado ao consumidor
+                writer_error.append(e)
+            finally:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+
+        writer = threading.Thread(target=_writer, name='edge-mp3-writer', daemon=True)
+        writer.start()
+
+        # ~50 ms de áudio por leitura
+        block = int(self.sample_rate * 0.05) * 2
+        remainder = b''
+        try:
+            while True:
+                data = proc.stdout.read1(block)
+                if not data:
+                    break
+                data = remainder + data
+                usable = len(data) - (len(data) % 2)
+                remainder = data[usable:]
+                if usable:
+                    yield np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+            writer.join()
+            if writer_error:
+                raise writer_error[0]
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+
+    def _decode_soundfile(self, mp3_chunks: Iterable[bytes]) -> Iterator[np.ndarray]:
+        buffer = bytearray()
+        emitted = 0
+        decoded_at = 0
+        holdback = 2 * _MP3_FRAME_SAMPLES
+        # Redecodifica a cada ~0,25 s de MP3 novo (48 kbps = 6000 bytes/s)
+        step = 1500
+
+        for data in mp3_chunks:
+            buffer.extend(data)
+            if len(buffer) - decoded_at < step:
+                continue
+            decoded_at = len(buffer)
+            pcm = self._read(buffer)
+            if pcm is None:
+                continue
+            ready = len(pcm) - holdback
+            if ready > emitted:
+                yield pcm[emitted:ready]
+                emitted = ready
+
+        pcm = self._read(buffer) if buffer else None
+        if pcm is not None and len(pcm) > emitted:
+            yield pcm[emitted:]
+
+    def _read(self, buffer: bytearray) -> Optional[np.ndarray]:
+        try:
+            pcm, sr = sf.read(io.BytesIO(bytes(buffer)), dtype='float32')
+        except RuntimeError:
+            return None  # quadro final ainda incompleto
+        if sr != self.sample_rate:
+            logger.warning(f"Edge-TTS retornou {sr} Hz (esperado {self.sample_rate} Hz)")
+        return pcm if pcm.ndim == 1 else pcm.mean(axis=1)
+
+
+class EdgeTTSStreamer:
+    """Cliente Edge-TTS com event loop persistente numa thread.
+
+    O loop vive enquanto o streamer existir: não há um asyncio.run (novo
+    loop, novo resolvedor) por síntese. O protocolo do Edge abre um
+    websocket por requisição, então cada resposta usa um único Communicate
+    com o texto inteiro — e não uma conexão por frase.
+    """
+
+    def __init__(self, voice: Optional[str] = None, speed: Optional[float] = None) -> None:
+        self.voice: str = voice or config.EDGE_TTS_VOICE
+        speed = speed if speed is not None else config.EDGE_TTS_SPEED
+        self.rate: str = f"{int((speed - 1.0) * 100):+d}%"
+        self.decoder = Mp3StreamDecoder()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='edge-tts-loop', daemon=True)
+        self._thread.start()
+        decoder_name = 'ffmpeg' if self.decoder.ffmpeg else 'soundfile'
+        logger.info(f"Edge-TTS em streaming (decodificador: {decoder_name})")
+
+    def run(self, coro):
+        """Executa uma corrotina no loop persistente e espera o resultado."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def stream_mp3(self, text: str) -> Iterator[bytes]:
+        """Bytes MP3 na ordem em que chegam do serviço."""
+        import edge_tts
+
+        chunks: queue.Queue = queue.Queue()
+
+        async def _produce() -> None:
+            try:
+                communicate = edge_tts.Communicate(text, self.voice, rate=self.rate)
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        chunks.put(chunk["data"])
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(None)
+
+        future = asyncio.run_coroutine_threadsafe(_produce(), self._loop)
+        try:
+            while True:
+                item = chunks.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def stream(self, text: str) -> Iterator[np.ndarray]:
+        """PCM float32 (TTS_SAMPLE_RATE) à medida que o MP3 é decodificado."""
+        yield from self.decoder.decode(self.stream_mp3(text))
+
+    def synthesize(self, text: str) -> Optional[np.ndarray]:
+        """Áudio completo do texto (sem streaming)."""
+        parts = list(self.stream(text))
+        return np.concatenate(parts) if parts else None
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
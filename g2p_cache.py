@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Cache de fonemas (G2P) do Kokoro — memoização persistente do texto → fonemas.
+
+O KPipeline fonemiza cada frase do zero a cada chamada (espeak-ng). O
+vocabulário da Chica é muito repetitivo (nome do usuário, "Chica",
+saudações, números, frases prontas), então os fonemas são memorizados:
+
+    • por frase — frase já vista não passa pelo espeak (e o backend pode
+      ir direto ao modelo com KPipeline.infer)
+    • por trecho — frases novas são divididas na pontuação (vírgula,
+      ponto...) e só os trechos inéditos são fonemizados
+
+O cache é um LRU com limite de entradas, salvo em JSON no disco.
+
+Uso:
+    from g2p_cache import G2PCache, MemoizedG2P
+
+    cache = G2PCache(namespace='pt-br')
+    pipeline.g2p = MemoizedG2P(pipeline.g2p, cache)
+    print(cache.stats())  # taxa de acerto
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import config
+from log import logger
+
+# Pontuação que separa trechos (o espeak trata como fronteira prosódica)
+_SPAN_SPLIT = re.compile(r'([,;:.!?…]+\s*)')
+
+
+class G2PCache:
+    """LRU texto → fonemas, persistido em JSON.
+
+    Args:
+        namespace: Identifica idioma/versão do G2P (entradas de outro
+            namespace no arquivo são descartadas).
+        path: Arquivo JSON (None usa KOKORO_G2P_CACHE_DIR/g2p_<namespace>.json).
+        max_entries: Limite de entradas (LRU).
+        readonly: Só lê o arquivo (processos do pool não gravam).
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        readonly: bool = False,
+    ) -> None:
+        self.namespace: str = namespace
+        self.max_entries: int = max_entries or config.KOKORO_G2P_CACHE_MAX_ENTRIES
+        self.readonly: bool = readonly
+        if path is None and config.KOKORO_G2P_CACHE_DIR:
+            safe = re.sub(r'[^\w.-]', '_', namespace)
+            path = os.path.join(os.path.expanduser(config.KOKORO_G2P_CACHE_DIR), f"g2p_{safe}.json")
+        self.path: Optional[str] = path
+
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.sentence_hits: int = 0
+        self.sentence_misses: int = 0
+        self._load()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normaliza o texto para a chave (unicode e espaços; mantém a caixa)."""
+        return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text)).strip()
+
+    # ------------------------------------------------------------------
+    # Leitura / escrita
+    # ------------------------------------------------------------------
+
+    def get(self, text: str, sentence: bool = False) -> Optional[str]:
+        """Fonemas do texto em cache ou None (contabiliza acerto/erro)."""
+        key = self.normalize(text)
+        with self._lock:
+            ps = self._entries.get(key)
+            if ps is not None:
+                self._entries.move_to_end(key)
+            if sentence:
+                if ps is None:
+                    self.sentence_misses += 1
+                else:
+                    self.sentence_hits += 1
+            elif ps is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return ps
+
+    def put(self, text: str, ps: str) -> None:
+        key = self.normalize(text)
+        if not key or not ps:
+            return
+        with self._lock:
+            self._entries[key] = ps
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            should_save = self._unsaved >= config.KOKORO_G2P_CACHE_SAVE_EVERY
+        if should_save:
+            self.save()
+
+    # ------------------------------------------------------------------
+    # Disco
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache de fonemas ignorado ({self.path}): {e}")
+            return
+        if data.get('namespace') != self.namespace:
+            return
+        entries = list(data.get('entries', {}).items())[-self.max_entries:]
+        self._entries.update(entries)
+        logger.info(f"Cache de fonemas: {len(self._entries)} entradas carregadas")
+
+    def save(self) -> None:
+        """Grava o cache no disco (escrita atômica)."""
+        if self.readonly or not self.path:
+            return
+        with self._lock:
+            if not self._unsaved:
+                return
+            data = {'namespace': self.namespace, 'entries': dict(self._entries)}
+            self._unsaved = 0
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Erro ao salvar cache de fonemas: {e}")
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict[str, float]:
+        """Taxa de acerto por frase (bypass total) e por trecho."""
+        with self._lock:
+            spans = self.hits + self.misses
+            sentences = self.sentence_hits + self.sentence_misses
+            return {
+                'entries': len(self._entries),
+                'sentence_hit_rate': (self.sentence_hits / sentences) if sentences else 0.0,
+                'span_hit_rate': (self.hits / spans) if spans else 0.0,
+                'sentence_lookups': sentences,
+                'span_lookups': spans,
+            }
+
+
+class MemoizedG2P:
+    """Envolve o g2p de um KPipeline (espeak) com o G2PCache.
+
+    Mantém a assinatura do g2p original: texto → (fonemas, None).
+    """
+
+    def __init__(self, g2p: Callable[[str], tuple], cache: G2PCache) -> None:
+        self.g2p = g2p
+        self.cache = cache
+
+    def __call__(self, text: str) -> tuple[str, None]:
+        ps = self.cache.get(text, sentence=True)
+        if ps is not None:
+            return ps, None
+
+        parts = _SPAN_SPLIT.split(text)
+        phonemes: list[str] = []
+        # parts alterna [trecho, pontuação, trecho, pontuação, ...]
+        for i in range(0, len(parts), 2):
+            span = parts[i].strip()
+            punct = parts[i + 1] if i + 1 < len(parts) else ''
+            if span:
+                span_ps = self.cache.get(span)
+                if span_ps is None:
+                    span_ps, _ = self.g2p(span)
+                    self.cache.put(span, span_ps)
+                phonemes.append(span_ps)
+            if punct:
+                phonemes.append(punct)
+        ps = ''.join(phonemes).strip()
+        self.cache.put(text, ps)
+        return ps, None
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Classificador local de intenção — COMANDO (abrir o app) ou PERGUNTA.
+
+Quando o CommandExecutor reconhece um app sem verbo de abertura ("calendário",
+"calendário dos jogos"), a dúvida "quer abrir ou quer saber?" ia para o LLM:
+uma ida e volta de segundos no Pi antes de qualquer resposta. Aqui a
+decisão sai de um Naive Bayes multinomial sobre n-gramas de caracteres,
+em numpy, em microssegundos:
+
+    • o nome do app vira "§" ("§ dos jogos"), então os exemplos valem
+      para qualquer app
+    • n-gramas de 2 a 4 caracteres (com as bordas das palavras) e o
+      tamanho da frase num vetor de hashing de tamanho fixo — nada de
+      vocabulário para montar
+    • treinado na inicialização com os exemplos em pt-BR deste módulo e
+      com as correções gravadas em INTENT_CORRECTIONS_FILE (confirmação
+      aceita/recusada pelo usuário, decisão do LLM nos casos incertos)
+    • a confiança é calibrada: o Naive Bayes puro soma centenas de
+      n-gramas e dá 0,99+ para quase tudo ("spotify premium" virava
+      comando); aqui vale a média por n-grama (× sharpness), encolhida
+      pela fração de n-gramas já vistos no treino — assunto novo
+      ("calendário lunar") fica perto de 0,5 e vai para o LLM
+    • predict() devolve (rótulo, confiança); decide() devolve o rótulo
+      ou None abaixo de INTENT_CONFIDENCE_THRESHOLD (quem decide é o LLM)
+
+Uso:
+    from intent_classifier import IntentClassifier
+
+    classifier = IntentClassifier('intent_corrections.jsonl')
+    label, confidence = classifier.predict("calendário dos jogos", key='calendário')
+    label = classifier.decide("calendário", 0.9, key='calendário')   # ou None
+    classifier.add_example("calendário dos jogos", 'PERGUNTA', key='calendário')
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from commands import normalize_text
+from log import logger
+
+LABELS: tuple[str, ...] = ('COMANDO', 'PERGUNTA')
+
+_APP = '§'  # marcador do nome do app no texto
+
+
+# ---------------------------------------------------------------------------
+# Exemplos embutidos ({app} = nome do app reconhecido)
+# ---------------------------------------------------------------------------
+
+_EXAMPLES: list[tuple[str, str]] = [
+    # ── Comando: só o app, ou pedido curto para abrir/usar ──
+    ("{app}", 'COMANDO'),
+    ("{app} já", 'COMANDO'),
+    ("{app} chica", 'COMANDO'),
+    ("{app} aí", 'COMANDO'),
+    ("{app} por favor", 'COMANDO'),
+    ("o {app}", 'COMANDO'),
+    ("a {app}", 'COMANDO'),
+    ("{app} agora", 'COMANDO'),
+    ("{app} rapidinho", 'COMANDO'),
+    ("chica {app}", 'COMANDO'),
+    ("ei chica {app}", 'COMANDO'),
+    ("vai no {app}", 'COMANDO'),
+    ("vai pro {app}", 'COMANDO'),
+    ("liga o {app}", 'COMANDO'),
+    ("bota o {app}", 'COMANDO'),
+    ("coloca o {app}", 'COMANDO'),
+    ("põe o {app}", 'COMANDO'),
+    ("quero o {app}", 'COMANDO'),
+    ("quero usar o {app}", 'COMANDO'),
+    ("preciso do {app}", 'COMANDO'),
+    ("preciso do {app} agora", 'COMANDO'),
+    ("me dá o {app}", 'COMANDO'),
+    ("traz o {app}", 'COMANDO'),
+    ("mostra o {app} na tela", 'COMANDO'),
+    ("{app} na tela", 'COMANDO'),
+    ("entra no {app}", 'COMANDO'),
+    ("acessa o {app}", 'COMANDO'),
+    ("acesse o {app}", 'COMANDO'),
+    ("carrega o {app}", 'COMANDO'),
+    ("roda o {app}", 'COMANDO'),
+    ("usa o {app}", 'COMANDO'),
+    ("{app} pra mim", 'COMANDO'),
+    ("{app} para mim", 'COMANDO'),
+    ("pode ser o {app}", 'COMANDO'),
+    ("o {app} por favor", 'COMANDO'),
+    ("vamos de {app}", 'COMANDO'),
+    ("toca no {app}", 'COMANDO'),
+    ("deixa o {app} aberto", 'COMANDO'),
+
+    # ── Pergunta: informação sobre algo, o app como assunto ──
+    ("{app} dos jogos", 'PERGUNTA'),
+    ("{app} do campeonato", 'PERGUNTA'),
+    ("{app} da copa", 'PERGUNTA'),
+    ("{app} de provas", 'PERGUNTA'),
+    ("{app} das férias", 'PERGUNTA'),
+    ("{app} escolar deste ano", 'PERGUNTA'),
+    ("qual o melhor {app}", 'PERGUNTA'),
+    ("qual {app} você recomenda", 'PERGUNTA'),
+    ("o que é o {app}", 'PERGUNTA'),
+    ("o {app} é seguro", 'PERGUNTA'),
+    ("o {app} é de graça", 'PERGUNTA'),
+    ("quanto custa o {app}", 'PERGUNTA'),
+    ("como funciona o {app}", 'PERGUNTA'),
+    ("como usar o {app}", 'PERGUNTA'),
+    ("como instalar o {app}", 'PERGUNTA'),
+    ("quem criou o {app}", 'PERGUNTA'),
+    ("quando lançaram o {app}", 'PERGUNTA'),
+    ("o {app} está fora do ar", 'PERGUNTA'),
+    ("o {app} caiu hoje", 'PERGUNTA'),
+    ("o {app} tem versão nova", 'PERGUNTA'),
+    ("notícias sobre o {app}", 'PERGUNTA'),
+    ("me fala sobre o {app}", 'PERGUNTA'),
+    ("me conta a história do {app}", 'PERGUNTA'),
+    ("pesquisa no {app}", 'PERGUNTA'),
+    ("pesquisar no {app}", 'PERGUNTA'),
+    ("procura no {app} receita de bolo", 'PERGUNTA'),
+    ("busca no {app} o resultado do jogo", 'PERGUNTA'),
+    ("{app} ou o concorrente, qual é melhor", 'PERGUNTA'),
+    ("diferença entre o {app} e os outros", 'PERGUNTA'),
+    ("eu gosto do {app}", 'PERGUNTA'),
+    ("eu odeio o {app}", 'PERGUNTA'),
+    ("meu {app} está travando", 'PERGUNTA'),
+    ("o {app} não abre no meu celular", 'PERGUNTA'),
+    ("o {app} gasta muita bateria", 'PERGUNTA'),
+    ("ontem eu usei o {app}", 'PERGUNTA'),
+    ("você conhece o {app}", 'PERGUNTA'),
+    ("você usa o {app}", 'PERGUNTA'),
+    ("o {app} funciona no linux", 'PERGUNTA'),
+    ("tem {app} para windows", 'PERGUNTA'),
+    ("para que serve o {app}", 'PERGUNTA'),
+    ("o que tem no {app} hoje", 'PERGUNTA'),
+    ("lê o {app} pra mim", 'PERGUNTA'),
+    ("o que diz o {app}", 'PERGUNTA'),
+]
+
+
+def _normalize(text: str, key: Optional[str] = None) -> str:
+    """normalize_text (sem acentos, como o roteador), com o nome do app trocado pelo marcador."""
+    parts = text.replace('{app}', _APP).split(_APP)
+    text = f' {_APP} '.join(normalize_text(part) for part in parts)
+    if key:
+        text = re.sub(r'(?<![a-z0-9])' + re.escape(normalize_text(key)) + r'(?![a-z0-9])', _APP, text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class IntentClassifier:
+    """Naive Bayes multinomial sobre n-gramas de caracteres (hashing).
+
+    Args:
+        corrections_path: Arquivo JSONL com os exemplos aprendidos em uso
+            (um {"text", "label"} por linha); None = só os embutidos.
+        n_features: Tamanho do vetor de hashing.
+        ngram_range: Tamanhos mínimo e máximo dos n-gramas.
+        alpha: Suavização de Laplace.
+        length_weight: Peso (repetições) do atributo de tamanho da frase.
+        sharpness: Escala da log-verossimilhança média por n-grama na
+            confiança (maior = mais confiante).
+    """
+
+    def __init__(
+        self,
+        corrections_path: Optional[str] = None,
+        n_features: int = 1 << 14,
+        ngram_range: tuple[int, int] = (2, 4),
+        alpha: float = 0.5,
+        length_weight: int = 3,
+        sharpness: float = 4.0,
+    ) -> None:
+        self.corrections_path = corrections_path
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.alpha = alpha
+        self.length_weight = length_weight
+        self.sharpness = sharpness
+        self._lock = threading.Lock()
+        self._counts = np.zeros((len(LABELS), n_features), dtype=np.float64)
+        self._log_prob = np.zeros((len(LABELS), n_features), dtype=np.float64)
+        self._log_prior = np.zeros(len(LABELS), dtype=np.float64)
+        self._seen = np.zeros(n_features, dtype=bool)  # atributo visto em algum exemplo
+
+        for text, label in _EXAMPLES:
+            self._count(_normalize(text), label)
+        learned = 0
+        for text, label in self._load_corrections():
+            self._count(_normalize(text), label)  # gravados antes de uma mudança na normalização
+            learned += 1
+        self._refit()
+        logger.debug(f"Classificador de intenção: {len(_EXAMPLES)} exemplos + {learned} aprendidos")
+
+    # ------------------------------------------------------------------
+    # Atributos (n-gramas)
+    # ------------------------------------------------------------------
+
+    def _features(self, text: str) -> np.ndarray:
+        """Índices de hashing dos n-gramas de caracteres (com repetição)."""
+        words = text.split()
+        # Tamanho da frase: o app sozinho ("calendário") é o comando típico
+        size = f'#palavras={min(len(words), 6)}'.encode('utf-8')
+        indices = [zlib.crc32(size) % self.n_features] * self.length_weight
+        low, high = self.ngram_range
+        for word in words:
+            padded = f' {word} '
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    gram = padded[i:i + n].encode('utf-8')
+                    indices.append(zlib.crc32(gram) % self.n_features)
+        return np.asarray(indices, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Treino
+    # ------------------------------------------------------------------
+
+    def _count(self, text: str, label: str) -> None:
+        row = LABELS.index(label)
+        np.add.at(self._counts[row], self._features(text), 1.0)
+
+    def _refit(self) -> None:
+        smoothed = self._counts + self.alpha
+        self._log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        # Priori uniforme: a proporção de exemplos por rótulo não diz nada
+        # sobre a frequência real (o texto decide)
+        self._log_prior = np.full(len(LABELS), -np.log(len(LABELS)))
+        self._seen = self._counts.sum(axis=0) > 0
+
+    def add_example(self, text: str, label: str, key: Optional[str] = None) -> None:
+        """Aprende um exemplo (ex: o usuário recusou a abertura) e grava no arquivo."""
+        if label not in LABELS:
+            return
+        normalized = _normalize(text, key)
+        if not normalized:
+            return
+        with self._lock:
+            self._count(normalized, label)
+            self._refit()
+        if self.corrections_path:
+            try:
+                with open(self.corrections_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'text': normalized, 'label': label}, ensure_ascii=False) + '\n')
+            except OSError as e:
+                logger.warning(f"Não foi possível gravar o exemplo de intenção: {e}")
+
+    def _load_corrections(self) -> list[tuple[str, str]]:
+        if not self.corrections_path or not os.path.exists(self.corrections_path):
+            return []
+        examples = []
+        with open(self.corrections_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                if item.get('label') in LABELS and item.get('text'):
+                    examples.append((item['text'], item['label']))
+        return examples
+
+    # ------------------------------------------------------------------
+    # Predição
+    # ------------------------------------------------------------------
+
+    def predict(self, text: str, key: Optional[str] = None) -> tuple[str, float]:
+        """(rótulo, confiança 0-1) para o texto; key = nome do app reconhecido."""
+        indices = self._features(_normalize(text, key))
+        ngrams = indices[self.length_weight:]
+        with self._lock:
+            # Média por n-grama: a soma cresce com o tamanho da frase e
+            # satura a probabilidade; n-gramas nunca vistos puxam para 0,5
+            coverage = float(self._seen[ngrams].mean()) if len(ngrams) else 1.0
+            scores = self._log_prior + self.sharpness * coverage * self._log_prob[:, indices].mean(axis=1)
+        scores = np.exp(scores - scores.max())
+        probs = scores / scores.sum()
+        best = int(probs.argmax())
+        return LABELS[best], float(probs[best])
+
+    def decide(self, text: str, threshold: float, key: Optional[str] = None) -> Optional[str]:
+        """O rótulo se a confiança chegar a threshold; None = incerto (quem decide é o LLM)."""
+        label, confidence = self.predict(text, key)
+        if confidence >= threshold:
+            logger.debug(f'🧠 Intenção (local): {label} ({confidence:.2f})')
+            return label
+        logger.debug(f'🧠 Intenção local incerta ({label} {confidence:.2f}) — consultando o LLM')
+        return None
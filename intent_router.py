@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Roteador de intenção — comandos, consultas de sistema e pesquisa numa passada.
+
+Cada turno passava por três detectores, cada um com a sua varredura:
+CommandExecutor.parse (todas as chaves de _COMMANDS), detect_system_query
+(laço aninhado em _QUERIES) e needs_search (SEARCH_KEYWORDS). E eles
+discordavam: "temperatura" é consulta de sistema e gatilho de pesquisa,
+e quem vencia era só a ordem das chamadas. Aqui:
+
+    • os gatilhos das três fontes são compilados uma vez numa regex em
+      forma de trie (prefixos comuns fatorados, como um autômato)
+    • o texto é normalizado uma vez (minúsculas, sem acentos e sem
+      pontuação) e todos os gatilhos são encontrados numa passada, com
+      limite de palavra ("ip" não casa com "equipe")
+    • cada intenção soma o peso dos seus gatilhos (palavras do gatilho;
+      frases específicas pesam mais) e route() devolve a lista ranqueada
+
+Resolução de conflitos:
+
+    situação                             quem vence
+    ───────────────────────────────────  ─────────────────────────────────────
+    gatilhos na mesma posição            o mais longo ("tempo ligado" > "tempo")
+    gatilho de duas intenções            _CONFLICTS: o contexto da frase (e o
+                                         gatilho ganha +1); sem contexto, a
+                                         intenção padrão da tabela
+    sistema × pesquisa                   maior pontuação; empate: sistema
+    consultas de sistema entre si        maior pontuação; empate: ordem de _QUERIES
+                                         (a intenção 'system' soma todas)
+    comando × o resto                    o comando é tentado primeiro
+                                         (CommandExecutor.resolve tem as
+                                         salvaguardas e o usuário confirma);
+                                         recusado, vale o próximo da lista
+
+Os apps e o verbo de abertura achados na passada vão direto para
+CommandExecutor.resolve: route.command é o mesmo dict de parse(), sem
+varrer o texto de novo. A normalização é normalize_text de commands, a
+mesma das salvaguardas de resolve e do classificador de intenção.
+
+Uso:
+    from intent_router import IntentRouter
+
+    router = IntentRouter()
+    route = router.route("qual a temperatura do processador?")
+    route.best                      # Intent(kind='system', target=SystemQuery('temperatura'), ...)
+    route.get('command')            # None
+    route.best_of('system', 'search')
+    route.command                   # dict de CommandExecutor.parse, ou None
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from commands import OPEN_VERBS, _COMMANDS, CommandExecutor, normalize_text
+from log import logger
+from system_info import _QUERIES
+from web_search import SEARCH_KEYWORDS, SEARCH_SUFFIXES
+
+# Ordem de desempate entre intenções (e de tentativa no app)
+KINDS: tuple[str, ...] = ('command', 'system', 'search')
+_KIND_RANK = {kind: i for i, kind in enumerate(KINDS)}
+
+# Verbo de abertura ("abra", "execute"): intenção explícita, pesa como um
+# gatilho de duas palavras
+_OPEN_VERB_WEIGHT = 2.0
+
+# Gatilho de mais de uma intenção: (intenção padrão, {intenção: contexto})
+# — a primeira intenção cujo contexto aparece na frase fica com o gatilho
+_CONFLICTS: dict[str, tuple[str, dict[str, tuple[str, ...]]]] = {
+    'temperatura': ('search', {
+        'system': ('cpu', 'processador', 'pc', 'computador', 'raspberry', 'pi', 'sistema',
+                   'maquina', 'placa', 'chip', 'sensor', 'sensores', 'hd', 'disco'),
+        'search': ('clima', 'tempo', 'previsao', 'hoje', 'amanha', 'graus', 'cidade',
+                   'la fora', 'frio', 'calor', 'chuva'),
+    }),
+}
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex de alternativas com os prefixos comuns fatorados (ex: 'tempo(?: ligado)?')."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            # Opcional guloso: tenta o gatilho mais longo primeiro
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+@dataclass
+class Intent:
+    """Uma intenção candidata e o que a sustentou."""
+    kind: str                               # 'command', 'system' ou 'search'
+    target: Any = None                      # chave do app, SystemQuery ou None (pesquisa)
+    score: float = 0.0
+    triggers: list[str] = field(default_factory=list)
+    keys: list[str] = field(default_factory=list)  # comando: apps citados
+
+
+@dataclass
+class Route:
+    """Decisão do roteador: intenções em ordem de preferência."""
+    text: str                               # texto normalizado
+    intents: list[Intent] = field(default_factory=list)
+    command: Optional[dict] = None          # CommandExecutor.resolve, já com as salvaguardas
+
+    @property
+    def best(self) -> Optional[Intent]:
+        return self.intents[0] if self.intents else None
+
+    def get(self, kind: str) -> Optional[Intent]:
+        return next((i for i in self.intents if i.kind == kind), None)
+
+    def best_of(self, *kinds: str) -> Optional[Intent]:
+        """A melhor intenção entre as classes dadas (ex: depois de o comando ser recusado)."""
+        return next((i for i in self.intents if i.kind in kinds), None)
+
+
+class IntentRouter:
+    """Gatilhos de comandos, sistema e pesquisa compilados numa regex só."""
+
+    def __init__(self, executor: Optional[CommandExecutor] = None) -> None:
+        self.executor = executor or CommandExecutor()
+        # gatilho normalizado → [(intenção, alvo)]
+        self._triggers: dict[str, list[tuple[str, Any]]] = {}
+        for key in _COMMANDS:
+            self._add(key, 'command', key)
+        for verb in OPEN_VERBS:
+            self._add(verb, 'command', None)
+        for keywords, query in _QUERIES:
+            for kw in keywords:
+                self._add(kw, 'system', query)
+        for kw in SEARCH_KEYWORDS + SEARCH_SUFFIXES:
+            self._add(kw, 'search', None)
+
+        for trigger, targets in self._triggers.items():
+            kinds = {kind for kind, _ in targets}
+            if len(kinds) > 1 and trigger not in _CONFLICTS:
+                logger.warning(f"Gatilho '{trigger}' em {sorted(kinds)} sem regra em _CONFLICTS")
+
+        # Só em início de palavra; o lookahead acha gatilhos sobrepostos ("qual meu ip" e "ip")
+        self._regex = re.compile(r'(?<![a-z0-9])(?=(' + _trie_pattern(self._triggers) + r')(?![a-z0-9]))')
+        self._order = {query: i for i, (_, query) in enumerate(_QUERIES)}
+        # Contexto de cada conflito numa regex: (padrão, [(intenção, regex)])
+        self._conflicts: dict[str, tuple[str, list[tuple[str, re.Pattern]]]] = {
+            trigger: (default, [
+                (kind, re.compile(r'(?<![a-z0-9])(?:' + '|'.join(map(re.escape, words)) + r')(?![a-z0-9])'))
+                for kind, words in contexts.items()
+            ])
+            for trigger, (default, contexts) in _CONFLICTS.items()
+        }
+
+    def _add(self, trigger: str, kind: str, target: Any) -> None:
+        trigger = normalize_text(trigger)
+        if not trigger:
+            return
+        targets = self._triggers.setdefault(trigger, [])
+        if (kind, target) not in targets:
+            targets.append((kind, target))
+
+    # ------------------------------------------------------------------
+    # Roteamento
+    # ------------------------------------------------------------------
+
+    def route(self, text: str) -> Route:
+        """Normaliza o texto, acha todos os gatilhos, ranqueia as intenções e resolve o comando."""
+        normalized = normalize_text(text)
+        # (intenção, alvo) → [pontuação, gatilhos]
+        scores: dict[tuple[str, Any], list] = {}
+        covered: dict[str, int] = {}  # intenção → fim do último gatilho contado
+        keys: dict[str, int] = {}     # app citado → posição da 1ª ocorrência
+        verb_end: Optional[int] = None
+
+        for m in self._regex.finditer(normalized):
+            trigger = m.group(1)
+            end = m.end(1)
+            targets = self._triggers[trigger]
+            for kind, target in targets:
+                if kind != 'command':
+                    continue
+                if target is not None:
+                    keys.setdefault(target, m.start(1))
+                elif verb_end is None and end < len(normalized):
+                    verb_end = end + 1  # verbo seguido do alvo
+            weight = float(trigger.count(' ') + 1)
+            if trigger in self._conflicts:
+                targets, by_context = self._resolve(trigger, targets, normalized)
+                if by_context:
+                    weight += 1.0  # o contexto confirma ("temperatura do processador")
+            for kind, target in targets:
+                # Gatilho dentro de outro já contado da mesma intenção ("meu ip" em "qual meu ip")
+                if end <= covered.get(kind, -1):
+                    continue
+                entry = scores.get((kind, target))
+                if entry is None:
+                    entry = scores[(kind, target)] = [0.0, []]
+                entry[0] += _OPEN_VERB_WEIGHT if kind == 'command' and target is None else weight
+                entry[1].append(trigger)
+            for kind, _ in targets:
+                covered[kind] = max(covered.get(kind, -1), end)
+
+        command = None
+        if keys or verb_end is not None:
+            command = self.executor.resolve(text, normalized, list(keys.items()), verb_end)
+        return Route(normalized, self._rank(scores), command)
+
+    def _resolve(
+        self, trigger: str, targets: list[tuple[str, Any]], text: str,
+    ) -> tuple[list[tuple[str, Any]], bool]:
+        """Entrega o gatilho ambíguo a uma intenção (_CONFLICTS); True = pelo contexto."""
+        default, contexts = self._conflicts[trigger]
+        winner, by_context = default, False
+        for kind, context in contexts:
+            if context.search(text):
+                winner, by_context = kind, True
+                break
+        return [(kind, target) for kind, target in targets if kind == winner], by_context
+
+    def _rank(self, scores: dict[tuple[str, Any], list]) -> list[Intent]:
+        """Uma Intent por classe, em ordem de pontuação (empate: ordem de KINDS)."""
+        intents: dict[str, Intent] = {}
+        for (kind, target), (score, triggers) in scores.items():
+            intent = intents.get(kind)
+            if intent is None:
+                intent = intents[kind] = Intent(kind)
+            intent.triggers.extend(triggers)
+            intent.score += score
+            if kind == 'system':
+                # Alvo: a consulta de maior pontuação (empate: ordem de _QUERIES)
+                best = scores[(kind, intent.target)][0] if intent.target is not None else -1.0
+                if score > best or (score == best and self._order[target] < self._order[intent.target]):
+                    intent.target = target
+            elif kind == 'command' and target is not None:
+                intent.keys.append(target)
+                intent.target = intent.target or target
+        return sorted(intents.values(), key=lambda i: (-i.score, _KIND_RANK[i.kind]))
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Kokoro-82M via ONNX Runtime (int8) — TTS local sem torch em execução.
+
+Para SBCs ARM sem GPU: o grafo do Kokoro é exportado para ONNX uma única
+vez, os pesos são quantizados para int8 (quantização dinâmica) e as vozes
+são empacotadas num .npy que é aberto com mmap (só as linhas usadas vão
+para a RAM). Em execução bastam onnxruntime, numpy e o G2P do misaki
+(espeak-ng) — nada de torch nem do pacote kokoro.
+
+Arquivos gerados em KOKORO_ONNX_DIR:
+    kokoro.onnx        grafo exportado (float32)
+    kokoro_int8.onnx   grafo quantizado (usado em execução)
+    voices.npy         vozes empacotadas [n_vozes, 510, 256] float32
+    kokoro_onnx.json   nomes das vozes, vocabulário de fonemas e sample rate
+
+Preparação (numa máquina com torch e kokoro instalados; depois copie a
+pasta para o SBC):
+    python kokoro_onnx.py build --voices pf_dora if_sara
+
+Uso:
+    from kokoro_onnx import KokoroOnnx
+
+    tts = KokoroOnnx()
+    audio = tts.synthesize(fonemas, {'pf_dora': 100}, speed=1.05)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+import config
+from log import logger
+
+META_FILE = 'kokoro_onnx.json'
+VOICES_FILE = 'voices.npy'
+FLOAT_MODEL_FILE = 'kokoro.onnx'
+
+# O Kokoro aceita até 510 fonemas por passada (+2 tokens de borda)
+MAX_PHONEMES = 510
+
+
+def onnx_dir() -> str:
+    return os.path.expanduser(config.KOKORO_ONNX_DIR)
+
+
+# ============================================================================
+# EXECUÇÃO
+# ============================================================================
+
+class KokoroOnnx:
+    """Sessão ONNX Runtime do Kokoro com vozes mapeadas em memória.
+
+    Args:
+        model_dir: Pasta com o modelo, as vozes e o JSON (None = KOKORO_ONNX_DIR).
+        threads: Threads intra-op (0 = todos os núcleos).
+    """
+
+    def __init__(self, model_dir: Optional[str] = None, threads: Optional[int] = None) -> None:
+        import onnxruntime as ort
+
+        model_dir = model_dir or onnx_dir()
+        model_path = os.path.join(model_dir, config.KOKORO_ONNX_MODEL)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"{model_path} não encontrado — gere com: python kokoro_onnx.py build"
+            )
+        with open(os.path.join(model_dir, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.vocab: dict[str, int] = meta['vocab']
+        self.voice_index: dict[str, int] = {name: i for i, name in enumerate(meta['voices'])}
+        self.sample_rate: int = meta.get('sample_rate', config.TTS_SAMPLE_RATE)
+        # mmap: o arquivo inteiro não é lido; só as páginas das vozes usadas
+        self.voices: np.ndarray = np.load(os.path.join(model_dir, VOICES_FILE), mmap_mode='r')
+        self._blends: dict[str, np.ndarray] = {}
+
+        threads = config.KOKORO_ONNX_THREADS if threads is None else threads
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = threads or (os.cpu_count() or 1)
+        # Sem espera ativa entre passadas (libera a CPU para o STT/LLM)
+        options.add_session_config_entry('session.intra_op.allow_spinning', '0')
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+
+        # Exportações diferentes nomeiam as entradas de forma diferente
+        # (input_ids/tokens) e algumas recebem a velocidade como int32
+        inputs = self.session.get_inputs()
+        self._ids_name: str = inputs[0].name
+        self._style_name: str = inputs[1].name
+        self._speed_name: str = inputs[2].name
+        self._speed_dtype = np.float32 if 'float' in inputs[2].type else np.int32
+
+    def voice(self, voice_config: dict[str, int]) -> np.ndarray:
+        """Pacote de estilo [510, 256] da voz (ou mescla, pelos percentuais)."""
+        key = ','.join(f'{name}:{percent}' for name, percent in voice_config.items())
+        pack = self._blends.get(key)
+        if pack is not None:
+            return pack
+        missing = [name for name in voice_config if name not in self.voice_index]
+        if missing:
+            raise KeyError(
+                f"Voz não empacotada: {', '.join(missing)} — "
+                f"rode: python kokoro_onnx.py pack --voices {' '.join(voice_config)}"
+            )
+        if len(voice_config) == 1:
+            pack = self.voices[self.voice_index[next(iter(voice_config))]]
+        else:
+            pack = sum(
+                np.asarray(self.voices[self.voice_index[name]], dtype=np.float32) * (percent / 100.0)
+                for name, percent in voice_config.items()
+            )
+            logger.info(f"Voz mesclada criada: {key}")
+        self._blends[key] = pack
+        return pack
+
+    def synthesize(self, phonemes: str, voice_config: dict[str, int], speed: float) -> Optional[np.ndarray]:
+        """Áudio (float32) dos fonemas; textos longos em várias passadas."""
+        pack = self.voice(voice_config)
+        parts = [self._infer(ps, pack, speed) for ps in _split_phonemes(phonemes)]
+        parts = [p for p in parts if p is not None and p.size]
+        return np.concatenate(parts) if parts else None
+
+    def _infer(self, phonemes: str, pack: np.ndarray, speed: float) -> Optional[np.ndarray]:
+        ids = [self.vocab[p] for p in phonemes if p in self.vocab]
+        if not ids:
+            return None
+        # Mesmo estilo do KPipeline: linha escolhida pelo nº de fonemas
+        style = np.asarray(pack[len(ids) - 1], dtype=np.float32).reshape(1, -1)
+        feeds = {
+            self._ids_name: np.array([[0, *ids, 0]], dtype=np.int64),
+            self._style_name: style,
+            self._speed_name: np.array([speed], dtype=self._speed_dtype),
+        }
+        audio = self.session.run(None, feeds)[0]
+        return np.asarray(audio, dtype=np.float32).reshape(-1)
+
+
+def _split_phonemes(phonemes: str) -> list[str]:
+    """Divide fonemas acima do limite do modelo entre palavras."""
+    if len(phonemes) <= MAX_PHONEMES:
+        return [phonemes]
+    parts: list[str] = []
+    current = ''
+    for word in phonemes.split(' '):
+        if current and len(current) + 1 + len(word) > MAX_PHONEMES:
+            parts.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        parts.append(current[:MAX_PHONEMES])
+    return parts
+
+
+# ============================================================================
+# PREPARAÇÃO (exportar, quantizar, empacotar vozes)
+# ============================================================================
+# Usa torch e kokoro — rode uma vez, em qualquer máquina.
+
+def export_onnx(output_path: str) -> None:
+    """Exporta o KModel (config.TTS_KOKORO_MODEL) para ONNX."""
+    import torch
+    from kokoro import KModel
+    from kokoro.model import KModelForONNX
+
+    model = KModelForONNX(KModel(repo_id=config.TTS_KOKORO_MODEL)).eval()
+    input_ids = torch.zeros((1, 32), dtype=torch.long)
+    style = torch.zeros((1, 256), dtype=torch.float32)
+    speed = torch.ones(1, dtype=torch.float32)
+    logger.info(f"Exportando Kokoro para ONNX: {output_path}")
+    torch.onnx.export(
+        model, (input_ids, style, speed), output_path,
+        input_names=['input_ids', 'style', 'speed'],
+        output_names=['waveform', 'duration'],
+        dynamic_axes={'input_ids': {1: 'tokens'}, 'waveform': {0: 'samples'}, 'duration': {0: 'tokens'}},
+        opset_version=17,
+    )
+
+
+def quantize(input_path: str, output_path: str) -> None:
+    """Quantização dinâmica int8 dos pesos (MatMul/Gemm/LSTM...)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    logger.info(f"Quantizando para int8: {output_path}")
+    quantize_dynamic(input_path, output_path, weight_type=QuantType.QUInt8)
+    before = os.path.getsize(input_path) / (1024 * 1024)
+    after = os.path.getsize(output_path) / (1024 * 1024)
+    logger.success(f"Modelo int8: {before:.0f} MB → {after:.0f} MB")
+
+
+def pack_voices(names: list[str], model_dir: str) -> None:
+    """Empacota as vozes (.pt do repositório) em voices.npy + kokoro_onnx.json."""
+    import torch
+    from huggingface_hub import hf_hub_download
+
+    packs = []
+    for name in names:
+        path = hf_hub_download(repo_id=config.TTS_KOKORO_MODEL, filename=f'voices/{name}.pt')
+        pack = torch.load(path, weights_only=True).float().numpy()
+        packs.append(pack.reshape(pack.shape[0], -1))  # [510, 1, 256] → [510, 256]
+    np.save(os.path.join(model_dir, VOICES_FILE), np.stack(packs).astype(np.float32))
+
+    with open(hf_hub_download(repo_id=config.TTS_KOKORO_MODEL, filename='config.json'), encoding='utf-8') as f:
+        vocab = json.load(f)['vocab']
+    meta = {'voices': names, 'vocab': vocab, 'sample_rate': config.TTS_SAMPLE_RATE}
+    with open(os.path.join(model_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    logger.success(f"{len(names)} voz(es) empacotada(s) em {VOICES_FILE}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prepara o Kokoro para ONNX Runtime (int8)")
+    parser.add_argument('step', choices=['build', 'export', 'quantize', 'pack'],
+                        help="build = export + quantize + pack")
+    parser.add_argument('--voices', nargs='+', default=list(config.parse_voice_config(config.TTS_VOICE)),
+                        help="Vozes a empacotar (padrão: as de TTS_VOICE)")
+    parser.add_argument('--dir', default=onnx_dir(), help="Pasta de saída (padrão: KOKORO_ONNX_DIR)")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    float_path = os.path.join(args.dir, FLOAT_MODEL_FILE)
+    if args.step in ('build', 'export'):
+        export_onnx(float_path)
+    if args.step in ('build', 'quantize'):
+        quantize(float_path, os.path.join(args.dir, config.KOKORO_ONNX_MODEL))
+    if args.step in ('build', 'pack'):
+        pack_voices(args.voices, args.dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Mascaramento de latência — som de confirmação e frases de espera.
+
+Entre o fim da fala do usuário e o primeiro áudio da resposta há etapas
+demoradas (transcrição, classificação de intenção, consulta ao sistema,
+busca na web, LLM). Para não ficar em silêncio:
+
+    • earcon — um "plim" curto gerado numericamente toca assim que o
+      usuário termina de falar (sem arquivo, sem síntese)
+    • frase de espera — se a etapa for demorar (pela média móvel das
+      execuções anteriores) ou já estiver demorando além do limite, toca
+      uma frase pré-sintetizada ("Deixa eu pesquisar."), vinda do cache
+    • cancel() — quando o áudio de verdade fica pronto, a frase pendente é
+      cancelada (e a que estiver tocando é cortada com fade)
+
+Uso:
+    from latency_mask import LatencyMasker
+
+    masker = LatencyMasker(player, tts)
+    masker.begin_turn()              # fim da fala: earcon
+    with masker.stage('search'):
+        resultados = search_web(texto)
+    masker.cancel()                  # antes de tocar a resposta
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import numpy as np
+
+import config
+from log import logger
+
+if TYPE_CHECKING:
+    from audio_player import AudioPlayer
+    from tts_engine import TTSManager
+
+
+def make_earcon(sample_rate: int, volume: Optional[float] = None) -> np.ndarray:
+    """Dois tons curtos ascendentes (quinta justa) com envelope suave."""
+    volume = config.LATENCY_EARCON_VOLUME if volume is None else volume
+    tone_samples = int(0.06 * sample_rate)
+    t = np.arange(tone_samples) / sample_rate
+    # Ataque de 5 ms e decaimento exponencial: sem clique nas bordas
+    envelope = np.minimum(1.0, t / 0.005) * np.exp(-t * 40.0)
+    tones = [np.sin(2 * np.pi * freq * t) * envelope for freq in (880.0, 1320.0)]
+    gap = np.zeros(int(0.02 * sample_rate))
+    return (np.concatenate([tones[0], gap, tones[1]]) * volume).astype(np.float32)
+
+
+class StageLatencyPredictor:
+    """Média móvel exponencial da duração de cada etapa (segundos)."""
+
+    def __init__(self, alpha: Optional[float] = None) -> None:
+        self.alpha: float = alpha if alpha is not None else config.LATENCY_EMA_ALPHA
+        self._estimates: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def predict(self, stage: str) -> Optional[float]:
+        """Duração esperada da etapa (None se nunca foi observada)."""
+        with self._lock:
+            return self._estimates.get(stage)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            previous = self._estimates.get(stage)
+            self._estimates[stage] = seconds if previous is None else (
+                self.alpha * seconds + (1 - self.alpha) * previous
+            )
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {'ema_seconds': value, 'count': self._counts[stage]}
+                for stage, value in self._estimates.items()
+            }
+
+
+class LatencyMasker:
+    """Toca earcon e frases de espera enquanto a resposta não fica pronta.
+
+    Args:
+        player: Reprodutor onde o earcon e as frases são enfileirados.
+        tts: Motor de TTS (as frases de espera vêm do cache dele).
+        predictor: Estimador de duração das etapas.
+    """
+
+    def __init__(
+        self,
+        player: AudioPlayer,
+        tts: TTSManager,
+        predictor: Optional[StageLatencyPredictor] = None,
+    ) -> None:
+        self.player = player
+        self.tts = tts
+        self.predictor: StageLatencyPredictor = predictor or StageLatencyPredictor()
+        self.enabled: bool = config.LATENCY_MASK_ENABLE
+        self._earcon: np.ndarray = make_earcon(tts.sample_rate)
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._filler_used: bool = False    # uma frase de espera por interação
+        self._filler_playing: bool = False
+        self._cancelled: bool = False
+
+    def begin_turn(self) -> None:
+        """Fim da fala do usuário: toca o earcon e rearma as frases de espera."""
+        with self._lock:
+            self._filler_used = False
+            self._filler_playing = False
+            self._cancelled = False
+        if self.enabled and config.LATENCY_EARCON_ENABLE and not self.player.is_playing:
+            self.player.enqueue(self._earcon, self.tts.sample_rate)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mede a etapa e, se ela demorar, toca a frase de espera dela."""
+        filler = config.LATENCY_FILLERS.get(name) if self.enabled else None
+        if filler:
+            predicted = self.predictor.predict(name)
+            threshold = config.LATENCY_FILLER_AFTER
+            if predicted is not None and predicted >= threshold:
+                self._play_filler(filler)  # já se sabe que vai demorar
+            else:
+                self._arm(filler, threshold)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._disarm()
+            elapsed = time.perf_counter() - start
+            self.predictor.observe(name, elapsed)
+            logger.debug(f"Etapa {name}: {elapsed:.2f}s")
+
+    def cancel(self) -> None:
+        """O áudio da resposta está pronto: cancela (ou corta) a frase de espera."""
+        with self._lock:
+            self._cancelled = True
+            cut = self._filler_playing and config.LATENCY_FILLER_CUT
+            self._filler_playing = False
+        self._disarm()
+        if cut and self.player.is_playing:
+            self.player.flush()
+
+    # ------------------------------------------------------------------
+    # Interno
+    # ------------------------------------------------------------------
+
+    def _arm(self, filler: str, delay: float) -> None:
+        self._disarm()
+        timer = threading.Timer(delay, self._play_filler, args=(filler,))
+        timer.daemon = True
+        with self._lock:
+            self._timer = timer
+        timer.start()
+
+    def _disarm(self) -> None:
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _play_filler(self, filler: str) -> None:
+        with self._lock:
+            if self._filler_used or self._cancelled:
+                return
+            self._filler_used = True
+        audio = self.tts.cached(filler)
+        if audio is None:
+            logger.debug(f"Frase de espera fora do cache: {filler}")
+            return
+        with self._lock:
+            if self._cancelled:
+                return
+            self._filler_playing = True
+        logger.debug(f"Frase de espera: {filler}")
+        self.player.enqueue(audio, self.tts.sample_rate)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Lip-sync do avatar a partir do áudio do TTS.
+
+Em vez de abrir e fechar a boca num ritmo fixo, a abertura da boca segue o
+volume da fala: o envelope RMS do áudio é calculado (vetorizado) na taxa
+de quadros do avatar e guardado como um array compacto (uint8 por quadro).
+Na renderização, o quadro atual é uma consulta O(1) pela posição de
+reprodução — que vem do relógio do AudioPlayer e para se o áudio travar.
+
+Uso:
+    from lipsync import LipSyncTimeline
+
+    timeline = LipSyncTimeline()
+    timeline.extend(pcm, 24000)               # a cada pedaço do TTS
+    abertura = timeline.level_at(posicao)     # 0..255
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+import config
+
+
+def mouth_envelope(audio: np.ndarray, sample_rate: int, fps: Optional[int] = None) -> np.ndarray:
+    """Abertura da boca por quadro (uint8, 0 = fechada, 255 = aberta)."""
+    fps = fps or config.LIPSYNC_FPS
+    hop = max(1, sample_rate // fps)
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    if not audio.size:
+        return np.zeros(0, dtype=np.uint8)
+    padded = np.pad(audio, (0, (-len(audio)) % hop))
+    rms = np.sqrt(np.mean(padded.reshape(-1, hop) ** 2, axis=1))
+    # Escala em dB entre o piso (boca fechada) e o pico (boca toda aberta)
+    db = 20.0 * np.log10(rms + 1e-9)
+    level = np.clip(
+        (db - config.LIPSYNC_FLOOR_DB) / (config.LIPSYNC_PEAK_DB - config.LIPSYNC_FLOOR_DB), 0.0, 1.0
+    )
+    # Fechamento mais lento que a abertura (evita tremer entre sílabas)
+    level[1:] = np.maximum(level[1:], level[:-1] * 0.6)
+    return (level * 255).astype(np.uint8)
+
+
+class LipSyncTimeline:
+    """Abertura da boca quadro a quadro da resposta que está tocando.
+
+    O áudio chega em pedaços (streaming); as amostras que não completam um
+    quadro ficam guardadas para o próximo pedaço, então a linha do tempo
+    não escorrega em relação ao áudio.
+    """
+
+    def __init__(self, fps: Optional[int] = None) -> None:
+        self.fps: int = fps or config.LIPSYNC_FPS
+        self.reset()
+
+    def reset(self) -> None:
+        self.frames: np.ndarray = np.zeros(0, dtype=np.uint8)
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._sample_rate: int = 0
+
+    def extend(self, audio: np.ndarray, sample_rate: int) -> None:
+        """Acrescenta os quadros do próximo pedaço de áudio."""
+        if sample_rate != self._sample_rate:
+            self._carry = np.zeros(0, dtype=np.float32)
+            self._sample_rate = sample_rate
+        hop = max(1, sample_rate // self.fps)
+        audio = np.concatenate([self._carry, np.asarray(audio, dtype=np.float32).reshape(-1)])
+        usable = len(audio) - len(audio) % hop
+        self._carry = audio[usable:]
+        if usable:
+            # Reatribuição (não in-place): quem está lendo vê o array antigo inteiro
+            self.frames = np.concatenate([self.frames, mouth_envelope(audio[:usable], sample_rate, self.fps)])
+
+    def level_at(self, position: float) -> int:
+        """Abertura no instante position (segundos desde o início da resposta)."""
+        frames = self.frames
+        index = int(position * self.fps)
+        return int(frames[index]) if 0 <= index < len(frames) else 0
+
+    @property
+    def duration(self) -> float:
+        return len(self.frames) / self.fps
@@ -11,14 +11,25 @@ Uso:
     response = client.chat([{'role': 'user', 'content': 'Olá!'}])
     print(response.message.content)           # Texto da resposta
     print(response.message.thinking or '')    # Thinking (apenas Ollama)
+
+    # Saída restrita: um rótulo ou JSON no esquema (gramática/format no servidor)
+    label = client.classify(messages, ['COMANDO', 'PERGUNTA'])
+    data = client.chat_json(messages, {'type': 'object', ...})
+
+    # Cancelável (barge-in): em streaming, fechando a conexão ao cancelar
+    response = client.chat(messages, cancel=token)
 """
 
 from __future__ import annotations
 
+import inspect
+import json
 import time
 import logging
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Optional
+
+from cancellation import CancelToken
 
 logger = logging.getLogger(__name__)
 
@@ -179,25 +190,82 @@ class LLMClient:
     # Chat
     # ------------------------------------------------------------------
 
-    def chat(self, messages: list[dict]) -> LLMResponse:
-        """Envia mensagens para o modelo e retorna a resposta."""
+    def chat(self, messages: list[dict], cancel: Optional[CancelToken] = None) -> LLMResponse:
+        """Envia mensagens para o modelo e retorna a resposta.
+
+        Com cancel, a resposta vem em streaming e o cancelamento fecha a
+        conexão (o servidor para de gerar e libera o slot); levanta Cancelled.
+        """
+        return self._chat(messages, cancel)
+
+    def _chat(
+        self,
+        messages: list[dict],
+        cancel: Optional[CancelToken] = None,
+        options: Optional[dict] = None,
+    ) -> LLMResponse:
+        """chat() com opções de geração (max_tokens, temperature, schema, grammar)."""
         self._ensure_backend()
 
+        if cancel is not None:
+            return self._chat_cancellable(messages, cancel, options)
         if self.provider == 'ollama':
-            return self._chat_ollama(messages)
+            return self._chat_ollama(messages, options)
         else:
             # LM Studio e llama.cpp usam a mesma API OpenAI-compatible
-            return self._chat_lm_studio(messages)
-
-    def _chat_ollama(self, messages: list[dict]) -> LLMResponse:
+            return self._chat_lm_studio(messages, options)
+
+    def _ollama_kwargs(self, options: Optional[dict]) -> dict:
+        """Argumentos do ollama.chat (opções de amostragem + format)."""
+        options = options or {}
+        kwargs: dict[str, Any] = {
+            'options': {
+                'temperature': options.get('temperature', self.temperature),
+                'num_predict': options.get('max_tokens', self.max_tokens),
+            },
+        }
+        if 'schema' in options:
+            kwargs['format'] = options['schema']
+        return kwargs
+
+    def _openai_body(self, options: Optional[dict]) -> dict:
+        """Campos do corpo /v1/chat/completions (restrições por servidor).
+
+        llama.cpp aceita a gramática GBNF ('grammar') e o esquema JSON
+        ('json_schema') direto no corpo; o LM Studio usa o response_format
+        de saída estruturada da OpenAI.
+        """
+        options = options or {}
+        body: dict[str, Any] = {
+            'temperature': options.get('temperature', self.temperature),
+            'max_tokens': options.get('max_tokens', self.max_tokens),
+        }
+        if self.provider == 'llamacpp':
+            if 'grammar' in options:
+                body['grammar'] = options['grammar']
+            elif 'schema' in options:
+                body['json_schema'] = options['schema']
+        elif 'schema' in options:
+            body['response_format'] = {
+                'type': 'json_schema',
+                'json_schema': {'name': 'resposta', 'strict': True, 'schema': options['schema']},
+            }
+        return body
+
+    def _openai_kwargs(self, options: Optional[dict]) -> dict:
+        """_openai_body() no formato da openai library (extras em extra_body)."""
+        body = self._openai_body(options)
+        extra = {k: body.pop(k) for k in ('grammar', 'json_schema') if k in body}
+        if extra:
+            body['extra_body'] = extra
+        return body
+
+    def _chat_ollama(self, messages: list[dict], options: Optional[dict] = None) -> LLMResponse:
         try:
             response = self._backend.chat(
                 model=self.model,
                 messages=messages,
-                options={
-                    'temperature': self.temperature,
-                    'num_predict': self.max_tokens,
-                },
+                **self._ollama_kwargs(options),
             )
             msg = response.message
             return LLMResponse(
@@ -209,19 +277,18 @@ class LLMClient:
         except Exception as e:
             raise LLMError(f"Erro no Ollama: {e}")
 
-    def _chat_lm_studio(self, messages: list[dict]) -> LLMResponse:
+    def _chat_lm_studio(self, messages: list[dict], options: Optional[dict] = None) -> LLMResponse:
         if getattr(self._backend, '_is_openai', False):
-            return self._chat_lm_studio_openai(messages)
+            return self._chat_lm_studio_openai(messages, options)
         else:
-            return self._chat_lm_studio_requests(messages)
+            return self._chat_lm_studio_requests(messages, options)
 
-    def _chat_lm_studio_openai(self, messages: list[dict]) -> LLMResponse:
+    def _chat_lm_studio_openai(self, messages: list[dict], options: Optional[dict] = None) -> LLMResponse:
         try:
             response = self._backend.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
+                **self._openai_kwargs(options),
             )
             choice = response.choices[0]
             content = choice.message.content or ''
@@ -231,7 +298,7 @@ class LLMClient:
         except Exception as e:
             raise LLMError(f"Erro no LM Studio (OpenAI): {e}")
 
-    def _chat_lm_studio_requests(self, messages: list[dict]) -> LLMResponse:
+    def _chat_lm_studio_requests(self, messages: list[dict], options: Optional[dict] = None) -> LLMResponse:
         try:
             base_url = self.llamacpp_base if self.provider == 'llamacpp' else self.lm_studio_base
             resp = self._backend.post(
@@ -239,8 +306,7 @@ class LLMClient:
                 json={
                     'model': self.model,
                     'messages': messages,
-                    'temperature': self.temperature,
-                    'max_tokens': self.max_tokens,
+                    **self._openai_body(options),
                 },
                 timeout=self.request_timeout,
             )
@@ -253,23 +319,76 @@ class LLMClient:
         except Exception as e:
             raise LLMError(f"Erro no LM Studio (requests): {e}")
 
+    def _chat_cancellable(
+        self, messages: list[dict], cancel: CancelToken, options: Optional[dict] = None
+    ) -> LLMResponse:
+        """Chat em streaming, conferindo o token a cada pedaço da resposta."""
+        cancel.raise_if_cancelled()
+        content: list[str] = []
+        thinking: list[str] = []
+        stream = None
+        remove = lambda: None
+        try:
+            stream = self._open_stream(messages, options)
+            # openai/requests: fechar a resposta de outra thread corta até a
+            # espera do prompt; o gerador do Ollama só pode ser fechado aqui
+            if not inspect.isgenerator(stream):
+                remove = cancel.on_cancel(stream.close)
+            for chunk in stream:
+                if cancel.cancelled:
+                    break
+                text, think = self._stream_delta(chunk)
+                if text:
+                    content.append(text)
+                if think:
+                    thinking.append(think)
+        except Exception as e:
+            if not cancel.cancelled:
+                raise LLMError(f"Erro no streaming ({self.provider}): {e}")
+        finally:
+            remove()
+            if stream is not None and hasattr(stream, 'close'):
+                try:
+                    stream.close()  # desconecta: o servidor interrompe a geração
+                except Exception:
+                    pass
+        cancel.raise_if_cancelled()
+        return LLMResponse(
+            message=LLMMessage(content=''.join(content), thinking=''.join(thinking) or None)
+        )
+
+    @staticmethod
+    def _stream_delta(chunk: Any) -> tuple[str, str]:
+        """(texto, thinking) de um pedaço do stream (Ollama, openai ou requests)."""
+        if isinstance(chunk, dict):
+            if 'choices' in chunk:
+                delta = chunk['choices'][0].get('delta') or {}
+                return delta.get('content') or '', ''
+            msg = chunk.get('message') or {}
+            return msg.get('content') or '', msg.get('thinking') or ''
+        if hasattr(chunk, 'choices'):
+            if not chunk.choices:
+                return '', ''
+            return chunk.choices[0].delta.content or '', ''
+        msg = chunk.message
+        return getattr(msg, 'content', '') or '', getattr(msg, 'thinking', None) or ''
+
     # ------------------------------------------------------------------
-    # Chat com streaming (para uso futuro)
+    # Chat com streaming
     # ------------------------------------------------------------------
 
     def chat_stream(self, messages: list[dict]):
-        """Versão streaming (apenas Ollama, LM Studio e llama.cpp via openai library)."""
+        """Versão streaming (Ollama, LM Studio e llama.cpp)."""
         self._ensure_backend()
+        return self._open_stream(messages)
 
+    def _open_stream(self, messages: list[dict], options: Optional[dict] = None):
         if self.provider == 'ollama':
             return self._backend.chat(
                 model=self.model,
                 messages=messages,
                 stream=True,
-                options={
-                    'temperature': self.temperature,
-                    'num_predict': self.max_tokens,
-                },
+                **self._ollama_kwargs(options),
             )
         else:
             # LM Studio e llama.cpp via OpenAI library suportam streaming
@@ -277,12 +396,78 @@ class LLMClient:
                 stream = self._backend.chat.completions.create(
                     model=self.model,
                     messages=messages,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
                     stream=True,
+                    **self._openai_kwargs(options),
                 )
                 return stream
-            raise LLMError("LM Studio/llama.cpp via requests não suporta streaming")
+            return _SSEStream(self._stream_requests(messages, options))
+
+    def _stream_requests(self, messages: list[dict], options: Optional[dict] = None):
+        """Resposta HTTP em streaming (SSE) via requests."""
+        base_url = self.llamacpp_base if self.provider == 'llamacpp' else self.lm_studio_base
+        resp = self._backend.post(
+            f"{base_url}/v1/chat/completions",
+            json={
+                'model': self.model,
+                'messages': messages,
+                'stream': True,
+                **self._openai_body(options),
+            },
+            timeout=self.request_timeout,
+            stream=True,
+        )
+        resp.raise_for_status()
+        return resp
+
+    # ------------------------------------------------------------------
+    # Saídas restritas (classificação e JSON)
+    # ------------------------------------------------------------------
+
+    def classify(
+        self,
+        messages: list[dict],
+        labels: list[str],
+        cancel: Optional[CancelToken] = None,
+        max_tokens: int = 16,
+    ) -> str:
+        """Classifica em um dos rótulos — o modelo só consegue gerar um deles.
+
+        llama.cpp recebe uma gramática GBNF com as alternativas (a resposta
+        é o próprio rótulo); Ollama e LM Studio recebem um esquema JSON com
+        enum. Poucos tokens gerados e nada de procurar palavra na resposta.
+        Levanta LLMError se a resposta não for um dos rótulos.
+        """
+        if self.provider == 'llamacpp':
+            options = {'grammar': labels_grammar(labels), 'max_tokens': max_tokens, 'temperature': 0.0}
+            label: Any = self._chat(messages, cancel, options).message.content.strip()
+        else:
+            schema = {
+                'type': 'object',
+                'properties': {'label': {'type': 'string', 'enum': list(labels)}},
+                'required': ['label'],
+                'additionalProperties': False,
+            }
+            data = self.chat_json(messages, schema, cancel, max_tokens)
+            label = data.get('label') if isinstance(data, dict) else None
+        if label not in labels:
+            raise LLMError(f"Rótulo fora das opções: {label!r}")
+        return label
+
+    def chat_json(
+        self,
+        messages: list[dict],
+        schema: dict,
+        cancel: Optional[CancelToken] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Any:
+        """Resposta restrita ao esquema JSON (json_schema no llama.cpp,
+        format no Ollama, response_format no LM Studio), já decodificada."""
+        options = {'schema': schema, 'max_tokens': max_tokens or self.max_tokens, 'temperature': 0.0}
+        content = self._chat(messages, cancel, options).message.content
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise LLMError(f"Resposta fora do esquema JSON: {e}")
 
     # ------------------------------------------------------------------
     # Verificação de disponibilidade
@@ -322,3 +507,33 @@ class LLMClient:
                 return resp.status_code == 200
             except Exception:
                 return False
+
+
+def labels_grammar(labels: list[str]) -> str:
+    """Gramática GBNF que só aceita um dos rótulos (ex: root ::= "SIM" | "NÃO")."""
+    def literal(label: str) -> str:
+        return '"' + label.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return 'root ::= ' + ' | '.join(literal(label) for label in labels)
+
+
+class _SSEStream:
+    """Itera os eventos "data: {...}" de uma resposta requests em streaming."""
+
+    def __init__(self, response: Any) -> None:
+        self.response = response
+
+    def __iter__(self):
+        for line in self.response.iter_lines():
+            if not line:
+                continue
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', 'replace')
+            if not line.startswith('data:'):
+                continue
+            data = line[5:].strip()
+            if data == '[DONE]':
+                return
+            yield json.loads(data)
+
+    def close(self) -> None:
+        self.response.close()
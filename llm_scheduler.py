@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Fila de pedidos ao LLM — prioridades, slots do servidor e preempção.
+
+O servidor local (llama-server no Pi) atende um pedido por vez. Sem fila,
+a extração de memória do turno anterior pode estar ocupando o slot quando
+a próxima pergunta chega, e a resposta espera a extração inteira. Aqui:
+
+    • cada pedido tem uma classe ('intent', 'reply', 'memory'...) com
+      prioridade (LLM_PRIORITIES); no máximo `slots` rodam ao mesmo tempo
+      e o slot livre vai para o pedido mais urgente (empate: o mais antigo)
+    • segundo plano (prioridade >= LLM_BACKGROUND_PRIORITY) só começa sem
+      pedido de primeiro plano esperando ou rodando e sem turno a caminho
+      (foreground_busy)
+    • um pedido de primeiro plano que encontra o slot ocupado por segundo
+      plano interrompe esse pedido (o stream é fechado e o servidor libera
+      o slot); o pedido interrompido volta para a fila e é refeito depois
+    • métricas por classe: espera e tempo total (p50/p95), interrupções
+
+Uso:
+    from llm_scheduler import LLMScheduler
+
+    llm = LLMScheduler(client, slots=1)
+    response = llm.chat(messages, kind='reply', cancel=token)
+    label = llm.classify(messages, ['COMANDO', 'PERGUNTA'], kind='intent')
+    llm.chat(messages, kind='memory')        # segundo plano
+    llm.preempt_background()                 # turno novo a caminho
+    print(llm.stats())
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import numpy as np
+
+import config
+from cancellation import CancelToken, Cancelled
+from llm_client import LLMError
+from log import logger
+
+if TYPE_CHECKING:
+    from llm_client import LLMClient, LLMResponse
+
+
+class _Request:
+    """Pedido na fila (ou rodando) — o token interno permite a preempção."""
+
+    __slots__ = ('kind', 'priority', 'seq', 'background', 'token', 'preempted')
+
+    def __init__(self, kind: str, priority: int, seq: int, background: bool) -> None:
+        self.kind = kind
+        self.priority = priority
+        self.seq = seq
+        self.background = background
+        self.token: CancelToken = CancelToken()
+        self.preempted: bool = False
+
+    def __lt__(self, other: _Request) -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _KindStats:
+    """Métricas de uma classe de pedido (últimas `history` medidas)."""
+
+    def __init__(self, history: int) -> None:
+        self.count: int = 0
+        self.errors: int = 0
+        self.cancelled: int = 0
+        self.preempted: int = 0
+        self.waits: deque[float] = deque(maxlen=history)
+        self.totals: deque[float] = deque(maxlen=history)
+
+    def summary(self) -> dict[str, float]:
+        waits = np.asarray(self.waits) if self.waits else np.zeros(1)
+        totals = np.asarray(self.totals) if self.totals else np.zeros(1)
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'cancelled': self.cancelled,
+            'preempted': self.preempted,
+            'wait_p50_ms': float(np.percentile(waits, 50)) * 1000,
+            'wait_p95_ms': float(np.percentile(waits, 95)) * 1000,
+            'total_p50_ms': float(np.percentile(totals, 50)) * 1000,
+            'total_p95_ms': float(np.percentile(totals, 95)) * 1000,
+        }
+
+
+class LLMScheduler:
+    """Despacha os pedidos ao LLMClient por prioridade, em até `slots` por vez.
+
+    Args:
+        client: Cliente do provedor LLM (None = sem provedor: todo pedido
+            levanta LLMError e o app segue degradado).
+        slots: Pedidos simultâneos (slots do servidor).
+        foreground_busy: Chamado pelos pedidos de segundo plano; True adia
+            o início (ex: há um turno entre o STT e o LLM).
+        busy_poll: Intervalo (s) em que o segundo plano adiado reconfere
+            foreground_busy.
+        history: Medidas guardadas por classe para os percentis.
+    """
+
+    def __init__(
+        self,
+        client: Optional[LLMClient],
+        slots: int = 1,
+        foreground_busy: Optional[Callable[[], bool]] = None,
+        busy_poll: float = 0.2,
+        history: int = 200,
+    ) -> None:
+        self.client = client
+        self.slots = max(1, slots)
+        self.foreground_busy = foreground_busy
+        self.busy_poll = busy_poll
+        self.history = history
+        self._waiting: list[_Request] = []      # heap por (prioridade, chegada)
+        self._running: list[_Request] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stats: dict[str, _KindStats] = {}
+
+    # ------------------------------------------------------------------
+    # Pedidos
+    # ------------------------------------------------------------------
+
+    def chat(
+        self,
+        messages: list[dict],
+        kind: str = 'reply',
+        cancel: Optional[CancelToken] = None,
+    ) -> LLMResponse:
+        """Envia o pedido quando houver slot para a sua prioridade.
+
+        Levanta Cancelled se cancel for cancelado (na fila ou rodando) e
+        LLMError nos erros do provedor. Interrompido por preempção, o
+        pedido de segundo plano é refeito sem o chamador perceber.
+        """
+        return self._dispatch(lambda token: self.client.chat(messages, cancel=token), kind, cancel)
+
+    def classify(
+        self,
+        messages: list[dict],
+        labels: list[str],
+        kind: str = 'intent',
+        cancel: Optional[CancelToken] = None,
+        max_tokens: int = 16,
+    ) -> str:
+        """LLMClient.classify() pela fila."""
+        return self._dispatch(
+            lambda token: self.client.classify(messages, labels, cancel=token, max_tokens=max_tokens),
+            kind,
+            cancel,
+        )
+
+    def chat_json(
+        self,
+        messages: list[dict],
+        schema: dict,
+        kind: str = 'reply',
+        cancel: Optional[CancelToken] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Any:
+        """LLMClient.chat_json() pela fila."""
+        return self._dispatch(
+            lambda token: self.client.chat_json(messages, schema, cancel=token, max_tokens=max_tokens),
+            kind,
+            cancel,
+        )
+
+    def _dispatch(
+        self,
+        call: Callable[[Optional[CancelToken]], Any],
+        kind: str,
+        cancel: Optional[CancelToken],
+    ) -> Any:
+        """Roda call(token) com um slot; refaz se for interrompido por preempção."""
+        if self.client is None:
+            raise LLMError("Nenhum provedor LLM disponível")
+        priority = config.LLM_PRIORITIES.get(kind, 0)
+        background = priority >= config.LLM_BACKGROUND_PRIORITY
+        stats = self._kind_stats(kind)
+        seq = next(self._seq)  # mantém o lugar na fila quando é refeito
+        arrived = time.perf_counter()
+
+        while True:
+            request = _Request(kind, priority, seq, background)
+            unlink = cancel.on_cancel(request.token.cancel) if cancel is not None else (lambda: None)
+            try:
+                self._acquire(request)
+                started = time.perf_counter()
+                try:
+                    # Segundo plano sempre cancelável (preempção); primeiro
+                    # plano só se o chamador passou um token
+                    token = request.token if background or cancel is not None else None
+                    response = call(token)
+                finally:
+                    self._release(request)
+            except Cancelled:
+                if request.preempted and not (cancel is not None and cancel.cancelled):
+                    with self._cond:
+                        stats.preempted += 1
+                    logger.debug(f"Pedido '{kind}' interrompido por primeiro plano — volta para a fila")
+                    continue
+                with self._cond:
+                    stats.cancelled += 1
+                raise
+            except Exception:
+                with self._cond:
+                    stats.errors += 1
+                raise
+            finally:
+                unlink()
+
+            finished = time.perf_counter()
+            with self._cond:
+                stats.count += 1
+                stats.waits.append(started - arrived)
+                stats.totals.append(finished - arrived)
+            return response
+
+    def preempt_background(self) -> int:
+        """Interrompe os pedidos de segundo plano rodando (serão refeitos)."""
+        with self._cond:
+            return self._preempt(len(self._running))
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    def _acquire(self, request: _Request) -> None:
+        """Espera a vez do pedido (levanta Cancelled se cancelado na fila)."""
+        unlink = request.token.on_cancel(self._wake)
+        try:
+            with self._cond:
+                heapq.heappush(self._waiting, request)
+                if not request.background and len(self._running) >= self.slots:
+                    self._preempt(1)
+                while not self._can_start(request):
+                    if request.token.cancelled:
+                        self._waiting.remove(request)
+                        heapq.heapify(self._waiting)
+                        self._cond.notify_all()
+                        raise Cancelled()
+                    # Segundo plano adiado por turno a caminho: reconfere de tempos em tempos
+                    poll = self.busy_poll if request.background and self.foreground_busy else None
+                    self._cond.wait(poll)
+                heapq.heappop(self._waiting)
+                self._running.append(request)
+        finally:
+            unlink()
+
+    def _can_start(self, request: _Request) -> bool:
+        if request.token.cancelled or len(self._running) >= self.slots:
+            return False
+        if self._waiting[0] is not request:
+            return False
+        if request.background:
+            if any(not r.background for r in self._running):
+                return False
+            if self.foreground_busy is not None and self.foreground_busy():
+                return False
+        return True
+
+    def _release(self, request: _Request) -> None:
+        with self._cond:
+            self._running.remove(request)
+            self._cond.notify_all()
+
+    def _preempt(self, count: int) -> int:
+        """Cancela até count pedidos de segundo plano rodando (com o lock)."""
+        victims = [r for r in self._running if r.background and not r.preempted][:count]
+        for request in victims:
+            request.preempted = True
+            request.token.cancel()  # fecha o stream: o servidor libera o slot
+        return len(victims)
+
+    def _wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+
+    def _kind_stats(self, kind: str) -> _KindStats:
+        with self._cond:
+            if kind not in self._stats:
+                self._stats[kind] = _KindStats(self.history)
+            return self._stats[kind]
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._cond:
+            return {kind: s.summary() for kind, s in self._stats.items()}
+
+    def log_stats(self) -> None:
+        for kind, s in self.stats().items():
+            logger.info(
+                f"LLM '{kind}': {s['count']} pedidos, espera p50/p95 "
+                f"{s['wait_p50_ms']:.0f}/{s['wait_p95_ms']:.0f} ms, total p50/p95 "
+                f"{s['total_p50_ms']:.0f}/{s['total_p95_ms']:.0f} ms, "
+                f"{s['preempted']} interrompidos, {s['cancelled']} cancelados, {s['errors']} erros"
+            )
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Extração de memória em segundo plano — várias interações por pedido ao LLM.
+
+Antes, cada resposta era seguida de uma chamada síncrona ao LLM com o
+prompt de extração: a conversa esperava, e o servidor ficava ocupado
+justamente quando o usuário costuma voltar a falar. Aqui:
+
+    • add_turn() só guarda a interação (usuário + resposta)
+    • a thread de extração espera juntar MEMORY_EXTRACTION_BATCH_TURNS
+      interações e o pipeline ficar ocioso por MEMORY_EXTRACTION_IDLE_SECONDS
+      (ou flush(), ex: a assistente foi dormir)
+    • as interações vão num pedido só ao LLM (classe 'memory', segundo
+      plano na fila do LLM), com a saída restrita ao JSON de
+      EXTRACTION_SCHEMA, e o resultado entra por MemoryManager.apply_facts
+
+Uso:
+    from memory_extractor import MemoryExtractor
+
+    extractor = MemoryExtractor(memory, llm_queue, is_idle=lambda: True)
+    extractor.start()
+    extractor.add_turn("Meu time é o Grêmio", "Que legal!")
+    extractor.flush()       # extrair já o que estiver pendente
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Optional
+
+import config
+from cancellation import CancelToken, Cancelled
+from log import logger
+from memory_manager import EXTRACTION_SCHEMA, MemoryManager
+
+if TYPE_CHECKING:
+    from llm_scheduler import LLMScheduler
+
+
+class MemoryExtractor:
+    """Fila de interações e thread que extrai memórias em lote.
+
+    Args:
+        memory: Onde os fatos extraídos são gravados.
+        llm: Fila de pedidos ao LLM.
+        is_idle: True quando não há turno em andamento (nem fala da IA).
+    """
+
+    def __init__(
+        self,
+        memory: MemoryManager,
+        llm: LLMScheduler,
+        is_idle: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.memory = memory
+        self.llm = llm
+        self.is_idle = is_idle or (lambda: True)
+        self.batch_turns = max(1, config.MEMORY_EXTRACTION_BATCH_TURNS)
+        self.idle_seconds = config.MEMORY_EXTRACTION_IDLE_SECONDS
+        self._pending: deque[tuple[str, str]] = deque(maxlen=config.MEMORY_EXTRACTION_MAX_PENDING)
+        self._last_turn: float = 0.0
+        self._flush: bool = False
+        self._running: bool = False
+        self._cancel: Optional[CancelToken] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.extractions: int = 0
+
+    def start(self) -> None:
+        if not config.MEMORY_EXTRACTION_ENABLE or self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='memory-extractor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Encerra a thread (a extração em andamento é cancelada)."""
+        with self._cond:
+            self._running = False
+            cancel = self._cancel
+            self._cond.notify()
+        if cancel is not None:
+            cancel.cancel()
+        if self._pending:
+            logger.debug(f"{len(self._pending)} interação(ões) sem extração de memória ao encerrar")
+
+    def add_turn(self, user_text: str, reply: str) -> None:
+        """Guarda uma interação para a próxima extração."""
+        if not config.MEMORY_EXTRACTION_ENABLE:
+            return
+        with self._cond:
+            self._pending.append((user_text, reply))
+            self._last_turn = time.monotonic()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """Extrai o que estiver pendente assim que possível (sem esperar o lote)."""
+        with self._cond:
+            if self._pending:
+                self._flush = True
+                self._cond.notify()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Thread de extração
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running:
+                    delay = self._seconds_until_due()
+                    if delay is not None and delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if not self._running:
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+                self._flush = False
+                self._cancel = CancelToken()
+                cancel = self._cancel
+            try:
+                self._extract(batch, cancel)
+            finally:
+                with self._cond:
+                    self._cancel = None
+
+    def _seconds_until_due(self) -> Optional[float]:
+        """0 = extrair agora; None = esperar nova interação ou flush()."""
+        if not self._pending:
+            return None
+        if not self._flush and len(self._pending) < self.batch_turns:
+            return None
+        if self._flush:
+            return 0.0
+        remaining = self._last_turn + self.idle_seconds - time.monotonic()
+        if remaining > 0:
+            return remaining
+        # Prazo vencido mas com turno em andamento: confere de novo depois
+        return 0.0 if self.is_idle() else self.idle_seconds
+
+    def _extract(self, batch: list[tuple[str, str]], cancel: CancelToken) -> None:
+        """Um pedido ao LLM com todas as interações do lote."""
+        messages = [{'role': 'system', 'content': self.memory.get_extraction_prompt()}]
+        for user_text, reply in batch:
+            messages.append({'role': 'user', 'content': user_text})
+            messages.append({'role': 'assistant', 'content': reply})
+        try:
+            facts = self.llm.chat_json(
+                messages,
+                EXTRACTION_SCHEMA,
+                kind='memory',
+                cancel=cancel,
+                max_tokens=config.LLM_EXTRACTION_MAX_TOKENS,
+            )
+        except Cancelled:
+            return
+        except Exception as e:
+            lost = '; '.join(user_text[:40] for user_text, _ in batch)
+            logger.warning(f'Erro na extração de memória: {e} — {len(batch)} interação(ões) sem extração: {lost}')
+            return
+        self.extractions += 1
+        logger.debug(f'Extração de memória: {len(batch)} interação(ões) num pedido')
+        if isinstance(facts, dict):
+            self.memory.apply_facts(facts)
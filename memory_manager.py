@@ -19,6 +19,7 @@ from __future__ import annotations
 
 import os
 import re
+import threading
 import time
 from typing import Optional
 
@@ -26,6 +27,18 @@ import config
 from log import logger
 
 
+# Saída restrita da extração via LLM (LLMClient.chat_json)
+EXTRACTION_SCHEMA: dict = {
+    'type': 'object',
+    'properties': {
+        'perfil': {'type': 'array', 'items': {'type': 'string'}, 'maxItems': 5},
+        'memoria': {'type': 'array', 'items': {'type': 'string'}, 'maxItems': 5},
+    },
+    'required': ['perfil', 'memoria'],
+    'additionalProperties': False,
+}
+
+
 # ---------------------------------------------------------------------------
 # Padrões de detecção imediata (regex)
 # ---------------------------------------------------------------------------
@@ -122,6 +135,9 @@ class MemoryManager:
 
         self._memory_entries: list[str] = self._load_entries(self.memory_path)
         self._user_entries: list[str] = self._load_entries(self.user_path)
+        # Extração em segundo plano, detecção imediata e montagem do prompt
+        # rodam em threads diferentes: entradas e arquivos só com o lock
+        self._lock = threading.RLock()
 
     # ------------------------------------------------------------------
     # Arquivos — entradas separadas por §
@@ -214,14 +230,15 @@ class MemoryManager:
 
     def save_all(self) -> None:
         """Salva ambos os arquivos."""
-        self._save_file(
-            self.memory_path, self._memory_entries,
-            '# 🧠 Memórias da Chica\n\nAnotações e observações sobre conversas com o usuário.'
-        )
-        self._save_file(
-            self.user_path, self._user_entries,
-            '# 👤 Perfil do Usuário\n\nInformações conhecidas sobre o usuário.'
-        )
+        with self._lock:
+            self._save_file(
+                self.memory_path, self._memory_entries,
+                '# 🧠 Memórias da Chica\n\nAnotações e observações sobre conversas com o usuário.'
+            )
+            self._save_file(
+                self.user_path, self._user_entries,
+                '# 👤 Perfil do Usuário\n\nInformações conhecidas sobre o usuário.'
+            )
 
     # ------------------------------------------------------------------
     # CRUD (igual ao Hermes: add, remove)
@@ -241,24 +258,25 @@ class MemoryManager:
         if not fact or len(fact) > 200:
             return False
 
-        entries = self._user_entries if target == 'user' else self._memory_entries
-        path = self.user_path if target == 'user' else self.memory_path
+        with self._lock:
+            entries = self._user_entries if target == 'user' else self._memory_entries
+            path = self.user_path if target == 'user' else self.memory_path
 
-        # Evitar duplicatas (case-insensitive)
-        fact_lower = fact.lower()
-        for existing in entries:
-            if existing.lower() == fact_lower:
-                return False
+            # Evitar duplicatas (case-insensitive)
+            fact_lower = fact.lower()
+            for existing in entries:
+                if existing.lower() == fact_lower:
+                    return False
 
-        # Verificar limite antes de adicionar
-        if self._total_chars(path) + len(fact) > self._get_char_limit(path):
-            # Remover a entrada mais antiga pra abrir espaço
-            if entries:
-                removed = entries.pop(0)
-                logger.info(f'🗑️ Memória removida por limite: {removed[:60]}...')
+            # Verificar limite antes de adicionar
+            if self._total_chars(path) + len(fact) > self._get_char_limit(path):
+                # Remover a entrada mais antiga pra abrir espaço
+                if entries:
+                    removed = entries.pop(0)
+                    logger.info(f'🗑️ Memória removida por limite: {removed[:60]}...')
 
-        entries.append(fact)
-        self.save_all()
+            entries.append(fact)
+            self.save_all()
         logger.info(f'🧠 Memória salva: {fact[:80]}...')
         return True
 
@@ -272,14 +290,15 @@ class MemoryManager:
         Returns:
             True se removeu.
         """
-        entries = self._user_entries if target == 'user' else self._memory_entries
-        before = len(entries)
-        text_lower = text.lower()
-        entries[:] = [e for e in entries if text_lower not in e.lower()]
-        if len(entries) < before:
-            self.save_all()
-            return True
-        return False
+        with self._lock:
+            entries = self._user_entries if target == 'user' else self._memory_entries
+            before = len(entries)
+            text_lower = text.lower()
+            entries[:] = [e for e in entries if text_lower not in e.lower()]
+            if len(entries) < before:
+                self.save_all()
+                return True
+            return False
 
     def clear(self, target: Optional[str] = None) -> None:
         """Limpa memórias.
@@ -287,11 +306,12 @@ class MemoryManager:
         Args:
             target: 'user', 'memory' ou None (limpa ambos).
         """
-        if target in (None, 'memory'):
-            self._memory_entries = []
-        if target in (None, 'user'):
-            self._user_entries = []
-        self.save_all()
+        with self._lock:
+            if target in (None, 'memory'):
+                self._memory_entries = []
+            if target in (None, 'user'):
+                self._user_entries = []
+            self.save_all()
         logger.info('🧹 Memórias limpas')
 
     # ------------------------------------------------------------------
@@ -327,46 +347,29 @@ class MemoryManager:
     # ------------------------------------------------------------------
 
     def get_extraction_prompt(self) -> str:
-        """Retorna o prompt para extrair memórias."""
+        """Retorna o prompt para extrair memórias no JSON de EXTRACTION_SCHEMA
+        (saída restrita pelo servidor; aplicado por apply_facts)."""
         return (
             'Analise a conversa abaixo e extraia FATOS IMPORTANTES sobre o usuário '
             'que a assistente Chica deve lembrar para conversas futuras.\n\n'
             'REGRAS:\n'
-            '- Retorne APENAS fatos, UM por linha, sem marcadores\n'
-            '- Separe em duas seções:\n'
-            '  PERFIL: nome, idade, profissão, onde mora, hobbies\n'
-            '  MEMORIA: preferências, coisas ditas, opiniões\n'
-            '- Se NADA for relevante, retorne apenas "NONE"\n'
+            '- Um fato curto por item da lista\n'
+            '- "perfil": nome, idade, profissão, onde mora, hobbies\n'
+            '- "memoria": preferências, coisas ditas, opiniões\n'
+            '- Se NADA for relevante, devolva as listas vazias\n'
             '- NÃO invente — extraia SÓ o que foi dito'
         )
 
-    def apply_extraction(self, extraction_text: str) -> None:
-        """Aplica resultado da extração LLM."""
-        if not extraction_text or extraction_text.strip().upper() == 'NONE':
-            return
-
-        section = None
+    def apply_facts(self, facts: dict) -> None:
+        """Aplica a extração estruturada ({'perfil': [...], 'memoria': [...]})."""
         added = 0
-
-        for line in extraction_text.split('\n'):
-            line = line.strip()
-            if line.upper().startswith('PERFIL'):
-                section = 'user'
-                continue
-            elif line.upper().startswith('MEMORIA'):
-                section = 'memory'
-                continue
-
-            if not line or line.startswith('#'):
-                continue
-
-            # Remover marcadores como - ou *
-            fact = line.lstrip('- *').strip()
-            if not fact or len(fact) > 200:
-                continue
-
-            if section and self.add(section, fact):
-                added += 1
+        for key, target in (('perfil', 'user'), ('memoria', 'memory')):
+            for fact in facts.get(key) or []:
+                fact = str(fact).strip()
+                if not fact or len(fact) > 200:
+                    continue
+                if self.add(target, fact):
+                    added += 1
 
         if added > 0:
             logger.info(f'🧠 {added} nova(s) memória(s) via LLM')
@@ -388,6 +391,10 @@ class MemoryManager:
 
         Retorna string vazia se não houver nada.
         """
+        with self._lock:
+            return self._format_context()
+
+    def _format_context(self) -> str:
         parts = []
 
         if self._memory_entries:
@@ -424,7 +431,8 @@ class MemoryManager:
     # ------------------------------------------------------------------
 
     def count(self) -> int:
-        return len(self._memory_entries) + len(self._user_entries)
+        with self._lock:
+            return len(self._memory_entries) + len(self._user_entries)
 
     def filepaths(self) -> dict[str, str]:
         return {
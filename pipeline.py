@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Pipeline da interação — etapas encadeadas por filas limitadas.
+
+    captura → VAD → STT → roteamento → enriquecimento → LLM → TTS → reprodução
+
+Cada etapa tem a sua fila (queue.Queue com tamanho máximo) e os seus
+workers. O resultado de uma etapa entra na fila da seguinte:
+
+    • contrapressão — se a fila seguinte estiver cheia, o worker espera;
+      só a captura (callback do PortAudio, que não pode bloquear) descarta
+      e conta o descarte
+    • ordem — com mais de um worker, os resultados seguem para a próxima
+      etapa na ordem de chegada (as falas não trocam de lugar)
+    • métricas — profundidade da fila, tempo de espera e de processamento
+      (média móvel), itens processados e descartados, por etapa
+
+Uso:
+    from pipeline import Pipeline, Stage
+
+    pipeline = Pipeline([
+        Stage('stt', transcrever, workers=1, maxsize=4),
+        Stage('llm', responder),
+    ])
+    pipeline.start()
+    pipeline.submit(audio)
+    print(pipeline.stats())
+"""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+
+from cancellation import CancelToken
+from log import logger
+
+_STOP = object()
+
+
+@dataclass
+class Turn:
+    """Uma fala do usuário e o que cada etapa acrescentou a ela."""
+    audio: Optional[np.ndarray] = None      # VAD → STT
+    user_text: str = ""                     # STT → roteamento
+    reply: str = ""                         # resposta a falar (LLM ou frase pronta)
+    direct: bool = False                    # frase pronta: sem LLM e sem histórico
+    system_query: Any = None                # roteamento → enriquecimento
+    needs_search: bool = False
+    sys_info_text: str = ""                 # enriquecimento → LLM
+    search_results: str = ""
+    search_offline: bool = False
+    audio_path: Optional[str] = None        # TTS → reprodução (áudio completo)
+    chunks: Optional[Iterator[np.ndarray]] = None  # TTS → reprodução (streaming)
+    cancel: CancelToken = field(default_factory=CancelToken)  # barge-in
+    started_at: float = field(default_factory=time.perf_counter)
+
+
+class Stage:
+    """Etapa: fila limitada + workers que chamam handler(item).
+
+    handler devolve o item para a próxima etapa ou None (o fluxo para aqui).
+
+    Args:
+        name: Nome nas métricas.
+        handler: Função da etapa.
+        workers: Threads da etapa.
+        maxsize: Itens na fila antes de a etapa anterior esperar.
+        ema_alpha: Peso da última medida nas médias móveis.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Any],
+        workers: int = 1,
+        maxsize: int = 4,
+        ema_alpha: float = 0.2,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.next: Optional[Stage] = None
+        self.ema_alpha = ema_alpha
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._forward_lock = threading.Lock()
+        self._seq = itertools.count()
+        self._next_out: int = 0
+        self._done: dict[int, Any] = {}
+        # Métricas
+        self.active: int = 0
+        self.processed: int = 0
+        self.dropped: int = 0
+        self.errors: int = 0
+        self.max_depth: int = 0
+        self.latency: float = 0.0
+        self.wait: float = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Itens na fila ou sendo processados."""
+        return self.queue.qsize() + self.active
+
+    def put(self, item: Any, block: bool = True) -> bool:
+        """Enfileira o item; com block=False descarta se a fila estiver cheia."""
+        with self._lock:
+            # Número de ordem e enfileiramento juntos: a fila fica na ordem dos números
+            seq = next(self._seq)
+            try:
+                self.queue.put_nowait((seq, time.perf_counter(), item))
+            except queue.Full:
+                if not block:
+                    self.dropped += 1
+                    self._done[seq] = None  # a ordem de saída não espera por ele
+                    return False
+            else:
+                self.max_depth = max(self.max_depth, self.queue.qsize())
+                return True
+        # Fila cheia: espera fora do lock (contrapressão na etapa anterior)
+        self.queue.put((seq, time.perf_counter(), item))
+        return True
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        for _ in self._threads:
+            self.queue.put((-1, 0.0, _STOP))
+
+    def _work(self) -> None:
+        while True:
+            seq, enqueued, item = self.queue.get()
+            if item is _STOP:
+                return
+            start = time.perf_counter()
+            with self._lock:
+                self.active += 1
+            try:
+                result = self.handler(item)
+            except Exception as e:
+                logger.error(f"Erro na etapa {self.name}: {e}")
+                result = None
+                with self._lock:
+                    self.errors += 1
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                a = self.ema_alpha
+                self.latency = elapsed if not self.processed else a * elapsed + (1 - a) * self.latency
+                waited = start - enqueued
+                self.wait = waited if not self.processed else a * waited + (1 - a) * self.wait
+                self.processed += 1
+            self._forward(seq, result)
+            with self._lock:
+                self.active -= 1
+
+    def _forward(self, seq: int, result: Any) -> None:
+        """Passa os resultados adiante na ordem de chegada.
+
+        Um worker de cada vez (o put na etapa seguinte pode esperar): quem
+        termina fora de ordem deixa o resultado para o worker do anterior.
+        """
+        with self._forward_lock:
+            with self._lock:
+                self._done[seq] = result
+                ready = []
+                while self._next_out in self._done:
+                    ready.append(self._done.pop(self._next_out))
+                    self._next_out += 1
+            for item in ready:
+                if item is not None and self.next is not None:
+                    self.next.put(item)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                'depth': self.queue.qsize(),
+                'max_depth': self.max_depth,
+                'active': self.active,
+                'processed': self.processed,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'wait_ms': self.wait * 1000,
+                'latency_ms': self.latency * 1000,
+            }
+
+
+class Pipeline:
+    """Etapas encadeadas na ordem da lista."""
+
+    def __init__(self, stages: list[Stage]) -> None:
+        self.stages: list[Stage] = stages
+        self._by_name: dict[str, Stage] = {s.name: s for s in stages}
+        for current, following in zip(stages, stages[1:]):
+            current.next = following
+
+    def stage(self, name: str) -> Stage:
+        return self._by_name[name]
+
+    def start(self) -> None:
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self) -> None:
+        for stage in self.stages:
+            stage.stop()
+
+    def submit(self, item: Any, block: bool = True) -> bool:
+        """Entrada da primeira etapa (block=False para chamar de callbacks)."""
+        return self.stages[0].put(item, block=block)
+
+    def pending(self, after: Optional[str] = None, until: Optional[str] = None) -> int:
+        """Itens em andamento (depois da etapa after e até a etapa until, se dadas)."""
+        stages = self.stages
+        if until is not None:
+            stages = stages[:stages.index(self._by_name[until]) + 1]
+        if after is not None:
+            stages = stages[stages.index(self._by_name[after]) + 1:]
+        return sum(s.pending for s in stages)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {s.name: s.stats() for s in self.stages}
+
+    def log_stats(self) -> None:
+        for name, s in self.stats().items():
+            logger.info(
+                f"Etapa {name}: {s['processed']} itens, fila {s['depth']} (máx {s['max_depth']}), "
+                f"espera {s['wait_ms']:.0f} ms, processamento {s['latency_ms']:.0f} ms, "
+                f"{s['dropped']} descartados"
+            )
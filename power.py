@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Perfis de energia — como o pipeline roda acordada e dormindo.
+
+Os perfis são declarativos (POWER_PROFILES no config.py); aqui fica só a
+troca entre eles:
+
+    • enter('sleeping') / enter('awake') — avisa os interessados (captura,
+      STT, avatar) com o perfil novo; cada um aplica a sua parte
+    • modelos registrados (register_model) são descarregados depois de
+      unload_after_minutes no perfil e recarregados em segundo plano assim
+      que o perfil muda (ex: a wake word foi reconhecida)
+
+Uso:
+    from power import PowerManager
+
+    power = PowerManager(scheduler)
+    power.register_model('tts', tts.unload, tts.reload)
+    power.add_listener(lambda name, profile: ...)
+    power.enter('sleeping')
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import config
+from log import logger
+
+if TYPE_CHECKING:
+    from scheduler import Scheduler, Timer
+
+
+def get_profile(name: str) -> dict[str, Any]:
+    """Perfil pelo nome; o que ele não define vem do perfil 'awake'."""
+    return {**config.POWER_PROFILES['awake'], **config.POWER_PROFILES.get(name, {})}
+
+
+class PowerManager:
+    """Perfil de energia atual e descarga dos modelos ociosos.
+
+    Args:
+        scheduler: Agendador do loop principal (prazo de descarga).
+    """
+
+    def __init__(self, scheduler: Scheduler) -> None:
+        self.scheduler = scheduler
+        self.name: str = 'awake'
+        self.profile: dict[str, Any] = get_profile('awake')
+        self._models: dict[str, tuple[Callable[[], None], Callable[[], None]]] = {}
+        self._unloaded: set[str] = set()
+        self._listeners: list[Callable[[str, dict[str, Any]], None]] = []
+        self._unload_timer: Optional[Timer] = None
+        self._lock = threading.Lock()
+
+    def register_model(self, name: str, unload: Callable[[], None], load: Callable[[], None]) -> None:
+        """Modelo que pode sair da memória quando ocioso (load o traz de volta)."""
+        self._models[name] = (unload, load)
+
+    def add_listener(self, listener: Callable[[str, dict[str, Any]], None]) -> None:
+        """listener(nome, perfil) é chamado a cada troca de perfil."""
+        self._listeners.append(listener)
+
+    def enter(self, name: str) -> None:
+        """Troca para o perfil name (sem efeito se já estiver nele)."""
+        if not config.POWER_PROFILES_ENABLE:
+            return
+        with self._lock:
+            if name == self.name:
+                return
+            self.name = name
+            self.profile = get_profile(name)
+            if self._unload_timer is not None:
+                self._unload_timer.cancel()
+                self._unload_timer = None
+            minutes = self.profile.get('unload_after_minutes')
+            if minutes and self._models:
+                self._unload_timer = self.scheduler.call_later(minutes * 60, self._unload_idle)
+            reload = sorted(self._unloaded)
+        logger.info(f"Perfil de energia: {name}")
+        if reload:
+            threading.Thread(target=self._reload, args=(reload,), daemon=True).start()
+        for listener in self._listeners:
+            try:
+                listener(name, self.profile)
+            except Exception as e:
+                logger.warning(f"Erro ao aplicar o perfil {name}: {e}")
+
+    def _unload_idle(self) -> None:
+        """Prazo do perfil vencido: descarrega os modelos ainda carregados."""
+        with self._lock:
+            self._unload_timer = None
+            names = [n for n in self._models if n not in self._unloaded]
+            self._unloaded.update(names)
+        for name in names:
+            try:
+                self._models[name][0]()
+                logger.info(f"Modelo ocioso descarregado: {name}")
+            except Exception as e:
+                logger.warning(f"Erro ao descarregar {name}: {e}")
+
+    def _reload(self, names: list[str]) -> None:
+        """Recarrega em segundo plano os modelos descarregados."""
+        for name in names:
+            with self._lock:
+                if name not in self._unloaded:
+                    continue
+                self._unloaded.discard(name)
+            try:
+                self._models[name][1]()
+                logger.info(f"Modelo recarregado: {name}")
+            except Exception as e:
+                logger.warning(f"Erro ao recarregar {name}: {e}")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Agendador do loop principal — temporizadores num heap e espera bloqueante.
+
+O loop principal não tem trabalho por quadro: o áudio chega pelo callback
+do PortAudio e o processamento roda nas suas threads. Sobram prazos
+(inatividade, próxima piscada/boca do avatar) e eventos vindos de outras
+threads. Em vez de acordar a cada milissegundo para conferir o relógio:
+
+    • call_later()/call_at() põem o prazo num heap (ordenado por instante)
+    • post() agenda uma função para já, de qualquer thread (ex: "começou a
+      falar" acorda o avatar)
+    • run() roda tudo na thread que o chamou e, sem nada vencido, dorme na
+      Condition até o próximo prazo ou até um post()/stop() — parado, o
+      processo fica realmente bloqueado (zero despertares)
+
+Uso:
+    from scheduler import Scheduler
+
+    scheduler = Scheduler()
+    timer = scheduler.call_later(15.0, verificar_inatividade)
+    timer.cancel()
+    scheduler.post(atualizar_avatar)    # de outra thread
+    scheduler.run()                     # até scheduler.stop()
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+from log import logger
+
+
+class Timer:
+    """Prazo agendado (cancel() impede a execução se ainda não rodou)."""
+
+    __slots__ = ('when', 'callback', 'cancelled')
+
+    def __init__(self, when: float, callback: Callable[[], object]) -> None:
+        self.when: float = when
+        self.callback = callback
+        self.cancelled: bool = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class Scheduler:
+    """Heap de prazos (time.monotonic) + Condition para esperar sem polling."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._counter = itertools.count()   # desempate: mesma hora, ordem de chegada
+        self._condition = threading.Condition()
+        self._running: bool = False
+        self.wakeups: int = 0               # vezes que o loop acordou (diagnóstico)
+
+    def call_at(self, when: float, callback: Callable[[], object]) -> Timer:
+        """Agenda callback para o instante when (time.monotonic). Thread-safe."""
+        timer = Timer(when, callback)
+        with self._condition:
+            heapq.heappush(self._heap, (when, next(self._counter), timer))
+            # Só precisa acordar o loop se o novo prazo for o mais próximo
+            if self._heap[0][2] is timer:
+                self._condition.notify()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable[[], object]) -> Timer:
+        """Agenda callback para daqui a delay segundos. Thread-safe."""
+        return self.call_at(time.monotonic() + max(0.0, delay), callback)
+
+    def post(self, callback: Callable[[], object]) -> Timer:
+        """Roda callback na thread do loop assim que possível. Thread-safe."""
+        return self.call_at(time.monotonic(), callback)
+
+    def stop(self) -> None:
+        """Faz run() retornar (depois do callback que estiver rodando)."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def run(self) -> None:
+        """Executa os prazos vencidos e bloqueia até o próximo (ou stop())."""
+        with self._condition:
+            self._running = True
+        while True:
+            with self._condition:
+                timer = self._next_due()
+                if timer is None:
+                    return
+            try:
+                timer.callback()
+            except Exception as e:
+                logger.error(f"Erro em tarefa agendada {getattr(timer.callback, '__name__', timer.callback)}: {e}")
+
+    def _next_due(self) -> Optional[Timer]:
+        """Espera (com a Condition) o próximo prazo vencido; None se parou."""
+        while self._running:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            now = time.monotonic()
+            if self._heap and self._heap[0][0] <= now:
+                return heapq.heappop(self._heap)[2]
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._condition.wait(timeout)
+            self.wakeups += 1
+        return None
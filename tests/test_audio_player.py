@@ -0,0 +1,65 @@
+"""Testes da fila de reprodução (audio_player.py), chamando o callback direto."""
+
+import time
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sounddevice')
+
+from audio_player import AudioPlayer  # noqa: E402
+
+SR = 24000
+BLOCK = 256
+OK = types.SimpleNamespace(output_underflow=False)
+
+
+class _ActiveStream:
+    """Stream ativo de mentira: quem chama o callback é o teste."""
+
+    active = True
+    latency = 0.0
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def player():
+    player = AudioPlayer(SR, blocksize=BLOCK)
+    player._stream = _ActiveStream()
+    player.speed = 1.0
+    return player
+
+
+def _callback(player, frames=BLOCK) -> np.ndarray:
+    out = np.zeros((frames, 1), dtype=np.float32)
+    player._callback(out, frames, None, OK)
+    return out[:, 0]
+
+
+def test_flush_descarta_so_o_que_ja_estava_na_fila(player):
+    player.enqueue(np.full(SR, 0.5, dtype=np.float32))  # frase de espera
+    _callback(player)
+    player.flush()
+    reply = np.full(BLOCK * 4, 0.25, dtype=np.float32)
+    player.enqueue(reply)
+
+    first = _callback(player)
+    # O bloco cortado desce a zero, sem estalo
+    assert first[0] == pytest.approx(0.5)
+    assert first[-1] == pytest.approx(0.0, abs=1e-6)
+    assert player.is_playing
+
+    played = np.concatenate([_callback(player) for _ in range(4)])
+    np.testing.assert_array_equal(played, reply)
+
+
+def test_flush_sem_nada_depois_termina(player):
+    player.enqueue(np.full(SR, 0.5, dtype=np.float32))
+    player.flush()
+    _callback(player)                     # o fade
+    time.sleep(2 * BLOCK / SR)            # o último bloco acaba de soar
+    assert not np.any(_callback(player))  # silêncio: nada da frase cortada
+    assert not player.is_playing
@@ -0,0 +1,69 @@
+"""Testes do classificador local de intenção (intent_classifier.py)."""
+
+import json
+
+import pytest
+
+import config
+from intent_classifier import IntentClassifier, _normalize
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    return IntentClassifier()
+
+
+@pytest.mark.parametrize('text, key, label', [
+    ("calendário", 'calendário', 'COMANDO'),
+    ("spotify", 'spotify', 'COMANDO'),
+    ("calendário dos jogos", 'calendário', 'PERGUNTA'),
+    ("o que é o vim", 'vim', 'PERGUNTA'),
+])
+def test_decide_sozinho_nos_casos_claros(classifier, text, key, label):
+    assert classifier.decide(text, config.INTENT_CONFIDENCE_THRESHOLD, key=key) == label
+
+
+@pytest.mark.parametrize('text, key', [
+    ("calendário lunar", 'calendário'),
+    ("spotify premium", 'spotify'),
+    ("calculadora científica", 'calculadora'),
+    ("terminal rodoviário", 'terminal'),
+])
+def test_assunto_novo_fica_para_o_llm(classifier, text, key):
+    # Nenhum exemplo fala de "lunar" ou "premium": abrir o app ou perguntar?
+    assert classifier.decide(text, 0.9, key=key) is None
+
+
+def test_confianca_nao_satura(classifier):
+    _, confidence = classifier.predict("calendário lunar", key='calendário')
+    assert 0.5 <= confidence < 0.8
+
+
+def test_acentos_nao_mudam_a_decisao(classifier):
+    assert classifier.predict("calendario dos jogos", key='calendário') == \
+        classifier.predict("calendário dos jogos", key='calendário')
+    assert _normalize("Calendário, dos jogos!", 'calendario') == '§ dos jogos'
+
+
+def test_normalizacao_e_idempotente():
+    once = _normalize("O Relógio da sala", 'relógio')
+    assert _normalize(once) == once == 'o § da sala'
+
+
+def test_correcao_gravada_e_recarregada(tmp_path):
+    path = tmp_path / 'corrections.jsonl'
+    first = IntentClassifier(str(path))
+    text = "terminal agora"
+    for _ in range(5):
+        first.add_example(text, 'PERGUNTA', key='terminal')
+    assert first.predict(text, key='terminal')[0] == 'PERGUNTA'
+
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert lines[0] == {'text': '§ agora', 'label': 'PERGUNTA'}
+    assert IntentClassifier(str(path)).predict(text, key='terminal') == first.predict(text, key='terminal')
+
+
+def test_rotulo_desconhecido_e_ignorado(tmp_path):
+    path = tmp_path / 'corrections.jsonl'
+    IntentClassifier(str(path)).add_example("terminal", 'TALVEZ', key='terminal')
+    assert not path.exists()
@@ -0,0 +1,107 @@
+"""Testes do roteador de intenção (intent_router.py) contra os três detectores antigos."""
+
+import pytest
+
+from commands import CommandExecutor
+from intent_router import IntentRouter
+from system_info import detect_system_query
+from web_search import needs_search
+
+# Frases do benchmark (benchmarks/bench_intent_router.py) e a decisão esperada
+EXPECTED = {
+    "bom dia chica, tudo bem com você?": '-',
+    "me conta uma piada": '-',
+    "abra o navegador": 'comando: navegador',
+    "calendário": 'comando: calendário',
+    "calendário dos jogos do brasil": '-',
+    "qual o melhor navegador para linux?": 'pesquisa',
+    "abre o terminal e pesquisa python": 'pesquisa',
+    "quanto espaço livre tem no disco?": 'sistema: espaço em disco',
+    "qual o uso de memória agora?": 'sistema: memória RAM',
+    "qual a temperatura do processador?": 'sistema: temperatura',
+    "qual a temperatura em porto alegre hoje?": 'pesquisa',
+    "vai chover amanhã?": 'pesquisa',
+    "quais programas estão rodando?": 'sistema: processos',
+    "qual meu ip?": 'sistema: rede',
+    "minha equipe ganhou o campeonato ontem": '-',
+    "a parede do quarto está com mofo": '-',
+    "pesquise na internet sobre a memória dos golfinhos": 'pesquisa',
+    "quem foi santos dumont?": 'pesquisa',
+    "quanto tempo o pc está ligado?": 'sistema: uptime',
+    "toca uma música relaxante no spotify": '-',
+    "o que você acha de inteligência artificial?": '-',
+    "lembra qual é o meu time?": '-',
+}
+
+# Onde o roteador discorda de propósito dos detectores antigos
+FIXED = {
+    "qual a temperatura do processador?",          # antes: CPU (ordem das chamadas)
+    "qual a temperatura em porto alegre hoje?",    # antes: sensor de temperatura
+    "minha equipe ganhou o campeonato ontem",      # antes: "ip" dentro de "equipe"
+    "a parede do quarto está com mofo",            # antes: "rede" dentro de "parede"
+    "pesquise na internet sobre a memória dos golfinhos",  # antes: memória RAM
+}
+
+
+@pytest.fixture(scope='module')
+def executor():
+    return CommandExecutor()
+
+
+@pytest.fixture(scope='module')
+def router(executor):
+    return IntentRouter(executor)
+
+
+def _decision(cmd, query, search) -> str:
+    if cmd:
+        return f"comando: {cmd['chave']}"
+    if query:
+        return f"sistema: {query.name}"
+    return 'pesquisa' if search else '-'
+
+
+def _legacy(executor, text):
+    cmd = executor.parse(text)
+    query = detect_system_query(text)
+    return _decision(cmd, query, not query and needs_search(text))
+
+
+def _routed(router, text):
+    route = router.route(text)
+    best = route.best_of('system', 'search')
+    query = best.target if best is not None and best.kind == 'system' else None
+    return _decision(route.command, query, best is not None and best.kind == 'search')
+
+
+@pytest.mark.parametrize('text', list(EXPECTED))
+def test_decisao_do_roteador(router, text):
+    assert _routed(router, text) == EXPECTED[text]
+
+
+@pytest.mark.parametrize('text', list(EXPECTED))
+def test_so_muda_onde_os_detectores_erravam(executor, router, text):
+    same = _legacy(executor, text) == _routed(router, text)
+    assert same != (text in FIXED)
+
+
+@pytest.mark.parametrize('text', list(EXPECTED) + [
+    "calendario", "relógio", "abre o vs", "como abrir o terminal?", "terminal?",
+    "abra uma pesquisa no navegador sobre python", "você pode abrir o discord",
+    "me mostra o spotify", "nós vimos o filme", "terminal, abre o navegador",
+])
+def test_comando_da_passada_unica_igual_ao_parse(executor, router, text):
+    assert router.route(text).command == executor.parse(text)
+
+
+def test_acentos_e_limite_de_palavra(router):
+    assert router.route("calendario").command['chave'] == 'calendário'
+    assert router.route("calendario dos jogos").command is None
+    assert router.route("nós vimos o filme").command is None
+
+
+def test_conflito_decidido_pelo_contexto(router):
+    # "temperatura" é gatilho de sistema e de pesquisa (_CONFLICTS)
+    assert router.route("qual a temperatura do processador?").best.kind == 'system'
+    assert router.route("qual a temperatura hoje?").best.kind == 'search'
+    assert router.route("temperatura").best.kind == 'search'  # sem contexto: o padrão
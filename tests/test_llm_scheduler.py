@@ -0,0 +1,150 @@
+"""Testes da fila de pedidos ao LLM (llm_scheduler.py): prioridade e preempção."""
+
+import threading
+import time
+
+import pytest
+
+import config
+from cancellation import CancelToken, Cancelled
+from llm_scheduler import LLMScheduler
+
+TIMEOUT = 5.0
+
+
+class FakeClient:
+    """LLMClient de mentira: cada chat() espera o seu gate (ou o cancelamento)."""
+
+    def __init__(self) -> None:
+        self.gates: dict[str, threading.Event] = {}
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+        self._lock = threading.Lock()
+
+    def gate(self, name: str) -> threading.Event:
+        with self._lock:
+            return self.gates.setdefault(name, threading.Event())
+
+    def chat(self, messages, cancel=None):
+        name = messages[0]['content']
+        with self._lock:
+            self.started.append(name)
+        gate = self.gate(name)
+        while not gate.wait(0.01):
+            if cancel is not None and cancel.cancelled:
+                with self._lock:
+                    self.cancelled.append(name)
+                raise Cancelled()
+        return name
+
+
+def _wait_for(condition) -> None:
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, 'tempo esgotado'
+        time.sleep(0.005)
+
+
+def _submit(llm, name, kind, results, cancel=None) -> threading.Thread:
+    def run():
+        try:
+            results[name] = llm.chat([{'role': 'user', 'content': name}], kind=kind, cancel=cancel)
+        except Cancelled:
+            results[name] = 'cancelado'
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture
+def priorities(monkeypatch):
+    monkeypatch.setattr(config, 'LLM_PRIORITIES', {'urgente': 0, 'normal': 1, 'tarde': 2, 'memory': 10})
+    monkeypatch.setattr(config, 'LLM_BACKGROUND_PRIORITY', 5)
+
+
+def test_slot_livre_vai_para_o_mais_urgente(priorities):
+    client = FakeClient()
+    llm = LLMScheduler(client, slots=1)
+    results: dict = {}
+    threads = [_submit(llm, 'ocupa', 'tarde', results)]
+    _wait_for(lambda: client.started == ['ocupa'])
+
+    # Chegam na ordem inversa da prioridade; empate: o mais antigo
+    for name, kind in (('t', 'tarde'), ('n1', 'normal'), ('u', 'urgente'), ('n2', 'normal')):
+        threads.append(_submit(llm, name, kind, results))
+        _wait_for(lambda: len(llm._waiting) == len(threads) - 1)
+    for name in ('t', 'n1', 'u', 'n2'):
+        client.gate(name).set()
+    client.gate('ocupa').set()
+
+    for thread in threads:
+        thread.join(TIMEOUT)
+    assert client.started == ['ocupa', 'u', 'n1', 'n2', 't']
+    assert results == {name: name for name in ('ocupa', 't', 'n1', 'u', 'n2')}
+
+
+def test_primeiro_plano_interrompe_o_segundo_plano(priorities):
+    client = FakeClient()
+    llm = LLMScheduler(client, slots=1)
+    results: dict = {}
+    memory = _submit(llm, 'memoria', 'memory', results)
+    _wait_for(lambda: client.started == ['memoria'])
+
+    client.gate('resposta').set()
+    reply = _submit(llm, 'resposta', 'normal', results)
+    reply.join(TIMEOUT)
+    assert results['resposta'] == 'resposta'
+    assert client.cancelled == ['memoria']
+
+    # O pedido interrompido volta para a fila e é refeito
+    _wait_for(lambda: client.started == ['memoria', 'resposta', 'memoria'])
+    client.gate('memoria').set()
+    memory.join(TIMEOUT)
+    assert results['memoria'] == 'memoria'
+    assert llm.stats()['memory']['preempted'] == 1
+
+
+def test_segundo_plano_espera_o_turno_a_caminho(priorities):
+    client = FakeClient()
+    busy = threading.Event()
+    busy.set()
+    llm = LLMScheduler(client, slots=1, foreground_busy=busy.is_set, busy_poll=0.01)
+    results: dict = {}
+    client.gate('memoria').set()
+    memory = _submit(llm, 'memoria', 'memory', results)
+    time.sleep(0.1)
+    assert client.started == []
+
+    busy.clear()
+    memory.join(TIMEOUT)
+    assert results['memoria'] == 'memoria'
+
+
+def test_cancelar_na_fila_levanta_cancelled(priorities):
+    client = FakeClient()
+    llm = LLMScheduler(client, slots=1)
+    results: dict = {}
+    holder = _submit(llm, 'ocupa', 'normal', results)
+    _wait_for(lambda: client.started == ['ocupa'])
+
+    token = CancelToken()
+    waiting = _submit(llm, 'espera', 'normal', results, cancel=token)
+    _wait_for(lambda: len(llm._waiting) == 1)
+    token.cancel()
+    waiting.join(TIMEOUT)
+    assert results['espera'] == 'cancelado'
+    assert llm._waiting == []
+
+    client.gate('ocupa').set()
+    holder.join(TIMEOUT)
+    assert client.started == ['ocupa']
+    assert llm.stats()['normal']['cancelled'] == 1
+
+
+def test_sem_cliente_cada_pedido_levanta_llmerror(priorities):
+    from llm_client import LLMError
+
+    llm = LLMScheduler(None, slots=1)
+    with pytest.raises(LLMError):
+        llm.chat([{'role': 'user', 'content': 'oi'}], kind='normal')
+    assert llm._running == [] and llm._waiting == []
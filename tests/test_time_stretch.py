@@ -0,0 +1,51 @@
+"""Testes do WSOLA (time_stretch.py): duração e streaming."""
+
+import numpy as np
+import pytest
+
+from time_stretch import TimeStretcher, time_stretch
+
+SR = 24000
+
+
+def _tone(seconds: float, freq: float = 220.0) -> np.ndarray:
+    t = np.arange(int(SR * seconds)) / SR
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+@pytest.mark.parametrize('rate', [0.75, 0.9, 1.1, 1.25, 1.5, 2.0])
+def test_duracao_segue_a_velocidade(rate):
+    audio = _tone(2.0)
+    out = time_stretch(audio, rate, SR)
+    # Tolerância: um quadro (~25 ms) de cada lado
+    assert len(out) == pytest.approx(len(audio) / rate, abs=0.03 * SR)
+
+
+def test_velocidade_1_devolve_o_audio():
+    audio = _tone(0.5)
+    out = time_stretch(audio, 1.0, SR)
+    assert out.dtype == np.float32
+    np.testing.assert_array_equal(out, audio)
+
+
+def test_streaming_tem_a_mesma_duracao_do_audio_inteiro():
+    audio = _tone(2.0)
+    rate = 1.25
+    stretcher = TimeStretcher(SR)
+    chunks = [stretcher.process(chunk, rate) for chunk in np.array_split(audio, 17)]
+    chunks.append(stretcher.drain(rate))
+    streamed = np.concatenate(chunks)
+    assert len(streamed) == pytest.approx(len(time_stretch(audio, rate, SR)), abs=TimeStretcher(SR).hop)
+
+
+def test_sem_cliques_nem_ganho():
+    out = time_stretch(_tone(1.0), 1.3, SR)
+    # Hann com 50% de sobreposição soma 1: a amplitude não cresce
+    assert np.max(np.abs(out)) <= 0.55
+    assert np.all(np.isfinite(out))
+
+
+def test_drain_sem_entrada_nao_produz_audio():
+    stretcher = TimeStretcher(SR)
+    assert len(stretcher.drain(1.25)) == 0
+    assert stretcher.pending == 0
@@ -0,0 +1,65 @@
+"""Testes do cache de áudio do TTS (tts_cache.py): LRU por bytes e disco."""
+
+import numpy as np
+
+from tts_cache import TTSCache
+
+
+def _audio(samples: int) -> np.ndarray:
+    return np.full(samples, 0.25, dtype=np.float32)  # int16: 2 bytes/amostra
+
+
+def test_lru_remove_o_menos_usado_pelo_orcamento_em_bytes():
+    cache = TTSCache(max_bytes=3000, disk_dir='')
+    cache.put('a', _audio(500))   # 1000 bytes
+    cache.put('b', _audio(500))
+    cache.put('c', _audio(500))
+    assert cache.stats()['bytes'] == 3000
+
+    assert cache.get('a') is not None  # 'a' passa a ser o mais recente
+    cache.put('d', _audio(500))
+
+    assert cache.get('b') is None
+    assert all(cache.get(k) is not None for k in ('a', 'c', 'd'))
+    assert cache.stats()['bytes'] == 3000
+
+
+def test_entrada_grande_remove_varias():
+    cache = TTSCache(max_bytes=3000, disk_dir='')
+    for key in 'abc':
+        cache.put(key, _audio(500))
+    cache.put('grande', _audio(1200))  # 2400 bytes
+    stats = cache.stats()
+    assert stats['entries'] == 1 and stats['bytes'] == 2400
+    assert cache.get('grande') is not None
+
+
+def test_entrada_maior_que_o_orcamento_nao_entra():
+    cache = TTSCache(max_bytes=1000, disk_dir='')
+    cache.put('a', _audio(400))
+    cache.put('enorme', _audio(600))
+    assert cache.get('enorme') is None
+    assert cache.get('a') is not None
+
+
+def test_substituir_a_chave_nao_conta_bytes_em_dobro():
+    cache = TTSCache(max_bytes=3000, disk_dir='')
+    cache.put('a', _audio(500))
+    cache.put('a', _audio(700))
+    assert cache.stats()['bytes'] == 1400
+
+
+def test_disco_sobrevive_a_limpeza_da_ram(tmp_path):
+    cache = TTSCache(max_bytes=10_000, disk_dir=str(tmp_path), disk_max_bytes=1 << 20)
+    audio = np.linspace(-0.5, 0.5, 800, dtype=np.float32)
+    cache.put('k', audio, persist=True)
+    cache.clear()
+    restored = cache.get('k')
+    np.testing.assert_allclose(restored, audio, atol=1 / 32767)
+
+
+def test_chave_ignora_caixa_e_espacos():
+    assert TTSCache.make_key(" Olá,  mundo ", 'kokoro', 'pf_dora', 1.0) == \
+        TTSCache.make_key("olá, mundo", 'kokoro', 'pf_dora', 1.0)
+    assert TTSCache.make_key("olá", 'kokoro', 'pf_dora', 1.0) != \
+        TTSCache.make_key("olá", 'kokoro', 'pf_dora', 1.1)
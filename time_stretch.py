@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Mudança de velocidade da fala sem re-sintetizar (WSOLA em tempo real).
+
+A velocidade de síntese (TTS_SPEED) faz parte da chave do cache: mudar a
+velocidade ali invalidaria todo o áudio em cache. Aqui a velocidade é
+aplicada na reprodução, sobre o áudio já sintetizado, mantendo o tom:
+
+    WSOLA (Waveform Similarity Overlap-Add) — quadros de ~25 ms são
+    sobrepostos pela metade (janela de Hann); a posição de leitura avança
+    hop × velocidade e, numa tolerância de ±10 ms, é escolhido o quadro
+    mais parecido com a continuação natural do anterior (correlação
+    vetorizada com numpy), o que evita batimentos e cliques
+
+O TimeStretcher guarda o estado entre buffers: o áudio pode chegar em
+pedaços (streaming) e a velocidade pode mudar no meio da fala.
+
+Uso:
+    from time_stretch import TimeStretcher, time_stretch
+
+    rapido = time_stretch(audio, 1.25, 24000)       # áudio inteiro
+
+    stretcher = TimeStretcher(24000)                # em tempo real
+    saida = stretcher.process(pedaco, 1.25)
+    saida_final = stretcher.drain(1.25)
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import config
+
+
+class TimeStretcher:
+    """WSOLA incremental (mono, float32).
+
+    Args:
+        sample_rate: Taxa do áudio.
+        frame_ms: Duração de cada quadro (sobreposição de 50%).
+        tolerance_ms: Deslocamento máximo na busca pelo melhor quadro.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: Optional[float] = None,
+        tolerance_ms: Optional[float] = None,
+    ) -> None:
+        frame_ms = frame_ms or config.TIME_STRETCH_FRAME_MS
+        tolerance_ms = tolerance_ms if tolerance_ms is not None else config.TIME_STRETCH_TOLERANCE_MS
+        self.frame: int = 2 * max(16, int(sample_rate * frame_ms / 2000))
+        self.hop: int = self.frame // 2
+        self.tolerance: int = int(sample_rate * tolerance_ms / 1000)
+        # Hann periódica: com 50% de sobreposição as janelas somam 1
+        n = np.arange(self.frame)
+        self.window: np.ndarray = (0.5 - 0.5 * np.cos(2 * np.pi * n / self.frame)).astype(np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._position: float = 0.0              # leitura (relativa ao início do buffer)
+        self._tail: Optional[np.ndarray] = None  # continuação natural do último quadro
+        self._overlap = np.zeros(self.hop, dtype=np.float32)
+
+    @property
+    def pending(self) -> int:
+        """Amostras de entrada ainda não consumidas."""
+        return max(0, len(self._buffer) - int(self._position))
+
+    def process(self, audio: np.ndarray, rate: float) -> np.ndarray:
+        """Consome o áudio e devolve o que já pode sair na velocidade rate."""
+        self._buffer = np.concatenate([self._buffer, np.asarray(audio, dtype=np.float32)])
+        # Cada passo lê até posição + tolerância + quadro + hop (continuação)
+        needed = self.tolerance + self.frame + self.hop
+        out: list[np.ndarray] = []
+        while int(round(self._position)) + needed <= len(self._buffer):
+            out.append(self._step(rate))
+        self._trim()
+        return np.concatenate(out) if out else np.zeros(0, dtype=np.float32)
+
+    def drain(self, rate: float) -> np.ndarray:
+        """Fim do áudio: processa o resto (com silêncio) e zera o estado."""
+        remaining = self.pending
+        if remaining <= 0 and self._tail is None:
+            self.reset()
+            return np.zeros(0, dtype=np.float32)
+        expected = int(remaining / rate) + self.hop
+        padding = np.zeros(self.tolerance + self.frame + self.hop, dtype=np.float32)
+        out = np.concatenate([self.process(padding, rate), self._overlap])
+        self.reset()
+        return out[:expected]
+
+    def _step(self, rate: float) -> np.ndarray:
+        position = int(round(self._position))
+        if self._tail is None:
+            start = position
+        else:
+            # Quadro mais parecido com a continuação natural do anterior
+            low = max(0, position - self.tolerance)
+            region = self._buffer[low:position + self.tolerance + self.frame]
+            candidates = sliding_window_view(region, self.frame)
+            start = low + int(np.argmax(candidates @ self._tail))
+
+        frame = self._buffer[start:start + self.frame] * self.window
+        out = self._overlap + frame[:self.hop]
+        self._overlap = frame[self.hop:].copy()
+        self._tail = self._buffer[start + self.hop:start + self.hop + self.frame].copy()
+        self._position += self.hop * rate
+        return out
+
+    def _trim(self) -> None:
+        """Descarta a entrada que não pode mais ser lida."""
+        drop = int(self._position) - self.tolerance
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._position -= drop
+
+
+def time_stretch(audio: np.ndarray, rate: float, sample_rate: int) -> np.ndarray:
+    """Muda a velocidade de um áudio inteiro (rate > 1 = mais rápido)."""
+    if abs(rate - 1.0) < 1e-3 or not len(audio):
+        return np.asarray(audio, dtype=np.float32)
+    stretcher = TimeStretcher(sample_rate)
+    return np.concatenate([stretcher.process(audio, rate), stretcher.drain(rate)])
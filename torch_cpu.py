@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Otimizações de CPU para os modelos torch do TTS (Kokoro e Qwen3).
+
+    • quantização dinâmica int8 (torch.ao) das camadas Linear e LSTM —
+      os pesos ficam em int8 e as ativações são quantizadas em tempo de
+      execução; as convoluções do vocoder continuam em float32
+    • número de threads do torch (TTS_TORCH_THREADS)
+    • torch.compile com o inductor em modo padrão (o "reduce-overhead" usa
+      CUDA graphs e não ajuda na CPU), com cache persistente em disco: a
+      partir da segunda execução os grafos compilados são reaproveitados
+
+Uso:
+    from torch_cpu import optimize_for_cpu
+
+    model = optimize_for_cpu(model, compile_model=True)
+
+Medição: python benchmarks/bench_tts_cpu.py — grava os RTFs em
+TTS_CPU_BENCH_FILE; com TTS_QUANTIZE_INT8 = 'auto' o int8 só liga se a
+medição desta máquina mostrou ganho (TTS_QUANTIZE_MIN_GAIN)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Optional, Union
+
+import config
+from log import logger
+
+_compile_cache_ready = False
+
+
+def configure_compile_cache() -> str:
+    """Liga o cache persistente do inductor em TTS_COMPILE_CACHE_DIR.
+
+    Deve rodar antes da primeira compilação (as variáveis de ambiente são
+    lidas quando o inductor é importado).
+    """
+    global _compile_cache_ready
+    cache_dir = os.path.expanduser(config.TTS_COMPILE_CACHE_DIR)
+    if _compile_cache_ready:
+        return cache_dir
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ.setdefault('TORCHINDUCTOR_CACHE_DIR', cache_dir)
+    os.environ.setdefault('TORCHINDUCTOR_FX_GRAPH_CACHE', '1')
+    try:
+        import torch._inductor.config as inductor_config
+        inductor_config.fx_graph_cache = True
+    except (ImportError, AttributeError):
+        pass  # torch antigo: vale só o diretório de cache
+    _compile_cache_ready = True
+    return cache_dir
+
+
+def set_threads(threads: int = 0) -> int:
+    """Ajusta torch.set_num_threads (0 = mantém o padrão do torch)."""
+    import torch
+    if threads > 0:
+        torch.set_num_threads(threads)
+    return torch.get_num_threads()
+
+
+def quantize_int8(model):
+    """Quantização dinâmica int8 das camadas Linear e LSTM (só CPU)."""
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+
+    return quantize_dynamic(model, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8, inplace=True)
+
+
+def compile_inductor(module):
+    """torch.compile (inductor, modo padrão, formas dinâmicas) com cache em disco.
+
+    Compila o módulo no lugar (Module.compile): a identidade do módulo e os
+    hooks registrados nele (ex: streaming do Qwen3) continuam valendo.
+    """
+    cache_dir = configure_compile_cache()
+    logger.info(f"Compilando {type(module).__name__} (inductor, cache em {cache_dir})...")
+    module.compile(backend='inductor', mode='default', dynamic=True)
+    return module
+
+
+def measured_int8_gain(backend: str, threads: int) -> Optional[float]:
+    """RTF base / RTF int8 medido pelo benchmark nesta máquina (None = sem medição)."""
+    path = os.path.expanduser(config.TTS_CPU_BENCH_FILE)
+    try:
+        with open(path, encoding='utf-8') as f:
+            rtf = json.load(f)[backend][str(threads)]
+        return rtf['base'] / rtf['int8']
+    except (OSError, ValueError, KeyError, TypeError, ZeroDivisionError):
+        return None
+
+
+def _should_quantize(quantize: Union[bool, str], backend: Optional[str]) -> bool:
+    """Resolve TTS_QUANTIZE_INT8 = 'auto' com a medição do benchmark."""
+    if quantize != 'auto':
+        return bool(quantize)
+    gain = measured_int8_gain(backend, config.TTS_TORCH_THREADS) if backend else None
+    if gain is None:
+        logger.info("int8 desligado: sem medição (rode benchmarks/bench_tts_cpu.py)")
+        return False
+    enabled = gain >= config.TTS_QUANTIZE_MIN_GAIN
+    logger.info(f"int8 {'ligado' if enabled else 'desligado'}: ganho medido de {gain:.2f}x no RTF")
+    return enabled
+
+
+def optimize_for_cpu(
+    model,
+    quantize: Union[bool, str, None] = None,
+    compile_model: bool = False,
+    backend: Optional[str] = None,
+):
+    """Aplica threads, quantização int8 e compilação conforme o config.
+
+    Args:
+        model: Módulo torch já na CPU e em modo eval.
+        quantize: Quantiza Linear/LSTM: True, False ou 'auto' (None = TTS_QUANTIZE_INT8).
+        compile_model: Compila o modelo inteiro com o inductor (cache persistente).
+        backend: Nome do backend ('kokoro', 'qwen3') para achar a medição do 'auto'.
+    """
+    threads = set_threads(config.TTS_TORCH_THREADS)
+    quantize = config.TTS_QUANTIZE_INT8 if quantize is None else quantize
+    if _should_quantize(quantize, backend):
+        try:
+            model = quantize_int8(model)
+            logger.info(f"Modelo quantizado (int8 dinâmico, {threads} threads)")
+        except Exception as e:
+            logger.warning(f"Quantização int8 indisponível: {e}")
+    if compile_model:
+        try:
+            model = compile_inductor(model)
+        except Exception as e:
+            logger.warning(f"Aviso na compilação: {e}")
+    return model
@@ -0,0 +1,755 @@
+#!/usr/bin/env python3
+"""
+Backends de síntese de voz (TTS) — registro com imports sob demanda.
+
+Cada backend se registra pelo nome ('kokoro', 'kokoro_onnx', 'qwen3', 'edge')
+e só importa as dependências pesadas (torch, kokoro, onnxruntime, qwen_tts,
+edge_tts) em load(), isto é, quando é escolhido ou usado como fallback.
+Com Edge-TTS ou Kokoro ONNX o torch nem chega a ser carregado.
+
+Uso:
+    from tts_backends import create_backend
+
+    backend = create_backend('kokoro')
+    backend.load()                     # mede tempo e RSS do carregamento
+    audio = backend.synthesize("Olá!") # float32, backend.sample_rate
+
+Novo backend:
+    @register_backend('meu_tts')
+    class MeuBackend(TTSBackend):
+        def _load(self) -> None: ...
+        def voice_id(self) -> tuple[str, float]: ...
+        def synthesize(self, sentence: str) -> Optional[np.ndarray]: ...
+"""
+
+from __future__ import annotations
+
+import gc
+import itertools
+import multiprocessing
+import os
+import platform
+import queue
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Union
+
+import numpy as np
+
+import config
+from config import parse_voice_config
+from log import logger
+
+if TYPE_CHECKING:
+    import torch
+    from kokoro import KPipeline
+
+
+# ============================================================================
+# REGISTRO
+# ============================================================================
+
+_BACKENDS: dict[str, type[TTSBackend]] = {}
+
+
+def register_backend(name: str) -> Callable[[type[TTSBackend]], type[TTSBackend]]:
+    """Decorador que registra uma classe de backend com o nome dado."""
+    def _register(cls: type[TTSBackend]) -> type[TTSBackend]:
+        cls.name = name
+        _BACKENDS[name] = cls
+        return cls
+    return _register
+
+
+def backend_names() -> list[str]:
+    """Nomes dos backends registrados."""
+    return list(_BACKENDS)
+
+
+def create_backend(name: str) -> TTSBackend:
+    """Instancia (sem carregar) o backend registrado com o nome dado."""
+    try:
+        return _BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Backend TTS desconhecido: '{name}' (disponíveis: {', '.join(_BACKENDS)})")
+
+
+# ============================================================================
+# UTILITÁRIOS
+# ============================================================================
+
+def mps_available() -> bool:
+    """MPS (GPU Apple) disponível? Fora do macOS ARM nem importa o torch."""
+    if sys.platform != 'darwin' or platform.machine() != 'arm64':
+        return False
+    import torch
+    return torch.backends.mps.is_available()
+
+
+def _rss_mb() -> float:
+    """Memória residente atual do processo (MB)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        # Sem /proc (macOS): pico de RSS — em bytes no macOS, KB nos demais
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:  # Windows
+        return 0.0
+
+
+# ============================================================================
+# BASE
+# ============================================================================
+
+class TTSBackend:
+    """Interface comum dos backends de TTS.
+
+    Atributos de classe:
+        name: Nome no registro (preenchido por register_backend).
+        sample_rate: Taxa do áudio retornado.
+        full_text: Sintetiza o texto inteiro de uma vez (sem dividir em frases).
+    """
+
+    name: str = ''
+    sample_rate: int = config.TTS_SAMPLE_RATE
+    full_text: bool = False
+
+    def __init__(self) -> None:
+        self.loaded: bool = False
+        self.load_seconds: float = 0.0
+        self.load_rss_mb: float = 0.0
+
+    def load(self) -> None:
+        """Carrega o backend (imports e modelos), medindo tempo e RSS."""
+        if self.loaded:
+            return
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+        self._load()
+        self.load_seconds = time.perf_counter() - start
+        self.load_rss_mb = max(0.0, _rss_mb() - rss_before)
+        self.loaded = True
+        logger.success(
+            f"TTS {self.name} carregado em {self.load_seconds:.1f}s (+{self.load_rss_mb:.0f} MB RSS)"
+        )
+
+    def _load(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def streaming(self) -> bool:
+        """O stream() entrega áudio antes de a frase terminar?"""
+        return False
+
+    def voice_id(self) -> tuple[str, float]:
+        """(voz, velocidade) — compõem a chave do cache."""
+        raise NotImplementedError
+
+    def synthesize(self, sentence: str) -> Optional[np.ndarray]:
+        """Sintetiza uma frase (float32)."""
+        raise NotImplementedError
+
+    def synthesize_batch(self, sentences: list[str]) -> list[Optional[np.ndarray]]:
+        """Sintetiza várias frases; por padrão, uma de cada vez."""
+        return [self.synthesize(s) for s in sentences]
+
+    def stream(self, sentence: str) -> Iterator[np.ndarray]:
+        """Áudio da frase em pedaços; por padrão, a frase inteira de uma vez."""
+        audio = self.synthesize(sentence)
+        if audio is not None:
+            yield audio
+
+    def close(self) -> None:
+        """Libera recursos (processos, threads)."""
+
+    def unload(self) -> None:
+        """Tira o modelo da memória; o próximo load() carrega de novo."""
+        if not self.loaded:
+            return
+        self.close()
+        self._unload()
+        self.loaded = False
+        gc.collect()
+
+    def _unload(self) -> None:
+        """Solta as referências ao modelo (padrão: nada a soltar)."""
+
+    def stats(self) -> dict[str, float]:
+        return {'load_seconds': self.load_seconds, 'load_rss_mb': self.load_rss_mb}
+
+
+# ============================================================================
+# KOKORO
+# ============================================================================
+
+def blend_kokoro_voice(pipeline: KPipeline, voice_config: dict[str, int]) -> Union[str, torch.FloatTensor]:
+    """Resolve a configuração de voz do Kokoro para algo aceito pelo pipeline.
+
+    Voz única → retorna o nome. Mesclagem → interpola os tensores de estilo
+    das vozes pelos percentuais (uma única passada no modelo por frase).
+    O tensor mesclado fica no cache de vozes do próprio pipeline.
+    """
+    if len(voice_config) == 1:
+        return next(iter(voice_config))
+
+    import torch
+
+    key = ','.join(f'{name}:{percent}' for name, percent in voice_config.items())
+    if key not in pipeline.voices:
+        packs = [
+            pipeline.load_single_voice(name).float() * (percent / 100.0)
+            for name, percent in voice_config.items()
+        ]
+        pipeline.voices[key] = torch.stack(packs).sum(dim=0)
+        logger.info(f"Voz mesclada criada: {key}")
+    return pipeline.voices[key]
+
+
+def kokoro_synthesize(
+    pipeline: KPipeline, sentence: str, voice: Union[str, torch.FloatTensor], speed: float
+) -> Optional[np.ndarray]:
+    """Sintetiza uma frase com Kokoro (limitado a 30 segmentos) em float32."""
+    audios = [
+        a.numpy() if hasattr(a, 'numpy') else a
+        for _, _, a in itertools.islice(pipeline(sentence, voice=voice, speed=speed), 30)
+    ]
+    return np.concatenate(audios) if audios else None
+
+
+def _new_kokoro_pipeline(readonly_g2p_cache: bool = False) -> KPipeline:
+    """Cria o KPipeline (otimizado para CPU) e memoriza os fonemas se configurado."""
+    from kokoro import KPipeline
+    pipeline = KPipeline(lang_code=config.TTS_KOKORO_LANG, repo_id=config.TTS_KOKORO_MODEL)
+    if pipeline.model is not None and pipeline.model.device.type == 'cpu':
+        from torch_cpu import optimize_for_cpu
+        pipeline.model = optimize_for_cpu(pipeline.model, compile_model=config.KOKORO_USE_COMPILE, backend='kokoro')
+    if config.KOKORO_G2P_CACHE_ENABLE:
+        _memoize_g2p(pipeline, readonly_g2p_cache)
+    return pipeline
+
+
+def _memoize_g2p(pipeline: KPipeline, readonly: bool) -> None:
+    """Envolve o g2p (espeak) do pipeline com o cache de fonemas."""
+    from misaki.espeak import EspeakG2P
+    from g2p_cache import G2PCache, MemoizedG2P
+
+    # O G2P do inglês devolve tokens (não só fonemas): não é memorizável aqui
+    if not isinstance(pipeline.g2p, EspeakG2P):
+        return
+    namespace = f"{pipeline.g2p.language}-{pipeline.g2p.version or '1.0'}"
+    pipeline.g2p = MemoizedG2P(pipeline.g2p, G2PCache(namespace, readonly=readonly))
+
+
+# ----------------------------------------------------------------------
+# Pool de processos do Kokoro
+# ----------------------------------------------------------------------
+# O KModel só aceita uma frase por passada (durações e alinhamento assumem
+# batch 1), então a síntese em lote distribui as frases entre processos,
+# cada um com o seu próprio KPipeline.
+
+_worker_pipeline: Optional[KPipeline] = None
+_worker_voice_config: dict[str, int] = {}
+
+
+def _kokoro_worker_init(voice_config: dict[str, int], threads: int) -> None:
+    """Inicializa o KPipeline de um processo do pool."""
+    global _worker_pipeline, _worker_voice_config
+    import torch
+    _worker_voice_config = voice_config
+    _worker_pipeline = _new_kokoro_pipeline(readonly_g2p_cache=True)
+    torch.set_num_threads(threads)  # depois do TTS_TORCH_THREADS do processo principal
+
+
+def _kokoro_worker_ready() -> bool:
+    return _worker_pipeline is not None
+
+
+def _kokoro_worker_synthesize(sentence: str, speed: float) -> Optional[np.ndarray]:
+    assert _worker_pipeline is not None
+    voice = blend_kokoro_voice(_worker_pipeline, _worker_voice_config)
+    return kokoro_synthesize(_worker_pipeline, sentence, voice, speed)
+
+
+class KokoroProcessPool:
+    """Pool de processos que sintetiza frases do Kokoro em paralelo.
+
+    Cada processo carrega o próprio modelo (~350 MB): o KokoroBackend só
+    cria o pool no primeiro lote que precisa dele e o desfaz no unload().
+    """
+
+    def __init__(self, voice_config: dict[str, int], workers: Optional[int] = None) -> None:
+        self.workers: int = max(1, workers if workers is not None else config.TTS_BATCH_WORKERS)
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_kokoro_worker_init,
+            initargs=(voice_config, threads),
+        )
+        for _ in range(self.workers):
+            self._executor.submit(_kokoro_worker_ready)
+        logger.info(f"Pool do Kokoro iniciado ({self.workers} processos, {threads} threads cada)")
+
+    def map(self, sentences: list[str], speed: float) -> list[Optional[np.ndarray]]:
+        """Sintetiza as frases em paralelo, preservando a ordem."""
+        return list(self._executor.map(_kokoro_worker_synthesize, sentences, itertools.repeat(speed)))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@register_backend('kokoro')
+class KokoroBackend(TTSBackend):
+    """Kokoro-82M local (padrão), com mesclagem de vozes e pool para lotes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pipeline: Optional[KPipeline] = None
+        self.pool: Optional[KokoroProcessPool] = None
+        self.voice_config: dict[str, int] = parse_voice_config(config.TTS_VOICE)
+
+    def _load(self) -> None:
+        logger.info("Inicializando sistema TTS Kokoro...")
+        self.pipeline = _new_kokoro_pipeline()
+        if config.KOKORO_USE_COMPILE:
+            # Primeira passada compila (ou carrega do cache em disco)
+            self.synthesize("Olá.")
+
+    def voice_id(self) -> tuple[str, float]:
+        return config.TTS_VOICE, config.TTS_SPEED
+
+    @property
+    def g2p_cache(self):
+        """G2PCache do pipeline (None se a memoização estiver desligada)."""
+        g2p = getattr(self.pipeline, 'g2p', None)
+        return getattr(g2p, 'cache', None)
+
+    def synthesize(self, sentence: str) -> Optional[np.ndarray]:
+        assert self.pipeline is not None
+        voice = blend_kokoro_voice(self.pipeline, self.voice_config)
+        audio = self._synthesize_cached_phonemes(sentence, voice)
+        if audio is not None:
+            return audio
+        return kokoro_synthesize(self.pipeline, sentence, voice, config.TTS_SPEED)
+
+    def _synthesize_cached_phonemes(self, sentence: str, voice) -> Optional[np.ndarray]:
+        """Fonemas pelo cache e direto ao modelo (sem a divisão do KPipeline).
+
+        Frase já vista não passa pelo espeak; frase nova é fonemizada só nos
+        trechos inéditos. Frases longas seguem pelo caminho normal.
+        """
+        from kokoro import KPipeline
+
+        if self.g2p_cache is None or '\n' in sentence or len(sentence) > 400:
+            return None
+        ps, _ = self.pipeline.g2p(sentence.strip())
+        if not ps or len(ps) > 510:
+            return None
+        model = self.pipeline.model
+        pack = self.pipeline.load_voice(voice).to(model.device)
+        audio = KPipeline.infer(model, ps, pack, config.TTS_SPEED).audio
+        return audio.numpy() if hasattr(audio, 'numpy') else audio
+
+    def synthesize_batch(self, sentences: list[str]) -> list[Optional[np.ndarray]]:
+        if config.TTS_BATCH_ENABLE and config.TTS_BATCH_WORKERS > 1 and len(sentences) > 1:
+            if self.pool is None:
+                # Sob demanda: só quem tem lotes paga a memória dos processos
+                self.pool = KokoroProcessPool(self.voice_config)
+            return self.pool.map(sentences, config.TTS_SPEED)
+        return super().synthesize_batch(sentences)
+
+    def stats(self) -> dict[str, float]:
+        result = super().stats()
+        cache = self.g2p_cache
+        if cache is not None:
+            result.update({f"g2p_{k}": v for k, v in cache.stats().items()})
+        return result
+
+    def close(self) -> None:
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
+        cache = self.g2p_cache
+        if cache is not None:
+            stats = cache.stats()
+            logger.info(
+                f"Cache de fonemas: {stats['sentence_hit_rate']:.0%} das frases e "
+                f"{stats['span_hit_rate']:.0%} dos trechos sem G2P"
+            )
+            cache.save()
+
+    def _unload(self) -> None:
+        self.pipeline = None
+        self.pool = None
+
+
+# ----------------------------------------------------------------------
+# Kokoro via ONNX Runtime (int8)
+# ----------------------------------------------------------------------
+
+# Códigos de idioma do Kokoro atendidos pelo espeak-ng (mesmo G2P do KPipeline)
+_ESPEAK_LANGUAGES: dict[str, str] = {'e': 'es', 'f': 'fr-fr', 'h': 'hi', 'i': 'it', 'p': 'pt-br'}
+
+
+@register_backend('kokoro_onnx')
+class KokoroOnnxBackend(TTSBackend):
+    """Kokoro-82M int8 no ONNX Runtime — sem torch, vozes via mmap (SBCs)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.model = None
+        self.g2p: Optional[Callable[[str], tuple]] = None
+        self.voice_config: dict[str, int] = parse_voice_config(config.TTS_VOICE)
+
+    def _load(self) -> None:
+        logger.info("Inicializando Kokoro (ONNX Runtime int8)...")
+        from kokoro_onnx import KokoroOnnx
+        from misaki.espeak import EspeakG2P
+
+        language = _ESPEAK_LANGUAGES.get(config.TTS_KOKORO_LANG)
+        if language is None:
+            raise ValueError(f"idioma '{config.TTS_KOKORO_LANG}' não suportado pelo Kokoro ONNX")
+        self.model = KokoroOnnx()
+        self.sample_rate = self.model.sample_rate
+        self.model.voice(self.voice_config)  # falha cedo se a voz não foi empacotada
+        self.g2p = EspeakG2P(language=language)
+        if config.KOKORO_G2P_CACHE_ENABLE:
+            from g2p_cache import G2PCache, MemoizedG2P
+            namespace = f"{self.g2p.language}-{self.g2p.version or '1.0'}"
+            self.g2p = MemoizedG2P(self.g2p, G2PCache(namespace))
+
+    def voice_id(self) -> tuple[str, float]:
+        return config.TTS_VOICE, config.TTS_SPEED
+
+    @property
+    def g2p_cache(self):
+        return getattr(self.g2p, 'cache', None)
+
+    def synthesize(self, sentence: str) -> Optional[np.ndarray]:
+        assert self.model is not None and self.g2p is not None
+        ps, _ = self.g2p(sentence.strip())
+        if not ps:
+            return None
+        return self.model.synthesize(ps, self.voice_config, config.TTS_SPEED)
+
+    def stats(self) -> dict[str, float]:
+        result = super().stats()
+        cache = self.g2p_cache
+        if cache is not None:
+            result.update({f"g2p_{k}": v for k, v in cache.stats().items()})
+        return result
+
+    def close(self) -> None:
+        cache = self.g2p_cache
+        if cache is not None:
+            cache.save()
+
+    def _unload(self) -> None:
+        self.model = None
+        self.g2p = None
+
+
+# ============================================================================
+# QWEN3
+# ============================================================================
+
+def qwen3_synthesize_batch(model, sentences: list[str]) -> list[Optional[np.ndarray]]:
+    """Sintetiza várias frases com Qwen3 em passadas de até TTS_BATCH_SIZE frases.
+
+    O generate_custom_voice aceita listas: as frases de cada grupo são
+    tokenizadas com padding e geradas numa única passada do modelo.
+    """
+    batch_size = max(1, config.TTS_BATCH_SIZE)
+    results: list[Optional[np.ndarray]] = []
+    for start in range(0, len(sentences), batch_size):
+        group = sentences[start:start + batch_size]
+        wavs, _ = model.generate_custom_voice(
+            text=group,
+            speaker=config.QWEN3_VOICE,
+            language=config.QWEN3_LANGUAGE,
+            non_streaming_mode=True,
+        )
+        wavs = list(wavs or [])
+        results.extend(wavs[:len(group)] + [None] * (len(group) - len(wavs)))
+    return results
+
+
+class _StreamAborted(Exception):
+    """Interrompe a geração do Qwen3 quando o consumidor do stream desiste."""
+
+
+# Internos do qwen-tts usados pelo streaming (não são API pública: mudam
+# entre versões — sem eles, o backend volta à síntese da frase inteira)
+_QWEN3_STREAM_INTERNALS = ('_tokenize_texts', '_build_assistant_text', '_merge_generate_kwargs')
+
+# Espera máxima (s) pela thread de geração depois de o stream ser interrompido
+_QWEN3_STREAM_JOIN_TIMEOUT = 5.0
+
+
+def qwen3_stream_supported(model) -> bool:
+    """A versão instalada do qwen-tts tem o que o qwen3_stream usa?"""
+    inner = getattr(model, 'model', None)
+    return (
+        all(callable(getattr(model, name, None)) for name in _QWEN3_STREAM_INTERNALS)
+        and hasattr(getattr(inner, 'talker', None), 'register_forward_hook')
+        and hasattr(inner, 'speech_tokenizer')
+    )
+
+
+def qwen3_stream(model, sentence: str) -> Iterator[np.ndarray]:
+    """Sintetiza uma frase com Qwen3 entregando o áudio em pedaços.
+
+    Um forward hook no talker captura os códigos do codec a cada passo da
+    geração (que roda numa thread); os códigos são decodificados aos poucos,
+    com QWEN3_STREAM_LEFT_CONTEXT quadros de contexto à esquerda que são
+    descartados na saída. O decodificador é causal, então os pedaços se
+    encaixam sem crossfade. O primeiro pedaço é menor para começar a tocar
+    o quanto antes.
+    """
+    import torch
+
+    talker = model.model.talker
+    tokenizer = model.model.speech_tokenizer
+    eos_id = model.model.config.talker_config.codec_eos_token_id
+    upsample = tokenizer.get_decode_upsample_rate()
+    codes_queue: queue.Queue = queue.Queue()
+    abort = threading.Event()
+
+    def _hook(module, args, output) -> None:
+        if abort.is_set():
+            raise _StreamAborted()
+        hidden_states = getattr(output, 'hidden_states', None)
+        if not isinstance(hidden_states, (tuple, list)) or len(hidden_states) < 2:
+            raise RuntimeError("saída do talker sem os códigos do codec (versão do qwen-tts?)")
+        codec_ids = hidden_states[1]
+        if codec_ids is not None:  # None no prefill
+            codes_queue.put(codec_ids[0].detach())
+
+    def _generate() -> None:
+        try:
+            model.model.generate(
+                input_ids=model._tokenize_texts([model._build_assistant_text(sentence)]),
+                instruct_ids=[None],
+                languages=[config.QWEN3_LANGUAGE],
+                speakers=[config.QWEN3_VOICE],
+                non_streaming_mode=True,
+                **model._merge_generate_kwargs(),
+            )
+        except _StreamAborted:
+            pass
+        except Exception as e:
+            codes_queue.put(e)
+        finally:
+            codes_queue.put(None)
+
+    handle = talker.register_forward_hook(_hook)
+    worker = threading.Thread(target=_generate, name='qwen3-stream', daemon=True)
+    worker.start()
+
+    codes: list[torch.Tensor] = []
+    emitted = 0
+    chunk_frames = max(1, config.QWEN3_STREAM_FIRST_FRAMES)
+    try:
+        finished = False
+        while not finished:
+            item = codes_queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if item is None or int(item[0]) == eos_id:
+                finished = True
+            else:
+                codes.append(item)
+            pending = len(codes) - emitted
+            if pending <= 0 or (pending < chunk_frames and not finished):
+                continue
+
+            context = min(config.QWEN3_STREAM_LEFT_CONTEXT, emitted)
+            window = torch.stack(codes[emitted - context:])
+            wavs, _ = tokenizer.decode([{"audio_codes": window}])
+            emitted = len(codes)
+            chunk_frames = max(1, config.QWEN3_STREAM_CHUNK_FRAMES)
+            yield wavs[0][context * upsample:]
+    finally:
+        abort.set()
+        # O hook interrompe a geração no próximo passo: espera a thread
+        # terminar antes de soltar o modelo (e o lock do TTS) para outra síntese
+        worker.join(_QWEN3_STREAM_JOIN_TIMEOUT)
+        if worker.is_alive():
+            logger.warning("Geração do Qwen3 ainda rodando após a interrupção do stream")
+        handle.remove()
+
+
+@register_backend('qwen3')
+class Qwen3Backend(TTSBackend):
+    """Qwen3-TTS local (CustomVoice), com lotes e streaming nativo."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.model = None
+        self.warmed_up: bool = False
+        self.stream_supported: bool = False
+
+    def _load(self) -> None:
+        logger.info(f"Inicializando sistema TTS Qwen3 ({config.QWEN3_MODEL})...")
+        try:
+            self._from_pretrained()
+        except ImportError:
+            raise
+        except Exception as e:
+            logger.warning(f"Erro ao inicializar Qwen3-TTS: {e}")
+            logger.info("Tentando novamente...")
+            self._from_pretrained()
+        logger.info(f"   • Voz: {config.QWEN3_VOICE}")
+        logger.info(f"   • Idioma: {config.QWEN3_LANGUAGE}")
+        self._optimize()
+        self.stream_supported = qwen3_stream_supported(self.model)
+        if config.QWEN3_STREAMING and not self.stream_supported:
+            logger.warning("qwen-tts sem os internos do streaming: síntese da frase inteira")
+        self._maybe_warmup()
+
+    def _from_pretrained(self) -> None:
+        from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
+
+        tts_device = "mps" if mps_available() else "cpu"
+        logger.info(f"Dispositivo TTS: {tts_device}")
+        if tts_device == "mps":
+            self.model = Qwen3TTSModel.from_pretrained(config.QWEN3_MODEL, device_map="mps")
+        else:
+            self.model = Qwen3TTSModel.from_pretrained(config.QWEN3_MODEL)
+
+    def _optimize(self) -> None:
+        """Na CPU: int8 dinâmico e threads; com QWEN3_USE_COMPILE, compila o talker.
+
+        Compila só o talker (o passo autoregressivo): generate() é chamado no
+        módulo original e não passaria por um wrapper do modelo inteiro.
+        """
+        from torch_cpu import compile_inductor, optimize_for_cpu
+
+        if self.model.model.device.type == 'cpu':
+            self.model.model = optimize_for_cpu(self.model.model, backend='qwen3')
+        if config.QWEN3_USE_COMPILE:
+            try:
+                compile_inductor(self.model.model.talker)
+            except Exception as e:
+                logger.warning(f"Aviso na compilação: {e}")
+
+    def _maybe_warmup(self) -> None:
+        """Pré-aquece o modelo para reduzir a latência da primeira inferência."""
+        try:
+            logger.info("Pré-aquecendo modelo Qwen3-TTS...")
+            self.synthesize("Olá")
+            self.warmed_up = True
+            logger.success("Modelo pré-aquecido")
+        except Exception as e:
+            logger.warning(f"Aviso no pré-aquecimento: {e}")
+
+    @property
+    def streaming(self) -> bool:
+        return config.QWEN3_STREAMING and self.stream_supported
+
+    def voice_id(self) -> tuple[str, float]:
+        return f"{config.QWEN3_VOICE}/{config.QWEN3_LANGUAGE}", 1.0
+
+    def synthesize(self, sentence: str) -> Optional[np.ndarray]:
+        wavs, _ = self.model.generate_custom_voice(
+            text=sentence,
+            speaker=config.QWEN3_VOICE,
+            language=config.QWEN3_LANGUAGE,
+            non_streaming_mode=True,
+        )
+        return wavs[0] if wavs else None
+
+    def synthesize_batch(self, sentences: list[str]) -> list[Optional[np.ndarray]]:
+        if len(sentences) > 1:
+            return qwen3_synthesize_batch(self.model, sentences)
+        return super().synthesize_batch(sentences)
+
+    def stream(self, sentence: str) -> Iterator[np.ndarray]:
+        if not self.streaming:
+            yield from super().stream(sentence)
+            return
+        started = False
+        try:
+            for chunk in qwen3_stream(self.model, sentence):
+                started = True
+                yield chunk
+        except RuntimeError as e:
+            if started:
+                raise
+            # Internos do qwen-tts diferentes do esperado: desliga o streaming
+            logger.warning(f"Streaming do Qwen3 indisponível ({e}): síntese da frase inteira")
+            self.stream_supported = False
+            yield from super().stream(sentence)
+
+    def _unload(self) -> None:
+        self.model = None
+        self.warmed_up = False
+        self.stream_supported = False
+
+
+# ============================================================================
+# EDGE-TTS (ONLINE)
+# ============================================================================
+
+def _internet_available(timeout: float = 2.0) -> bool:
+    for host, port in [('1.1.1.1', 443), ('8.8.8.8', 443)]:
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except OSError:
+            continue
+    return False
+
+
+@register_backend('edge')
+class EdgeBackend(TTSBackend):
+    """Edge-TTS (Microsoft, online) — texto inteiro numa requisição, em streaming."""
+
+    full_text = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.streamer = None
+
+    def _load(self) -> None:
+        logger.info("Inicializando Edge-TTS...")
+        import edge_tts  # noqa: F401 — falha cedo se não estiver instalado
+        from edge_stream import EdgeTTSStreamer
+
+        if not _internet_available():
+            raise ConnectionError("sem internet para o Edge-TTS")
+        self.streamer = EdgeTTSStreamer()
+        logger.info(f"Edge-TTS online (voz: {config.EDGE_TTS_VOICE})")
+
+    @property
+    def streaming(self) -> bool:
+        return config.EDGE_TTS_STREAMING
+
+    def voice_id(self) -> tuple[str, float]:
+        return config.EDGE_TTS_VOICE, config.EDGE_TTS_SPEED
+
+    def synthesize(self, text: str) -> Optional[np.ndarray]:
+        return self.streamer.synthesize(text)
+
+    def synthesize_batch(self, sentences: list[str]) -> list[Optional[np.ndarray]]:
+        """Requisições simultâneas (uma conexão por frase)."""
+        if len(sentences) <= 1:
+            return super().synthesize_batch(sentences)
+        with ThreadPoolExecutor(max_workers=len(sentences)) as executor:
+            return list(executor.map(self.streamer.synthesize, sentences))
+
+    def stream(self, text: str) -> Iterator[np.ndarray]:
+        yield from self.streamer.stream(text)
+
+    def close(self) -> None:
+        if self.streamer:
+            self.streamer.close()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Cache de áudio do TTS — memória (LRU por bytes) + disco (persistente).
+
+Chave: texto normalizado + backend + voz + velocidade.
+Áudio armazenado em int16 (metade do tamanho do float32).
+
+Uso:
+    from tts_cache import TTSCache
+
+    cache = TTSCache()
+    key = cache.make_key("Olá!", backend='kokoro', voice='pf_dora', speed=1.05)
+    audio = cache.get(key)
+    if audio is None:
+        audio = sintetizar("Olá!")
+        cache.put(key, audio, persist=True)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+import config
+from log import logger
+
+
+class TTSCache:
+    """Cache de áudio sintetizado com dois níveis (RAM e disco).
+
+    Args:
+        max_bytes: Orçamento de RAM (bytes) — LRU remove os menos usados.
+        disk_dir: Pasta do cache em disco (None desativa o disco).
+        disk_max_bytes: Orçamento do disco (bytes) — remove os mais antigos.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: Optional[int] = None,
+    ) -> None:
+        self.max_bytes: int = max_bytes if max_bytes is not None else int(config.TTS_CACHE_MAX_MB * 1024 * 1024)
+        self.disk_max_bytes: int = (
+            disk_max_bytes if disk_max_bytes is not None
+            else int(config.TTS_CACHE_DISK_MAX_MB * 1024 * 1024)
+        )
+        disk_dir = disk_dir if disk_dir is not None else config.TTS_CACHE_DIR
+        self.disk_dir: Optional[str] = os.path.expanduser(disk_dir) if disk_dir else None
+
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._bytes: int = 0
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Cache de TTS em disco desativado: {e}")
+                self.disk_dir = None
+
+    # ------------------------------------------------------------------
+    # Chaves
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normaliza o texto para a chave (unicode, caixa e espaços)."""
+        text = unicodedata.normalize('NFC', text or '')
+        return re.sub(r'\s+', ' ', text).strip().lower()
+
+    @classmethod
+    def make_key(cls, text: str, backend: str, voice: str, speed: float) -> str:
+        """Gera a chave do cache para um texto sintetizado."""
+        raw = f"{backend}|{voice}|{float(speed):.3f}|{cls.normalize_text(text)}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Leitura / escrita
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Retorna o áudio (float32) em cache ou None."""
+        with self._lock:
+            pcm = self._entries.get(key)
+            if pcm is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pcm.astype(np.float32) / 32767.0
+
+        pcm = self._disk_load(key)
+        with self._lock:
+            if pcm is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, pcm)
+        return pcm.astype(np.float32) / 32767.0
+
+    def put(self, key: str, audio: np.ndarray, persist: bool = False) -> None:
+        """Guarda o áudio no cache (e no disco se persist=True)."""
+        if audio is None or len(audio) == 0:
+            return
+        audio = audio.numpy() if hasattr(audio, 'numpy') else np.asarray(audio)
+        pcm = (np.clip(audio.astype(np.float32), -1.0, 1.0) * 32767.0).astype(np.int16)
+        with self._lock:
+            self._store(key, pcm)
+        if persist:
+            self._disk_save(key, pcm)
+
+    def _store(self, key: str, pcm: np.ndarray) -> None:
+        """Insere na RAM e aplica o LRU por bytes (chamar com o lock)."""
+        if pcm.nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        self._entries[key] = pcm
+        self._bytes += pcm.nbytes
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    # ------------------------------------------------------------------
+    # Disco
+    # ------------------------------------------------------------------
+
+    def _disk_path(self, key: str) -> str:
+        assert self.disk_dir is not None
+        return os.path.join(self.disk_dir, f"{key}.npy")
+
+    def _disk_load(self, key: str) -> Optional[np.ndarray]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            pcm = np.load(path)
+            os.utime(path)  # marca como usado recentemente
+            return pcm
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache de TTS corrompido ({key[:8]}): {e}")
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+
+    def _disk_save(self, key: str, pcm: np.ndarray) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, pcm)
+            os.replace(tmp_path, path)
+            self._disk_trim()
+        except OSError as e:
+            logger.warning(f"Erro ao salvar cache de TTS: {e}")
+
+    def _disk_trim(self) -> None:
+        """Remove os arquivos menos usados até caber no orçamento do disco."""
+        assert self.disk_dir is not None
+        files = []
+        total = 0
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.npy'):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        if total <= self.disk_max_bytes:
+            return
+        files.sort()
+        for _, size, path in files:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Pré-síntese de frases fixas
+    # ------------------------------------------------------------------
+
+    def prerender(self, phrases: Iterable[str], synthesize: Callable[[str], object]) -> threading.Thread:
+        """Sintetiza frases fixas em segundo plano (saudação, confirmações...).
+
+        `synthesize` deve passar pelo caminho normal de síntese, que já
+        consulta e preenche este cache — frases em disco não são refeitas.
+        """
+        phrases = list(dict.fromkeys(p for p in phrases if p))
+
+        def _job() -> None:
+            for phrase in phrases:
+                try:
+                    synthesize(phrase)
+                except Exception as e:
+                    logger.warning(f"Erro ao pré-sintetizar '{phrase[:40]}': {e}")
+            logger.info(f"🗂️ {len(phrases)} frase(s) fixa(s) prontas no cache de TTS")
+
+        thread = threading.Thread(target=_job, name='tts-prerender', daemon=True)
+        thread.start()
+        return thread
+
+    # ------------------------------------------------------------------
+    # Utilitários
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict[str, float]:
+        """Estatísticas de uso (entradas, bytes, taxa de acerto)."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total) if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Limpa o cache em RAM (o disco é preservado)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Divisão do texto em trechos para o TTS (pt-BR).
+
+Cada trecho é uma passada do modelo. Trechos muito curtos ("Sim.", "Ok.")
+pagam o custo fixo da passada por quase nada de áudio, e frases enormes
+seguram a reprodução até terminarem. Regras:
+
+    • fronteira de frase: . ! ? … seguidos de espaço e de algo que não
+      comece em minúscula
+    • números ("3.5 GB", "1.000", "3,5") e abreviações ("Sr.", "Dra.",
+      "p. ex.", "nº") nunca são cortados
+    • frases longas são quebradas nas vírgulas (ou ; e :)
+    • pedaços curtos são juntados ao seguinte
+    • o primeiro trecho é curto (áudio começa logo) e os demais, longos
+      (menos passadas no total)
+
+Uso:
+    from tts_chunker import TextChunker
+
+    chunker = TextChunker()
+    for trecho in chunker.split("Olá! O disco tem 3.5 GB livres, Sr. João."):
+        sintetizar(trecho)
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+import config
+
+# Abreviações comuns em pt-BR (sem o ponto; comparação sem diferenciar caixa)
+ABBREVIATIONS: frozenset[str] = frozenset({
+    'sr', 'sra', 'srta', 'dr', 'dra', 'prof', 'profa', 'eng', 'exmo', 'exma',
+    'av', 'rod', 'apto', 'cel', 'gen', 'cap', 'sto', 'sta', 'jr', 'cia', 'ltda',
+    'ex', 'p', 'pág', 'pag', 'págs', 'vol', 'obs', 'aprox', 'tel', 'séc',
+    'nº', 'núm', 'etc',
+})
+
+# Pontuação final + espaço: candidato a fronteira de frase
+_SENTENCE_END = re.compile(r'([.!?…]+)(\s+)')
+# Palavra imediatamente antes do ponto
+_LAST_WORD = re.compile(r'([\wº]+)$')
+# Vírgula/ponto e vírgula/dois-pontos seguidos de espaço ("3,5" não casa)
+_CLAUSE_END = re.compile(r'(?<=[,;:])\s+')
+_FINAL_PUNCT = '.!?…'
+
+
+class TextChunker:
+    """Divide o texto em trechos de tamanho adequado para a síntese.
+
+    Args:
+        first_max_chars: Tamanho máximo do primeiro trecho.
+        max_chars: Tamanho máximo dos demais trechos.
+        min_chars: Pedaços menores que isso são juntados ao seguinte.
+    """
+
+    def __init__(
+        self,
+        first_max_chars: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        min_chars: Optional[int] = None,
+    ) -> None:
+        self.first_max_chars: int = first_max_chars or config.TTS_CHUNK_FIRST_MAX_CHARS
+        self.max_chars: int = max_chars or config.TTS_CHUNK_MAX_CHARS
+        self.min_chars: int = min_chars if min_chars is not None else config.TTS_CHUNK_MIN_CHARS
+
+    def split(self, text: str) -> list[str]:
+        """Trechos prontos para o TTS, cada um com pontuação final."""
+        chunks: list[str] = []
+        current = ''
+        for sentence in self.sentences(text):
+            for piece in self._fit(sentence, self._limit(chunks)):
+                if not current:
+                    current = piece
+                elif (len(current) < self.min_chars
+                      or len(current) + 1 + len(piece) <= self._limit(chunks)):
+                    current = f"{current} {piece}"
+                else:
+                    chunks.append(self._finish(current))
+                    current = piece
+        if current:
+            chunks.append(self._finish(current))
+        return chunks
+
+    def _limit(self, chunks: list[str]) -> int:
+        return self.first_max_chars if not chunks else self.max_chars
+
+    # ------------------------------------------------------------------
+    # Frases
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def sentences(text: str) -> list[str]:
+        """Divide em frases sem cortar números nem abreviações."""
+        text = re.sub(r'\s+', ' ', text or '').strip()
+        sentences: list[str] = []
+        start = 0
+        for match in _SENTENCE_END.finditer(text):
+            if not _is_boundary(text, match):
+                continue
+            sentence = text[start:match.end(1)].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        rest = text[start:].strip()
+        if rest:
+            sentences.append(rest)
+        return sentences
+
+    def _fit(self, sentence: str, limit: int) -> list[str]:
+        """Quebra uma frase longa nas vírgulas (e, em último caso, nos espaços)."""
+        if len(sentence) <= limit:
+            return [sentence]
+        pieces: list[str] = []
+        current = ''
+        for clause in _CLAUSE_END.split(sentence):
+            for part in self._split_words(clause, self.max_chars):
+                if not current:
+                    current = part
+                elif len(current) + 1 + len(part) <= limit:
+                    current = f"{current} {part}"
+                else:
+                    pieces.append(current)
+                    current = part
+                    limit = self.max_chars
+        if current:
+            pieces.append(current)
+        return pieces
+
+    @staticmethod
+    def _split_words(clause: str, limit: int) -> list[str]:
+        """Oração sem vírgula maior que o limite: corta entre palavras."""
+        if len(clause) <= limit:
+            return [clause]
+        parts: list[str] = []
+        current = ''
+        for word in clause.split(' '):
+            if current and len(current) + 1 + len(word) > limit:
+                parts.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            parts.append(current)
+        return parts
+
+    @staticmethod
+    def _finish(chunk: str) -> str:
+        """Garante pontuação final (troca vírgula/dois-pontos soltos por ponto)."""
+        chunk = chunk.rstrip(' ,;:')
+        return chunk if chunk[-1] in _FINAL_PUNCT else chunk + '.'
+
+
+def _is_boundary(text: str, match: re.Match) -> bool:
+    """A pontuação encontrada termina mesmo a frase?"""
+    following = text[match.end():match.end() + 1]
+    if following.islower():
+        return False  # "... e então", "Sr. joão" digitado em minúscula
+    if match.group(1) != '.':
+        return True
+    word = _LAST_WORD.search(text, 0, match.start(1))
+    if word is None:
+        return True
+    token = word.group(1)
+    if token.lower() in ABBREVIATIONS:
+        return False
+    # Inicial de nome ("J. R. Silva")
+    return not (len(token) == 1 and token.isupper())
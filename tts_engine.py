@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
-Motor de síntese de voz (TTS) — Kokoro e Qwen3.
+Motor de síntese de voz (TTS) — API única sobre os backends registrados.
+
+Os backends (Kokoro, Qwen3, Edge-TTS) ficam em tts_backends.py e só são
+importados/carregados quando escolhidos ou usados como fallback. Aqui ficam
+a divisão em trechos (tts_chunker), o cache compartilhado, o fallback e a gravação do .wav.
 
 Uso:
     from tts_engine import TTSManager
@@ -9,6 +13,9 @@ Uso:
     audio_path = tts.synthesize("Olá, mundo!")
     if audio_path:
         print(f"Áudio salvo em {audio_path}")
+
+    for pcm in tts.synthesize_stream("Olá, mundo!", cancel=token):
+        tocar(pcm)                      # para na frase seguinte ao cancelamento
 """
 
 from __future__ import annotations
@@ -16,331 +23,303 @@ from __future__ import annotations
 import os
 import re
 import tempfile
-from typing import Optional
+import threading
+from typing import Callable, Iterator, Optional
 
 import numpy as np
 import soundfile as sf
-import torch
-from colorama import Fore, init as colorama_init
-from kokoro import KPipeline
 
 import config
+from cancellation import CancelToken
 from log import logger
-
-colorama_init(autoreset=True)
+from tts_backends import TTSBackend, create_backend
+from tts_cache import TTSCache
+from tts_chunker import TextChunker
 
 
 class TTSManager:
-    """Gerencia a síntese de voz com Kokoro ou Qwen3."""
-
-    def __init__(self, system: str = 'kokoro') -> None:
-        self.system: str = system
-        self.kokoro_pipeline: Optional[KPipeline] = None
-        self.qwen3_pipeline = None
-        self.tts_cache: dict[str, np.ndarray] = {}
-        self.max_cache_size: int = 50
-        self.qwen3_warmed_up: bool = False
-        self._init()
+    """Gerencia a síntese de voz sobre um backend ativo e um de fallback.
+
+    Args:
+        system: Backend escolhido ('kokoro', 'qwen3', 'edge').
+        cache: Cache de áudio (compartilhado com quem mais sintetizar).
+        fallback: Backend usado se o escolhido falhar (carregado sob demanda).
+    """
+
+    def __init__(
+        self,
+        system: str = 'kokoro',
+        cache: Optional[TTSCache] = None,
+        fallback: str = 'kokoro',
+    ) -> None:
+        self.cache: TTSCache = cache if cache is not None else TTSCache()
+        self.fallback_name: str = fallback
+        self.chunker = TextChunker()
+        self.backends: dict[str, TTSBackend] = {}
+        self._lock = threading.Lock()
+        # Limpeza do texto antes da síntese: a mesma em prerender(), cached()
+        # e nas respostas (o app troca pela dele), senão as chaves do cache não batem
+        self.text_cleaner: Callable[[str], str] = self.clean_for_tts
+
+        backend = self._load_backend(system)
+        if backend is None and system != fallback:
+            logger.warning(f"Usando {fallback} como fallback...")
+            backend = self._load_backend(fallback)
+        if backend is None:
+            raise RuntimeError("Nenhum backend de TTS pôde ser carregado")
+        self.backend: TTSBackend = backend
+
+    @property
+    def system(self) -> str:
+        """Nome do backend ativo."""
+        return self.backend.name
+
+    @property
+    def sample_rate(self) -> int:
+        return self.backend.sample_rate
+
+    @property
+    def streaming(self) -> bool:
+        """O backend ativo entrega áudio antes de terminar cada frase?"""
+        return self.backend.streaming
 
     # ------------------------------------------------------------------
-    # Inicialização
+    # Backends
     # ------------------------------------------------------------------
 
-    def _init(self) -> None:
-        """Inicializa o pipeline TTS conforme o sistema escolhido."""
-        if self.system == 'kokoro':
-            self._init_kokoro()
-        elif self.system == 'edge':
-            self._init_edge()
-        else:
-            self._init_qwen3()
-
-    def _init_kokoro(self) -> None:
-        """Inicializa Kokoro-TTS."""
-        logger.info("Inicializando sistema TTS Kokoro...")
-        self.kokoro_pipeline = KPipeline(lang_code=config.TTS_KOKORO_LANG, repo_id=config.TTS_KOKORO_MODEL)
-        logger.success("Sistema TTS Kokoro inicializado")
-
-    def _init_qwen3(self) -> None:
-        """Inicializa Qwen3-TTS com fallback para Kokoro."""
-        logger.info(f"Inicializando sistema TTS Qwen3 ({config.QWEN3_MODEL})...")
-        try:
-            from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
-
-            tts_device = "mps" if torch.backends.mps.is_available() else "cpu"
-            logger.info(f"Dispositivo TTS: {tts_device}")
-
-            if tts_device == "mps":
-                self.qwen3_pipeline = Qwen3TTSModel.from_pretrained(
-                    config.QWEN3_MODEL, device_map="mps"
-                )
-            else:
-                self.qwen3_pipeline = Qwen3TTSModel.from_pretrained(config.QWEN3_MODEL)
-
-            actual_device = (
-                self.qwen3_pipeline.model.device
-                if hasattr(self.qwen3_pipeline.model, 'device')
-                else next(self.qwen3_pipeline.model.parameters()).device
-            )
-            logger.success(f"Qwen3-TTS inicializado (dispositivo: {actual_device})")
-            logger.info(f"   • Voz: {config.QWEN3_VOICE}")
-            logger.info(f"   • Idioma: {config.QWEN3_LANGUAGE}")
-
-            self._maybe_compile()
-            self._maybe_warmup()
-
-        except ImportError:
-            logger.error("Qwen3-TTS não instalado. Instale com: pip install qwen-tts")
-            self._fallback_to_kokoro()
-        except Exception as e:
-            logger.warning(f"Erro ao inicializar Qwen3-TTS: {e}")
-            logger.info("Tentando novamente...")
-            try:
-                from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
-                tts_device = "mps" if torch.backends.mps.is_available() else "cpu"
-                if tts_device == "mps":
-                    self.qwen3_pipeline = Qwen3TTSModel.from_pretrained(
-                        config.QWEN3_MODEL, device_map="mps"
-                    )
-                else:
-                    self.qwen3_pipeline = Qwen3TTSModel.from_pretrained(config.QWEN3_MODEL)
-                self._maybe_compile()
-                self._maybe_warmup()
-                logger.success("Qwen3-TTS inicializado na segunda tentativa")
-            except Exception:
-                logger.error("Não foi possível inicializar Qwen3-TTS")
-                self._fallback_to_kokoro()
-
-    def _init_edge(self) -> None:
-        """Inicializa Edge-TTS (verifica internet, fallback para Kokoro se offline)."""
-        logger.info("Inicializando Edge-TTS...")
-        try:
-            import edge_tts
-            logger.info(f"Edge-TTS disponível (voz: {config.EDGE_TTS_VOICE})")
-            # Verificar internet de forma genérica
-            import socket
-            hosts = [('1.1.1.1', 443), ('8.8.8.8', 443)]
-            online = False
-            for host, port in hosts:
-                try:
-                    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    s.settimeout(2)
-                    s.connect((host, port))
-                    s.close()
-                    online = True
-                    break
-                except (socket.timeout, OSError):
-                    continue
-            if online:
-                logger.success("Edge-TTS inicializado (online)")
-            else:
-                logger.warning("Sem internet para Edge-TTS — fallback para Kokoro")
-                self._fallback_to_kokoro()
-        except ImportError:
-            logger.warning("edge-tts não instalado. Instale com: pip install edge-tts")
-            self._fallback_to_kokoro()
-
-    def _maybe_compile(self) -> None:
-        """Aplica torch.compile se configurado."""
-        if config.QWEN3_USE_COMPILE and hasattr(torch, 'compile') and self.qwen3_pipeline:
-            try:
-                logger.info("Compilando modelo com torch.compile...")
-                compiled = torch.compile(self.qwen3_pipeline.model, mode="reduce-overhead")
-                self.qwen3_pipeline.model = compiled
-                logger.success("Modelo compilado")
-            except Exception as e:
-                logger.warning(f"Aviso na compilação: {e}")
-
-    def _maybe_warmup(self) -> None:
-        """Pré-aquece o modelo Qwen3 para reduzir latência na primeira inferência."""
-        if not self.qwen3_pipeline:
-            return
+    def _load_backend(self, name: str) -> Optional[TTSBackend]:
+        """Carrega (uma única vez) o backend pelo nome; None se falhar."""
+        if name in self.backends:
+            return self.backends[name]
+        backend = create_backend(name)
         try:
-            logger.info("Pré-aquecendo modelo Qwen3-TTS...")
-            _ = self.qwen3_pipeline.generate_custom_voice(
-                text="Olá",
-                speaker=config.QWEN3_VOICE,
-                language=config.QWEN3_LANGUAGE,
-                non_streaming_mode=True,
-            )
-            self.qwen3_warmed_up = True
-            logger.success("Modelo pré-aquecido")
+            backend.load()
+        except ImportError as e:
+            logger.error(f"Dependência do TTS {name} não instalada: {e}")
+            return None
         except Exception as e:
-            logger.warning(f"Aviso no pré-aquecimento: {e}")
+            logger.warning(f"Não foi possível inicializar o TTS {name}: {e}")
+            return None
+        self.backends[name] = backend
+        return backend
 
-    def _fallback_to_kokoro(self) -> None:
-        """Fallback para Kokoro quando Qwen3 falha."""
-        logger.warning("Usando Kokoro-TTS como fallback...")
-        self.system = 'kokoro'
-        self.kokoro_pipeline = KPipeline(lang_code=config.TTS_KOKORO_LANG, repo_id=config.TTS_KOKORO_MODEL)
-        logger.success("Kokoro-TTS ativado como fallback")
+    def _fallback(self) -> Optional[TTSBackend]:
+        """Backend de fallback (carregado na primeira falha do ativo)."""
+        if self.backend.name == self.fallback_name:
+            return None
+        backend = self._load_backend(self.fallback_name)
+        if backend is not None:
+            logger.info(f"Fallback para {backend.name} nesta síntese...")
+        return backend
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Tempo e RSS de carregamento por backend + estatísticas do cache."""
+        result = {name: b.stats() for name, b in self.backends.items()}
+        result['cache'] = self.cache.stats()
+        return result
+
+    def close(self) -> None:
+        for backend in self.backends.values():
+            backend.close()
+
+    def unload(self) -> None:
+        """Tira os modelos da memória (o cache fica; fora dele, recarrega sob demanda)."""
+        with self._lock:
+            for backend in self.backends.values():
+                backend.unload()
+
+    def reload(self) -> None:
+        """Carrega de novo o backend ativo (ex: ao acordar, antes da primeira síntese)."""
+        with self._lock:
+            self.backend.load()
 
     # ------------------------------------------------------------------
     # Síntese
     # ------------------------------------------------------------------
 
-    def synthesize(self, text: str) -> Optional[str]:
-        """Converte texto em áudio e retorna o caminho do arquivo .wav."""
+    def synthesize(self, text: str, cancel: Optional[CancelToken] = None) -> Optional[str]:
+        """Converte texto em áudio e retorna o caminho do arquivo .wav.
+
+        Com cancel, as frases ainda não sintetizadas são abandonadas (None).
+        """
         if not text:
             return None
-
-        # Edge-TTS sintetiza o texto completo de uma vez (async)
-        if self.system == 'edge':
-            return self._edge_synthesize_full(text)
-
-        try:
-            sentences = re.split(r'[.!?]+', text)
-            sentences = [s.strip() for s in sentences if s.strip()]
-            audio_chunks: list[np.ndarray] = []
-
-            for sentence in sentences:
-                if not sentence:
-                    continue
-                if sentence[-1] not in '.!?':
-                    sentence += '.'
-                chunk = self._synthesize_sentence(sentence)
-                if chunk is not None:
-                    audio_chunks.append(chunk)
-
-            if not audio_chunks:
+        with self._lock:
+            try:
+                audio = self._synthesize_audio(text, cancel)
+            except Exception as e:
+                logger.error(f"Erro no TTS ({self.system}): {e}")
                 return None
-
-            # Converter tensores para numpy
-            chunks_np: list[np.ndarray] = []
-            for c in audio_chunks:
-                chunks_np.append(c.numpy() if hasattr(c, 'numpy') else c)
-            audio_chunks = chunks_np
-
-            # Fade entre chunks
-            self._apply_crossfade(audio_chunks)
-
-            final_audio = np.concatenate(audio_chunks)
-
-            temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            sf.write(temp_file.name, final_audio, config.TTS_SAMPLE_RATE)
-            return temp_file.name
-
-        except Exception as e:
-            logger.error(f"Erro no TTS ({self.system}): {e}")
+        if audio is None or (cancel is not None and cancel.cancelled):
             return None
-
-    def _edge_synthesize_full(self, text: str) -> Optional[str]:
-        """Sintetiza o texto completo com Edge-TTS (async)."""
-        import asyncio
+        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+        sf.write(temp_file.name, audio, self.sample_rate)
+        return temp_file.name
+
+    def synthesize_batch(self, sentences: list[str]) -> list[Optional[np.ndarray]]:
+        """Sintetiza várias frases de uma vez e retorna um áudio por frase."""
+        with self._lock:
+            return self._synthesize_batch(sentences)
+
+    def synthesize_stream(self, text: str, cancel: Optional[CancelToken] = None) -> Iterator[np.ndarray]:
+        """Converte texto em áudio entregue em pedaços (float32, sample_rate).
+
+        Com Qwen3 (QWEN3_STREAMING) a frase começa a sair antes de terminar
+        de ser gerada; com Edge-TTS o MP3 é decodificado enquanto chega; nos
+        demais sistemas sai um trecho por vez. Frases em cache saem direto
+        do cache. Com cancel, para no próximo pedaço depois do cancelamento.
+        """
+        with self._lock:
+            units = [text] if self.backend.full_text else self.split_sentences(text)
+            for unit in units:
+                if cancel is not None and cancel.cancelled:
+                    return
+                yield from self._stream_unit(unit, cancel)
+
+    def cached(self, text: str) -> Optional[np.ndarray]:
+        """Áudio do texto se estiver todo no cache do backend ativo (sem sintetizar)."""
+        text = self.text_cleaner(text)
+        units = [text] if self.backend.full_text else self.split_sentences(text)
+        chunks = [self.cache.get(self._cache_key(self.backend, unit)) for unit in units]
+        if not chunks or any(c is None for c in chunks):
+            return None
+        self._apply_crossfade(chunks, self.sample_rate)
+        return np.concatenate(chunks)
+
+    def prerender(self, phrases: list[str]) -> threading.Thread:
+        """Pré-sintetiza frases fixas em segundo plano (ficam no cache)."""
+        def _render(phrase: str) -> None:
+            path = self.synthesize(self.text_cleaner(phrase))
+            if path:
+                os.unlink(path)
+        return self.cache.prerender(phrases, _render)
+
+    def split_sentences(self, text: str) -> list[str]:
+        """Divide o texto em trechos de síntese (primeiro curto, demais longos)."""
+        return self.chunker.split(text)
+
+    def _cache_key(self, backend: TTSBackend, text: str) -> str:
+        voice, speed = backend.voice_id()
+        return self.cache.make_key(text, backend.name, voice, speed)
+
+    def _cache_put(self, key: str, text: str, audio: np.ndarray) -> None:
+        self.cache.put(key, audio, persist=len(text) <= config.TTS_CACHE_DISK_MAX_CHARS)
+
+    def _synthesize_audio(self, text: str, cancel: Optional[CancelToken] = None) -> Optional[np.ndarray]:
+        """Áudio completo do texto (frases em lote + crossfade)."""
+        if self.backend.full_text:
+            return self._synthesize_one(text)
+
+        chunks = [c for c in self._synthesize_batch(self.split_sentences(text), cancel) if c is not None]
+        if not chunks:
+            return None
+        chunks = [c.numpy() if hasattr(c, 'numpy') else c for c in chunks]
+        self._apply_crossfade(chunks, self.sample_rate)
+        return np.concatenate(chunks)
+
+    def _synthesize_batch(
+        self, sentences: list[str], cancel: Optional[CancelToken] = None
+    ) -> list[Optional[np.ndarray]]:
+        keys = [self._cache_key(self.backend, s) for s in sentences]
+        results: list[Optional[np.ndarray]] = [self.cache.get(k) for k in keys]
+        pending = [i for i, audio in enumerate(results) if audio is None]
+        if not pending:
+            return results
+
+        texts = [sentences[i] for i in pending]
+        if config.TTS_BATCH_ENABLE and len(pending) > 1:
+            try:
+                self.backend.load()
+                audios = self.backend.synthesize_batch(texts)
+            except Exception as e:
+                logger.warning(f"Erro na síntese em lote ({self.system}): {e} — seguindo frase a frase")
+                audios = [None] * len(texts)
+        else:
+            audios = [None] * len(texts)
+
+        for i, audio in zip(pending, audios):
+            if cancel is not None and cancel.cancelled:
+                break  # barge-in: as frases restantes não serão tocadas
+            if audio is None:
+                # Fora do lote (ou falhou nele): sozinha, com fallback
+                audio = self._synthesize_one(sentences[i])
+            else:
+                self._cache_put(keys[i], sentences[i], audio)
+            results[i] = audio
+        return results
+
+    def _synthesize_one(self, text: str) -> Optional[np.ndarray]:
+        """Sintetiza um texto no backend ativo; se falhar, no fallback."""
+        audio = self._synthesize_with(self.backend, text)
+        return audio if audio is not None else self._fallback_audio(text)
+
+    def _synthesize_with(self, backend: TTSBackend, text: str) -> Optional[np.ndarray]:
+        """Sintetiza com um backend específico, usando a chave de cache dele."""
+        key = self._cache_key(backend, text)
+        audio = self.cache.get(key)
+        if audio is not None:
+            return audio
         try:
-            import edge_tts
-            communicate = edge_tts.Communicate(
-                text,
-                config.EDGE_TTS_VOICE,
-                rate=f"{int((config.EDGE_TTS_SPEED - 1.0) * 100):+d}%"
-            )
-            temp_file = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
-            temp_path = temp_file.name
-            temp_file.close()
-
-            # Executar a síntese async de forma síncrona
-            asyncio.run(communicate.save(temp_path))
-
-            # Converter MP3 para WAV (o app espera WAV)
-            import soundfile as sf
-            import numpy as np
-            data, sr = sf.read(temp_path)
-            os.unlink(temp_path)  # Remove MP3
-
-            # Salvar como WAV
-            wav_path = tempfile.NamedTemporaryFile(suffix='.wav', delete=False).name
-            sf.write(wav_path, data, sr)
-            return wav_path
-
+            backend.load()  # descarregado por ociosidade: recarrega
+            audio = backend.synthesize(text)
         except Exception as e:
-            logger.warning(f"Erro no Edge-TTS: {e}")
-            logger.info("Fallback para Kokoro nesta síntese...")
-            if self.kokoro_pipeline:
-                self.system = 'kokoro'
-                return self.synthesize(text)
+            logger.warning(f"Erro no TTS ({backend.name}): {e}")
             return None
+        if audio is not None:
+            self._cache_put(key, text, audio)
+        return audio
+
+    def _fallback_audio(self, text: str) -> Optional[np.ndarray]:
+        """Sintetiza no backend de fallback (texto inteiro ou uma frase)."""
+        fallback = self._fallback()
+        if fallback is None:
+            return None
+        if not (self.backend.full_text and not fallback.full_text):
+            return self._synthesize_with(fallback, text)
+        # Texto inteiro (Edge) num backend por frase: divide antes
+        chunks = [self._synthesize_with(fallback, s) for s in self.split_sentences(text)]
+        chunks = [c for c in chunks if c is not None]
+        if not chunks:
+            return None
+        self._apply_crossfade(chunks, fallback.sample_rate)
+        return np.concatenate(chunks)
+
+    def _stream_unit(self, text: str, cancel: Optional[CancelToken] = None) -> Iterator[np.ndarray]:
+        """Streaming de uma frase (ou do texto inteiro no Edge), com cache."""
+        key = self._cache_key(self.backend, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
 
-    def _synthesize_sentence(self, sentence: str) -> Optional[np.ndarray]:
-        """Sintetiza uma frase com o sistema TTS atual."""
-        if self.system == 'kokoro' and self.kokoro_pipeline:
-            return self._kokoro_sentence(sentence)
-        elif self.system == 'edge':
-            return self._edge_sentence(sentence)
-        elif self.qwen3_pipeline:
-            return self._qwen3_sentence(sentence)
-        return None
-
-    def _kokoro_sentence(self, sentence: str) -> Optional[np.ndarray]:
-        """Sintetiza uma frase com Kokoro (suporta mesclagem de vozes)."""
-        voice_config = self._parse_voice_config(config.TTS_VOICE)
-        assert self.kokoro_pipeline is not None
-
-        if len(voice_config) == 1:
-            voice_name = list(voice_config.keys())[0]
-            chunks = list(self.kokoro_pipeline(sentence, voice=voice_name, speed=config.TTS_SPEED))
-            audios = [a for _, _, a in chunks[:30]]
-            return np.concatenate(audios) if audios else None
-        else:
-            # Mesclagem de vozes
-            voices = list(voice_config.keys())
-            percents = list(voice_config.values())
-            voice_audios: list[np.ndarray] = []
-            for voice_name in voices:
-                chunks = list(self.kokoro_pipeline(sentence, voice=voice_name, speed=config.TTS_SPEED))
-                audios = [a for _, _, a in chunks[:10]]
-                if audios:
-                    voice_audios.append(np.concatenate(audios))
-            if not voice_audios:
-                return None
-            min_len = min(len(a) for a in voice_audios)
-            trimmed = [a[:min_len] * (percents[i] / 100.0) for i, a in enumerate(voice_audios)]
-            mixed = np.sum(trimmed, axis=0)
-            max_val = np.max(np.abs(mixed))
-            if max_val > 1.0:
-                mixed = mixed / max_val * 0.95
-            return mixed
-
-    def _qwen3_sentence(self, sentence: str) -> Optional[np.ndarray]:
-        """Sintetiza uma frase com Qwen3 (com cache para frases curtas)."""
-        assert self.qwen3_pipeline is not None
-        cache_key = f"{sentence}_{config.QWEN3_VOICE}_{config.QWEN3_LANGUAGE}"
-        if len(sentence) < 100 and cache_key in self.tts_cache:
-            logger.info(f"Cache hit: '{sentence[:50]}...'")
-            return self.tts_cache[cache_key]
-
+        parts: list[np.ndarray] = []
         try:
-            result = self.qwen3_pipeline.generate_custom_voice(
-                text=sentence,
-                speaker=config.QWEN3_VOICE,
-                language=config.QWEN3_LANGUAGE,
-                non_streaming_mode=True,
-            )
-            if result and len(result) > 0:
-                audio_list, _ = result
-                if audio_list and len(audio_list) > 0:
-                    audio = audio_list[0]
-                    if len(sentence) < 100:
-                        if len(self.tts_cache) >= self.max_cache_size:
-                            self.tts_cache.pop(next(iter(self.tts_cache)))
-                        self.tts_cache[cache_key] = audio
-                    return audio
+            self.backend.load()
+            for part in self.backend.stream(text):
+                if cancel is not None and cancel.cancelled:
+                    return  # incompleto: fica fora do cache
+                parts.append(part)
+                yield part
         except Exception as e:
-            logger.warning(f"Erro no Qwen3-TTS: {e}")
-            if self.kokoro_pipeline:
-                logger.info("Fallback para Kokoro nesta frase...")
-                return self._kokoro_sentence(sentence)
-        return None
+            logger.warning(f"Erro no streaming do TTS ({self.system}): {e}")
+            if not parts:
+                audio = self._fallback_audio(text)
+                if audio is not None:
+                    yield audio
+            return
+        if parts:
+            self._cache_put(key, text, np.concatenate(parts))
 
     # ------------------------------------------------------------------
     # Utilitários
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _apply_crossfade(chunks: list[np.ndarray], fade_ms: int = 20) -> None:
-        """Aplica fade in/out entre chunks de áudio."""
+    def _apply_crossfade(chunks: list[np.ndarray], sample_rate: int, fade_ms: int = 20) -> None:
+        """Aplica fade in/out entre chunks de áudio (sample_rate do backend que os gerou)."""
         if len(chunks) <= 1:
             return
-        fade_duration = int(0.001 * fade_ms * config.TTS_SAMPLE_RATE)
+        fade_duration = int(0.001 * fade_ms * sample_rate)
         for i in range(1, len(chunks)):
             prev, curr = chunks[i - 1], chunks[i]
             if len(prev) > fade_duration and len(curr) > fade_duration:
@@ -349,12 +328,6 @@ class TTSManager:
                 fade_in = np.linspace(0, 1, fade_duration)
                 curr[:fade_duration] = np.multiply(curr[:fade_duration], fade_in)
 
-    @staticmethod
-    def _parse_voice_config(voice_config: str) -> dict[str, int]:
-        """Delega para config.parse_voice_config."""
-        from config import parse_voice_config as _parse
-        return _parse(voice_config)
-
     @staticmethod
     def clean_for_tts(text: str) -> str:
         """Remove caracteres que o TTS não lê bem."""
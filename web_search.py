@@ -18,6 +18,7 @@ from __future__ import annotations
 import re
 from typing import Optional
 
+from cancellation import CancelToken
 from log import logger
 
 # ---------------------------------------------------------------------------
@@ -104,15 +105,16 @@ def needs_search(text: str) -> bool:
 # Busca principal (requests + DuckDuckGo HTML)
 # ---------------------------------------------------------------------------
 
-def search_web(query: str, max_results: int = 5) -> str:
+def search_web(query: str, max_results: int = 5, cancel: Optional[CancelToken] = None) -> str:
     """Pesquisa na web usando DuckDuckGo HTML.
 
     Args:
         query: Termo de pesquisa.
         max_results: Máximo de resultados (padrão: 5).
+        cancel: Token do turno; cancelado, a conexão é fechada na hora.
 
     Returns:
-        String formatada com os resultados, ou vazia se falhar.
+        String formatada com os resultados, ou vazia se falhar (ou cancelada).
     """
     cache_key = query.lower().strip()
     if cache_key in _search_cache:
@@ -138,21 +140,24 @@ def search_web(query: str, max_results: int = 5) -> str:
 
     try:
         logger.info(f'🔍 Pesquisando: {query}')
-        resp = requests.get(url, headers=headers, timeout=15)
-        resp.raise_for_status()
+        html = _fetch(requests, url, headers, cancel)
     except Exception as e:
+        if cancel is not None and cancel.cancelled:
+            logger.info('🔍 Pesquisa cancelada')
+            return ''
         # Tentar uma vez mais (rate limit do DuckDuckGo)
         try:
             import time as t
-            t.sleep(1)
-            resp = requests.get(url, headers=headers, timeout=15)
-            resp.raise_for_status()
+            if cancel is None:
+                t.sleep(1)
+            elif cancel.wait(1):
+                return ''
+            html = _fetch(requests, url, headers, cancel)
         except Exception as e2:
-            logger.warning(f'Erro na requisição: {e2}')
+            if cancel is None or not cancel.cancelled:
+                logger.warning(f'Erro na requisição: {e2}')
             return ''
 
-    html = resp.text
-
     # Extrair resultados com regex
     # Padrão: link do resultado → título → snippet
     results: list[tuple[str, str, str]] = []
@@ -202,6 +207,28 @@ def search_web(query: str, max_results: int = 5) -> str:
     return result_text
 
 
+def _fetch(requests, url: str, headers: dict, cancel: Optional[CancelToken]) -> str:
+    """GET do HTML; com cancel, lê em blocos e o cancelamento fecha a conexão."""
+    if cancel is None:
+        resp = requests.get(url, headers=headers, timeout=15)
+        resp.raise_for_status()
+        return resp.text
+
+    cancel.raise_if_cancelled()
+    resp = requests.get(url, headers=headers, timeout=15, stream=True)
+    remove = cancel.on_cancel(resp.close)
+    try:
+        resp.raise_for_status()
+        body = bytearray()
+        for block in resp.iter_content(8192):
+            cancel.raise_if_cancelled()
+            body.extend(block)
+        return body.decode(resp.encoding or 'utf-8', 'replace')
+    finally:
+        remove()
+        resp.close()
+
+
 # ---------------------------------------------------------------------------
 # Utilitários
 # ---------------------------------------------------------------------------